@@ -3,63 +3,291 @@ TechCrunch AI 요약 블로그 웹 서버 (Flask)
 """
 import json
 import os
-import subprocess
-import sys
+import time
+import zlib
+from datetime import datetime, timezone
 from pathlib import Path
 
-from apscheduler.schedulers.background import BackgroundScheduler
-from flask import Flask, render_template, request
+from flask import Flask, Response, g, redirect, render_template, request, url_for
 
-from config import OUTPUT_DIR, SUMMARIZED_JSON
+import metrics
+from article_store import get_store
+from feed_writer import entries_from_listing, render_atom, render_rss
+from job_queue import get_job_queue
+from scheduler import start_scheduler
+from search_index import get_search_index
+from config import (
+    API_MAX_LIMIT,
+    API_RESULT_CACHE_MAX_BYTES,
+    DETAIL_CACHE_MAX_AGE,
+    FEED_CACHE_MAX_AGE,
+    FEED_MAX_ENTRIES,
+    INDEX_MAX_PER_PAGE,
+    INDEX_PER_PAGE,
+    OUTPUT_DIR,
+    RENDER_CACHE_MAX_BYTES,
+    SEARCH_MAX_PAGES,
+    SITE_URL,
+)
+from view_cache import RenderCache, build_fingerprint, is_not_modified, make_etag
+from worker import start_update_job
 
 app = Flask(__name__)
+_render_cache = RenderCache(RENDER_CACHE_MAX_BYTES)
+_api_cache = RenderCache(API_RESULT_CACHE_MAX_BYTES)
+# 템플릿·정적 파일·코드가 바뀐 배포 뒤에는 데이터가 같아도 ETag / Last-Modified가 달라지게 함
+BUILD_ID, BUILD_MTIME = build_fingerprint(Path(__file__).resolve().parent)
 
+_REQUESTS = metrics.counter("http_requests_total", "처리한 HTTP 요청 수", ("endpoint", "method", "status"))
+_REQUEST_SECONDS = metrics.histogram("http_request_duration_seconds", "HTTP 요청 처리 시간(초)", ("endpoint",))
 
-def _run_scheduled_update():
-    """매일 00:00 KST에 실행되는 RSS 수집·요약 작업"""
-    try:
-        from scheduled_update import main
-        main()
-    except Exception as e:
-        print(f"[scheduler] 업데이트 실패: {e}", flush=True)
 
+@app.before_request
+def _start_timer():
+    g.request_started = time.perf_counter()
 
-# 매일 00:00 (한국 시간)에 자동 업데이트
-_scheduler = BackgroundScheduler(timezone="Asia/Seoul")
-_scheduler.add_job(_run_scheduled_update, "cron", hour=0, minute=0)
-_scheduler.start()
 
+@app.after_request
+def _record_request(response):
+    started = g.pop("request_started", None)
+    if started is not None:
+        endpoint = request.endpoint or "unmatched"
+        _REQUEST_SECONDS.observe(time.perf_counter() - started, endpoint=endpoint)
+        _REQUESTS.inc(endpoint=endpoint, method=request.method, status=str(response.status_code))
+    return response
 
-def load_articles():
-    """summarized_articles.json을 읽어서 기사 목록을 반환합니다."""
-    # 프로젝트 루트 기준 경로 (서버 실행 위치와 무관)
-    root = Path(__file__).resolve().parent
-    filepath = root / OUTPUT_DIR / SUMMARIZED_JSON
-    if not filepath.exists():
-        return []
-    try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            return data.get("articles", [])
-    except Exception:
-        return []
+
+def _cached_html(snap, key: tuple, render):
+    """
+    저장소 버전과 빌드 지문 기반 ETag / Last-Modified를 붙여 HTML을 응답합니다.
+    조건부 요청이 맞으면 렌더링 없이 304, 아니면 렌더 캐시(없으면 render() 호출) 결과를 돌려줍니다.
+    """
+    return _cached_body(snap, key, lambda: render().encode("utf-8"), "text/html")
+
+
+def _cached_body(snap, key: tuple, render, mimetype: str):
+    """_cached_html과 같지만 render()가 bytes를 돌려주고 Content-Type을 지정합니다 (피드 등)."""
+    etag = make_etag(snap.version, key, BUILD_ID)
+    last_modified = max(snap.last_modified, BUILD_MTIME)
+    cache_key = (key, snap.version)
+    if is_not_modified(request, etag, last_modified):
+        _render_cache.record_not_modified(_render_cache.size_of(cache_key))
+        response = app.response_class(status=304)
+    else:
+        body = _render_cache.get(cache_key)
+        if body is None:
+            body = render()
+            _render_cache.put(cache_key, body)
+        else:
+            _render_cache.record_hit_bytes(len(body))
+        response = app.response_class(body, mimetype=mimetype)
+    response.set_etag(etag)
+    response.last_modified = int(last_modified)
+    return response
 
 
 @app.route("/")
 def index():
-    """메인 페이지: 기사 목록"""
-    articles = load_articles()
-    return render_template("index.html", articles=articles)
+    """메인 페이지: 기사 목록 (?page=N&per_page=M)"""
+    page_num = request.args.get("page", 1, type=int)
+    per_page = min(max(1, request.args.get("per_page", INDEX_PER_PAGE, type=int)), INDEX_MAX_PER_PAGE)
+    snap = get_store().snapshot()
+    page = snap.page(page_num, per_page)
+    return _cached_html(
+        snap,
+        ("index", page.page, page.per_page),
+        lambda: render_template("index.html", articles=page.items, page=page, default_per_page=INDEX_PER_PAGE),
+    )
+
+
+@app.route("/search")
+def search():
+    """검색 페이지 (?q=검색어&page=N): 제목·영어 요약·한국어 요약 BM25 검색"""
+    query = (request.args.get("q") or "").strip()[:200]
+    snap = get_store().snapshot()
+    # 색인에서 page_num 페이지까지의 결과를 한꺼번에 가져오므로, 목록 페이지처럼 범위를 벗어나면 맞춤
+    last_page = min(SEARCH_MAX_PAGES, max(1, -(-len(snap.listing) // INDEX_PER_PAGE)))
+    page_num = min(max(1, request.args.get("page", 1, type=int)), last_page)
+
+    def render():
+        articles = []
+        has_next = False
+        if query:
+            root = Path(__file__).resolve().parent
+            hits = get_search_index(root / OUTPUT_DIR).search(query, limit=page_num * INDEX_PER_PAGE + 1)
+            start = (page_num - 1) * INDEX_PER_PAGE
+            has_next = len(hits) > start + INDEX_PER_PAGE and page_num < last_page
+            articles = [a for a in (snap.get(uid) for uid, _ in hits[start:start + INDEX_PER_PAGE]) if a]
+        return render_template(
+            "search.html", query=query, articles=articles, page_num=page_num,
+            has_prev=page_num > 1, has_next=has_next,
+        )
+
+    return _cached_html(snap, ("search", query, page_num), render)
+
+
+@app.route("/articles/<uid>")
+def article_detail(uid):
+    """기사 상세 페이지 (고정 ID 기준이라 오래 캐시해도 됨)"""
+    snap = get_store().snapshot()
+    article = snap.get(uid)
+    if article is None:
+        return "기사를 찾을 수 없습니다.", 404
+    response = _cached_html(
+        snap,
+        ("article", uid),
+        lambda: render_template("article.html", article=article, uid=uid),
+    )
+    response.cache_control.public = True
+    response.cache_control.max_age = DETAIL_CACHE_MAX_AGE
+    return response
 
 
 @app.route("/article/<int:article_id>")
-def article_detail(article_id):
-    """기사 상세 페이지"""
-    articles = load_articles()
-    if 0 <= article_id < len(articles):
-        article = articles[article_id]
-        return render_template("article.html", article=article, article_id=article_id)
-    return "기사를 찾을 수 없습니다.", 404
+def article_detail_legacy(article_id):
+    """
+    예전 위치 기반 주소: 현재 그 위치에 있는 기사의 고정 주소로 이동.
+    위치는 새 기사가 들어올 때마다 바뀌므로 영구(301)가 아닌 임시(302) 이동으로 응답합니다.
+    """
+    uid = get_store().snapshot().uid_at(article_id)
+    if uid is None:
+        return "기사를 찾을 수 없습니다.", 404
+    return redirect(url_for("article_detail", uid=uid), code=302)
+
+
+def _external_url(endpoint: str, **values) -> str:
+    """피드에 넣을 절대 URL (SITE_URL이 있으면 그 주소 기준, 없으면 요청 호스트 기준)."""
+    if SITE_URL:
+        return SITE_URL + url_for(endpoint, **values)
+    return url_for(endpoint, _external=True, **values)
+
+
+def _feed(kind: str, render, mimetype: str):
+    """
+    최근 FEED_MAX_ENTRIES개 기사의 피드. 저장소 버전마다 한 번만 만들어 렌더 캐시에 bytes로 두고,
+    ETag / Last-Modified로 조건부 요청에 304를 돌려주므로 자주 폴링하는 피드 리더도 거의 비용이 없습니다.
+    """
+    snap = get_store().snapshot()
+    # 링크가 요청 호스트에 따라 달라질 수 있으므로 호스트도 키에 포함
+    key = (kind, SITE_URL or request.host_url, FEED_MAX_ENTRIES)
+
+    def build():
+        entries = entries_from_listing(
+            snap.listing, FEED_MAX_ENTRIES, article_url=lambda uid: _external_url("article_detail", uid=uid)
+        )
+        return render(entries, _external_url("index"), _external_url(kind), snap.last_modified)
+
+    response = _cached_body(snap, key, build, mimetype)
+    response.cache_control.public = True
+    response.cache_control.max_age = FEED_CACHE_MAX_AGE
+    return response
+
+
+@app.route("/feed.xml")
+def rss_feed():
+    """한국어 요약 RSS 2.0 피드"""
+    return _feed("rss_feed", render_rss, "application/rss+xml")
+
+
+@app.route("/atom.xml")
+def atom_feed():
+    """한국어 요약 Atom 피드"""
+    return _feed("atom_feed", render_atom, "application/atom+xml")
+
+
+def _parse_date_arg(name: str, end_of_day: bool = False) -> float | None:
+    """YYYY-MM-DD 쿼리 인자를 UTC 기준 UNIX 시간으로 바꿉니다 (없으면 None, 형식이 틀리면 ValueError)."""
+    value = request.args.get(name)
+    if not value:
+        return None
+    day = datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    return day.timestamp() + (86400 - 0.001 if end_of_day else 0)
+
+
+def _api_item(item) -> dict:
+    return {
+        "uid": item["uid"],
+        "title": item["title"],
+        "link": item["link"],
+        "published": item["published"],
+        "summary_ko": item["summary_ko"],
+        "url": url_for("article_detail", uid=item["uid"]),
+    }
+
+
+@app.route("/api/articles")
+def api_articles():
+    """
+    기사 목록 JSON. 쿼리 인자:
+    from / to (YYYY-MM-DD, 발행일 기준), q (제목·한국어 요약 키워드), limit, offset
+    같은 조건의 요청은 저장소 버전이 바뀔 때까지 결과 캐시에서 바로 응답합니다.
+    """
+    try:
+        since = _parse_date_arg("from")
+        until = _parse_date_arg("to", end_of_day=True)
+    except ValueError:
+        return {"error": "from / to는 YYYY-MM-DD 형식이어야 합니다."}, 400
+    keyword = (request.args.get("q") or "").strip().lower()
+    limit = min(max(1, request.args.get("limit", INDEX_PER_PAGE, type=int)), API_MAX_LIMIT)
+    offset = max(0, request.args.get("offset", 0, type=int))
+
+    snap = get_store().snapshot()
+    key = ("api_articles", since, until, keyword, limit, offset, snap.version)
+    body = _api_cache.get(key)
+    if body is None:
+        matched = [
+            item for item in snap.listing
+            if (since is None or item["published_ts"] >= since)
+            and (until is None or item["published_ts"] <= until)
+            and (not keyword or keyword in item["title"].lower() or keyword in item["summary_ko"].lower())
+        ]
+        body = json.dumps({
+            "total": len(matched),
+            "offset": offset,
+            "limit": limit,
+            "articles": [_api_item(item) for item in matched[offset:offset + limit]],
+        }, ensure_ascii=False).encode("utf-8")
+        _api_cache.put(key, body)
+    return Response(body, mimetype="application/json")
+
+
+@app.route("/api/articles/<uid>")
+def api_article(uid):
+    """기사 하나의 전체 레코드 JSON"""
+    article = get_store().snapshot().get(uid)
+    if article is None:
+        return {"error": "기사를 찾을 수 없습니다."}, 404
+    return dict(article)
+
+
+@app.route("/api/articles/export")
+def api_articles_export():
+    """
+    전체 기사를 NDJSON(한 줄에 기사 하나)으로 스트리밍합니다.
+    DB에서 한 건씩 읽어 바로 보내므로 기사 수와 관계없이 메모리 사용량이 일정합니다.
+    Accept-Encoding이 gzip을 받거나 (q=0이면 받지 않음) ?gzip=1이면 gzip으로 압축해 보냅니다.
+    """
+    store = get_store()
+    use_gzip = request.args.get("gzip") == "1" or request.accept_encodings["gzip"] > 0
+
+    def lines():
+        for article in store.iter_articles():
+            yield (json.dumps(article, ensure_ascii=False) + "\n").encode("utf-8")
+
+    def gzipped(chunks):
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        for chunk in chunks:
+            data = compressor.compress(chunk)
+            if data:
+                yield data
+        yield compressor.flush()
+
+    # 압축 여부가 Accept-Encoding에 따라 달라지므로 압축하지 않을 때도 Vary를 붙임
+    headers = {"Content-Disposition": "attachment; filename=articles.ndjson", "Vary": "Accept-Encoding"}
+    if use_gzip:
+        headers["Content-Encoding"] = "gzip"
+        return Response(gzipped(lines()), mimetype="application/x-ndjson", headers=headers)
+    return Response(lines(), mimetype="application/x-ndjson", headers=headers)
 
 
 @app.route("/api/status")
@@ -73,9 +301,27 @@ def api_status():
         "gemini_key_set": bool(os.environ.get("GEMINI_API_KEY")),
         "log_exists": log_file.exists(),
         "last_update_date": state_file.read_text(encoding="utf-8").strip() if state_file.exists() else None,
+        "article_store": get_store().stats_dict(),
+    }
+
+
+@app.route("/api/metrics")
+def api_metrics():
+    """렌더 캐시 적중률·절약 바이트와 기사 저장소 통계 (이 워커 기준)"""
+    return {
+        "pid": os.getpid(),
+        "render_cache": _render_cache.stats(),
+        "api_cache": _api_cache.stats(),
+        "article_store": get_store().stats_dict(),
     }
 
 
+@app.route("/metrics")
+def prometheus_metrics():
+    """Prometheus 텍스트 형식 지표 (모든 워커·수집 프로세스 합산)"""
+    return Response(metrics.render_prometheus(), mimetype="text/plain; version=0.0.4")
+
+
 @app.route("/api/update-log")
 def update_log():
     """최근 업데이트 로그 (디버깅용, 최근 8000자)"""
@@ -97,6 +343,7 @@ def trigger_update():
     """
     외부 cron에서 호출해 RSS 수집·요약을 실행합니다.
     cron-job.org에서 매일 00:00 KST에 이 URL을 호출하면 됩니다.
+    ?force=1이면 오늘 이미 업데이트했어도 다시 실행합니다.
     """
     secret = os.environ.get("CRON_SECRET")
     if not secret:
@@ -105,30 +352,38 @@ def trigger_update():
     if key != secret:
         return {"error": "Unauthorized"}, 401
 
-    root = Path(__file__).resolve().parent
-    log_file = root / OUTPUT_DIR / "update.log"
-    (root / OUTPUT_DIR).mkdir(parents=True, exist_ok=True)
-    log_handle = None
-    try:
-        log_handle = open(log_file, "a", encoding="utf-8")
-        from datetime import datetime
-        log_handle.write(f"\n--- 트리거 호출: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ---\n")
-        log_handle.flush()
-    except Exception:
-        pass
-    subprocess.Popen(
-        [sys.executable, str(root / "scheduled_update.py")],
-        cwd=str(root),
-        stdout=log_handle or subprocess.DEVNULL,
-        stderr=subprocess.STDOUT if log_handle else subprocess.DEVNULL,
-        start_new_session=True,
-    )
-    return {"status": "started", "message": "RSS 수집 및 요약을 백그라운드에서 실행 중입니다."}, 202
+    force = request.args.get("force", "").lower() in ("1", "true", "yes")
+    job_id, coalesced = start_update_job(force=force)
+    return {
+        "status": "coalesced" if coalesced else "queued",
+        "job_id": job_id,
+        "status_url": url_for("api_job", job_id=job_id),
+        "message": "RSS 수집 및 요약을 백그라운드에서 실행 중입니다.",
+    }, 202
+
+
+@app.route("/api/jobs")
+def api_jobs():
+    """최근 업데이트 작업과 요약 재시도 대기 중인 기사"""
+    queue = get_job_queue()
+    return {"jobs": queue.recent(20), "article_failures": queue.article_failures(50)}
+
+
+@app.route("/api/jobs/<int:job_id>")
+def api_job(job_id):
+    """업데이트 작업 하나의 상태 (queued, running, succeeded, failed)"""
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return {"error": "not found"}, 404
+    return job
 
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 5000))
     debug = os.environ.get("FLASK_DEBUG", "false").lower() == "true"
+    # 디버그 리로더는 자식 프로세스에서 앱을 다시 띄우므로 그쪽에서만 시작 (잠금으로 하나만 돎)
+    if not debug or os.environ.get("WERKZEUG_RUN_MAIN") == "true":
+        start_scheduler()
     print("TechCrunch AI 요약 블로그 시작 중...")
     print(f"브라우저에서 http://localhost:{port} 을 열어보세요.")
     app.run(debug=debug, host="0.0.0.0", port=port)
@@ -0,0 +1,379 @@
+"""
+요약 기사 저장소 (SQLite).
+summarized_articles.json 전체를 매번 다시 쓰는 대신, 새로 들어오거나 바뀐 기사만 트랜잭션으로 기록합니다.
+WAL 모드라서 웹 서버가 읽는 도중에 쓰기가 일어나도 반쯤 쓰인 상태를 보지 않습니다.
+
+- 기사 순서는 seq(클수록 앞) 값으로 유지합니다.
+- DB가 비어 있고 기존 summarized_articles.json이 있으면 처음 열 때 한 번 가져옵니다.
+- export_json()으로 예전과 같은 JSON 형식 파일을 (임시 파일 → 교체 방식으로) 만들 수 있습니다.
+
+사용법:
+  python article_db.py export [경로]   # 호환용 JSON 내보내기
+  python article_db.py stats
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import sys
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+
+from config import ARTICLES_DB, OUTPUT_DIR, SUMMARIZED_JSON, TECHCRUNCH_AI_FEED_URL
+
+
+def _is_failed_summary(summary_ko) -> bool:
+    if not summary_ko or not isinstance(summary_ko, str):
+        return True
+    return summary_ko.strip().startswith("[요약 실패:")
+
+
+def article_uid(article) -> str:
+    """
+    기사의 고정 ID. GUID(없으면 링크)의 해시라서 목록 순서가 바뀌어도 변하지 않습니다.
+    """
+    key = article.get("id") or article.get("link") or article.get("title", "")
+    return hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+
+def published_timestamp(article) -> float:
+    """published 값(RFC 822 또는 ISO 8601)을 UNIX 시간으로 바꿉니다. 해석할 수 없으면 0."""
+    value = article.get("published") or ""
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError, IndexError):
+        pass
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return 0.0
+
+
+def _dump(article: dict) -> str:
+    return json.dumps(article, ensure_ascii=False, sort_keys=True)
+
+
+def _hash(data: str) -> str:
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class SaveResult:
+    written: int = 0
+    deleted: int = 0
+    version: int = 0
+    changed: list = field(default_factory=list)  # 새로 들어왔거나 내용이 바뀐 기사
+    deleted_articles: list = field(default_factory=list)  # 지워진 기사
+
+
+class ArticleDB:
+    def __init__(self, path: str | Path, legacy_json: str | Path | None = None):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._init_schema()
+        if legacy_json is not None:
+            self.migrate_from_json(legacy_json)
+
+    def _conn(self) -> sqlite3.Connection:
+        """스레드마다 연결을 하나씩 씁니다."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_schema(self) -> None:
+        conn = self._conn()
+        conn.execute(
+            """CREATE TABLE IF NOT EXISTS articles (
+                link TEXT PRIMARY KEY,
+                seq INTEGER NOT NULL,
+                hash TEXT NOT NULL,
+                failed INTEGER NOT NULL DEFAULT 0,
+                data TEXT NOT NULL,
+                updated_at TEXT NOT NULL
+            )"""
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_articles_seq ON articles(seq)")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        # DB 파일이 새로 만들어지면 version이 다시 1부터 시작하므로, 구분용 토큰을 둠
+        conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('instance', ?)", (os.urandom(8).hex(),))
+
+    def _get_meta(self, key: str, default=None):
+        row = self._conn().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    @staticmethod
+    def _set_meta(conn, key: str, value) -> None:
+        conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, str(value)))
+
+    @staticmethod
+    def _bump_version(conn) -> int:
+        row = conn.execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        version = int(row[0]) + 1 if row else 1
+        ArticleDB._set_meta(conn, "version", version)
+        ArticleDB._set_meta(conn, "updated_at", datetime.utcnow().isoformat() + "Z")
+        return version
+
+    def version(self) -> int:
+        """기사가 바뀔 때마다 1씩 올라가는 값."""
+        return int(self._get_meta("version", 0))
+
+    def signature(self) -> tuple[str, int]:
+        """(DB 인스턴스 토큰, 버전). 캐시가 DB 변경을 알아채는 데 씁니다."""
+        rows = dict(self._conn().execute("SELECT key, value FROM meta WHERE key IN ('instance', 'version')"))
+        return rows.get("instance", ""), int(rows.get("version", 0))
+
+    def updated_at(self) -> str | None:
+        return self._get_meta("updated_at")
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+
+    def iter_articles(self, batch_size: int = 500):
+        """기사를 순서대로 하나씩 돌려줍니다 (전체를 메모리에 올리지 않음)."""
+        cur = self._conn().execute("SELECT data FROM articles ORDER BY seq DESC")
+        while True:
+            rows = cur.fetchmany(batch_size)
+            if not rows:
+                break
+            for (data,) in rows:
+                yield json.loads(data)
+
+    def load_all(self) -> list[dict]:
+        return list(self.iter_articles())
+
+    def has_link(self, link: str) -> bool:
+        return self._conn().execute("SELECT 1 FROM articles WHERE link = ?", (link,)).fetchone() is not None
+
+    def save(self, articles: list[dict], changed_links=None) -> SaveResult:
+        """
+        전체 기사 목록(표시 순서)을 저장합니다. 실제로는 새 기사, 내용이 바뀐 기사,
+        순서를 맞추기 위해 앞으로 옮겨야 하는 기사만 쓰고, 목록에 없는 기사는 지웁니다.
+        changed_links: 내용이 바뀌었을 수 있는 기사의 링크. 주면 그 밖의 이미 저장된 기사는
+        직렬화·해시 비교 없이 그대로 있다고 보고 (필요하면 순서만 옮김), 주지 않으면 모든 기사를 비교합니다.
+        """
+        changed_links = set(changed_links) if changed_links is not None else None
+        conn = self._conn()
+        result = SaveResult()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            current = {link: (seq, h) for link, seq, h in conn.execute("SELECT link, seq, hash FROM articles")}
+            next_seq = conn.execute("SELECT COALESCE(MAX(seq), 0) FROM articles").fetchone()[0] + 1
+            now = datetime.utcnow().isoformat() + "Z"
+            floor = None
+            seen = set()
+            # 뒤(오래된 것)에서부터 보면서, 저장된 순서가 그대로인 기사는 건드리지 않음
+            for article in reversed(articles):
+                link = article.get("link")
+                if not link or link in seen:
+                    continue
+                seen.add(link)
+                cur = current.get(link)
+                if cur is not None and changed_links is not None and link not in changed_links:
+                    # 바뀌지 않은 기사: 순서가 맞으면 그대로, 아니면 seq만 앞으로 옮김
+                    if floor is None or cur[0] > floor:
+                        floor = cur[0]
+                    else:
+                        conn.execute("UPDATE articles SET seq = ? WHERE link = ?", (next_seq, link))
+                        floor = next_seq
+                        next_seq += 1
+                        result.written += 1
+                    continue
+                data = _dump(article)
+                h = _hash(data)
+                if cur is not None and (floor is None or cur[0] > floor):
+                    seq = cur[0]
+                    if cur[1] == h:
+                        floor = seq
+                        continue
+                else:
+                    seq = next_seq
+                    next_seq += 1
+                if cur is None or cur[1] != h:
+                    result.changed.append(article)
+                conn.execute(
+                    "INSERT OR REPLACE INTO articles (link, seq, hash, failed, data, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (link, seq, h, int(_is_failed_summary(article.get("summary_ko"))), data, now),
+                )
+                result.written += 1
+                floor = seq
+            removed = [link for link in current if link not in seen]
+            for link in removed:
+                row = conn.execute("SELECT data FROM articles WHERE link = ?", (link,)).fetchone()
+                result.deleted_articles.append(json.loads(row[0]))
+                conn.execute("DELETE FROM articles WHERE link = ?", (link,))
+            result.deleted = len(removed)
+            if result.written or result.deleted:
+                result.version = self._bump_version(conn)
+            else:
+                result.version = int(self._get_meta("version", 0))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return result
+
+    def append_older(self, articles: list[dict]) -> SaveResult:
+        """
+        기사를 목록 맨 뒤(가장 오래된 쪽)에 순서대로 덧붙입니다. 이미 있는 링크는 건너뜁니다.
+        과거 기사 가져오기(backfill)처럼 전체 목록 없이 조금씩 쓸 때 사용합니다.
+        """
+        conn = self._conn()
+        result = SaveResult()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            seq = conn.execute("SELECT COALESCE(MIN(seq), 1) FROM articles").fetchone()[0]
+            now = datetime.utcnow().isoformat() + "Z"
+            for article in articles:
+                link = article.get("link")
+                if not link or conn.execute("SELECT 1 FROM articles WHERE link = ?", (link,)).fetchone():
+                    continue
+                seq -= 1
+                data = _dump(article)
+                conn.execute(
+                    "INSERT INTO articles (link, seq, hash, failed, data, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (link, seq, _hash(data), int(_is_failed_summary(article.get("summary_ko"))), data, now),
+                )
+                result.changed.append(article)
+                result.written += 1
+            if result.written:
+                result.version = self._bump_version(conn)
+            else:
+                result.version = int(self._get_meta("version", 0))
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return result
+
+    def remove_failed(self) -> list[dict]:
+        """요약 실패로 표시된 기사를 지우고, 지운 기사 목록을 반환합니다."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            removed = [json.loads(data) for (data,) in conn.execute("SELECT data FROM articles WHERE failed = 1")]
+            if removed:
+                conn.execute("DELETE FROM articles WHERE failed = 1")
+                self._bump_version(conn)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return removed
+
+    def migrate_from_json(self, filepath: str | Path) -> int:
+        """
+        DB가 비어 있고 아직 가져온 적이 없으면 기존 JSON 파일의 기사를 한 번 가져옵니다.
+        가져온 개수를 반환합니다.
+        """
+        filepath = Path(filepath)
+        conn = self._conn()
+        if self._get_meta("migrated") or not filepath.exists():
+            return 0
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # 다른 프로세스가 먼저 가져왔을 수 있음
+            if conn.execute("SELECT value FROM meta WHERE key = 'migrated'").fetchone():
+                conn.execute("COMMIT")
+                return 0
+            imported = 0
+            if conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0] == 0:
+                try:
+                    with open(filepath, "r", encoding="utf-8") as f:
+                        articles = json.load(f).get("articles", [])
+                except Exception:
+                    articles = []
+                now = datetime.utcnow().isoformat() + "Z"
+                total = len(articles)
+                for i, article in enumerate(articles):
+                    link = article.get("link")
+                    if not link:
+                        continue
+                    data = _dump(article)
+                    conn.execute(
+                        "INSERT OR IGNORE INTO articles (link, seq, hash, failed, data, updated_at) "
+                        "VALUES (?, ?, ?, ?, ?, ?)",
+                        (link, total - i, _hash(data), int(_is_failed_summary(article.get("summary_ko"))), data, now),
+                    )
+                    imported += 1
+                if imported:
+                    self._bump_version(conn)
+            self._set_meta(conn, "migrated", filepath.name)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return imported
+
+    def export_json(self, filepath: str | Path) -> Path:
+        """
+        예전 summarized_articles.json과 같은 형식으로 내보냅니다 (임시 파일에 쓴 뒤 교체).
+        count와 기사 목록은 한 읽기 트랜잭션에서 읽으므로, 그 사이에 저장이 끼어도 서로 어긋나지 않습니다.
+        """
+        filepath = Path(filepath)
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        tmp = filepath.with_suffix(filepath.suffix + ".tmp")
+        conn = self._conn()
+        conn.execute("BEGIN")
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write("{\n")
+                f.write(f'  "fetched_at": {json.dumps(datetime.utcnow().isoformat() + "Z")},\n')
+                f.write(f'  "source": {json.dumps(TECHCRUNCH_AI_FEED_URL)},\n')
+                f.write(f'  "count": {self.count()},\n')
+                f.write('  "articles": [')
+                first = True
+                for article in self.iter_articles():
+                    f.write("\n    " if first else ",\n    ")
+                    f.write(json.dumps(article, ensure_ascii=False))
+                    first = False
+                f.write("\n  ]\n}\n" if not first else "]\n}\n")
+                f.flush()
+                os.fsync(f.fileno())
+        finally:
+            conn.execute("COMMIT")
+        os.replace(tmp, filepath)
+        return filepath
+
+
+_dbs: dict[str, ArticleDB] = {}
+_dbs_lock = threading.Lock()
+
+
+def get_article_db(output_dir: str | Path = OUTPUT_DIR, legacy_filename: str = SUMMARIZED_JSON) -> ArticleDB:
+    """output_dir의 기사 DB를 반환합니다 (경로당 하나, 처음 열 때 기존 JSON을 가져옴)."""
+    key = str(Path(output_dir).resolve())
+    db = _dbs.get(key)
+    if db is None:
+        with _dbs_lock:
+            db = _dbs.get(key)
+            if db is None:
+                db = ArticleDB(Path(output_dir) / ARTICLES_DB, legacy_json=Path(output_dir) / legacy_filename)
+                _dbs[key] = db
+    return db
+
+
+def main(argv: list[str]) -> int:
+    db = get_article_db()
+    command = argv[1] if len(argv) > 1 else "stats"
+    if command == "export":
+        target = argv[2] if len(argv) > 2 else str(Path(OUTPUT_DIR) / SUMMARIZED_JSON)
+        print(f"내보내기 완료: {db.count()}개 기사 → {db.export_json(target)}")
+    elif command == "stats":
+        print(f"기사 {db.count()}개, 버전 {db.version()}, 마지막 변경 {db.updated_at()}")
+    else:
+        print(f"알 수 없는 명령: {command} (export | stats)", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
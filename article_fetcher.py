@@ -0,0 +1,333 @@
+"""
+기사 원문 가져오기 + 로컬 페이지 캐시 (FULL_ARTICLE_FETCH=true일 때만 사용).
+RSS의 summary는 짧은 소개문이라, 새 기사의 페이지 HTML을 받아 본문 문단을 뽑아 요약 프롬프트에 씁니다.
+
+받은 HTML은 output/page_cache/에 저장합니다.
+- 본문은 내용의 SHA-256으로 이름 붙인 gzip 파일 (objects/ab/abcd....html.gz), 같은 내용이면 한 번만 저장
+- URL → 해시 색인은 index.sqlite3
+- PAGE_CACHE_TTL_DAYS가 지난 페이지와, 압축 크기 합이 PAGE_CACHE_MAX_BYTES를 넘는 분량(가장 오래 쓰지 않은 것부터)은 evict()로 정리
+재실행·재요약·모델 변경 때는 캐시에서 읽으므로 같은 페이지를 다시 받지 않습니다.
+
+사용법:
+  python article_fetcher.py stats
+  python article_fetcher.py evict
+  python article_fetcher.py <기사 URL>    # 본문 추출 결과 확인 (캐시 사용)
+"""
+import codecs
+import gzip
+import hashlib
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import http_client
+import metrics
+from config import (
+    ARTICLE_FETCH_CONCURRENCY,
+    ARTICLE_FETCH_MAX_BYTES,
+    OUTPUT_DIR,
+    PAGE_CACHE_MAX_BYTES,
+    PAGE_CACHE_TTL_DAYS,
+)
+from html_text import extract_main_text
+
+PAGE_CACHE_DIR = "page_cache"
+FETCH_TIMEOUT_SECONDS = 20.0
+READ_CHUNK_BYTES = 64 * 1024
+_HEADER_CHARSET_RE = re.compile(r"charset=[\"']?([\w.:-]+)", re.I)
+# <meta charset="..."> 또는 <meta http-equiv="Content-Type" content="text/html; charset=...">
+_META_CHARSET_RE = re.compile(rb"<meta[^>]+charset=[\"']?([\w.:-]+)", re.I)
+
+_FETCHES = metrics.counter("article_fetch_total", "기사 원문 가져오기 결과 (cached/fetched/failed)", ("result",))
+
+
+class PageCache:
+    def __init__(self, root: str | Path, ttl_days: float = PAGE_CACHE_TTL_DAYS, max_bytes: int = PAGE_CACHE_MAX_BYTES):
+        self.root = Path(root)
+        self.objects = self.root / "objects"
+        self.objects.mkdir(parents=True, exist_ok=True)
+        self.ttl_days = ttl_days
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.root / "index.sqlite3"), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                hash TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                last_used REAL NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_last_used ON pages(last_used)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_hash ON pages(hash)")
+        self._conn.execute("CREATE TABLE IF NOT EXISTS blobs (hash TEXT PRIMARY KEY, size INTEGER NOT NULL)")
+        self._conn.commit()
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.objects / digest[:2] / f"{digest}.html.gz"
+
+    def get(self, url: str) -> str | None:
+        """캐시된 페이지 HTML을 반환합니다. 없거나 TTL이 지났으면 None."""
+        min_fetched = time.time() - self.ttl_days * 86400 if self.ttl_days else 0
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT hash FROM pages WHERE url = ? AND fetched_at >= ?", (url, min_fetched)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE pages SET last_used = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+        try:
+            data = gzip.decompress(self._blob_path(row[0]).read_bytes())
+        except (OSError, EOFError):
+            # 파일이 지워졌거나 깨졌으면 색인에서도 빼고 다시 받게 함
+            with self._lock:
+                self._conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+                self._conn.commit()
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return data.decode("utf-8")
+
+    def put(self, url: str, html: str) -> str:
+        """페이지 HTML을 저장하고 내용 해시를 반환합니다."""
+        raw = html.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        path = self._blob_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            try:
+                tmp.write_bytes(gzip.compress(raw, compresslevel=6))
+                os.replace(tmp, path)
+            except OSError:
+                tmp.unlink(missing_ok=True)
+                raise
+        size = path.stat().st_size
+        now = time.time()
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO blobs (hash, size) VALUES (?, ?)", (digest, size))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, hash, fetched_at, last_used) VALUES (?, ?, ?, ?)",
+                (url, digest, now, now),
+            )
+            self._conn.commit()
+        return digest
+
+    def evict(self) -> int:
+        """TTL이 지난 페이지와 max_bytes를 넘는 페이지를 지웁니다. 지운 페이지 수를 반환합니다."""
+        removed = 0
+        with self._lock:
+            if self.ttl_days:
+                cutoff = time.time() - self.ttl_days * 86400
+                removed += self._conn.execute("DELETE FROM pages WHERE fetched_at < ?", (cutoff,)).rowcount
+            if self.max_bytes:
+                (total,) = self._conn.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM blobs WHERE hash IN (SELECT hash FROM pages)"
+                ).fetchone()
+                if total > self.max_bytes:
+                    # 가장 오래 쓰지 않은 페이지부터 지우고, 더 이상 참조되지 않는 본문만큼 용량이 줄어듦
+                    refs = dict(self._conn.execute("SELECT hash, COUNT(*) FROM pages GROUP BY hash").fetchall())
+                    sizes = dict(self._conn.execute("SELECT hash, size FROM blobs").fetchall())
+                    victims = []
+                    for url, digest in self._conn.execute("SELECT url, hash FROM pages ORDER BY last_used ASC"):
+                        if total <= self.max_bytes:
+                            break
+                        victims.append((url,))
+                        refs[digest] -= 1
+                        if refs[digest] == 0:
+                            total -= sizes.get(digest, 0)
+                    self._conn.executemany("DELETE FROM pages WHERE url = ?", victims)
+                    removed += len(victims)
+            orphans = [h for (h,) in self._conn.execute(
+                "SELECT hash FROM blobs WHERE hash NOT IN (SELECT hash FROM pages)"
+            )]
+            self._conn.executemany("DELETE FROM blobs WHERE hash = ?", [(h,) for h in orphans])
+            self._conn.commit()
+        for digest in orphans:
+            self._blob_path(digest).unlink(missing_ok=True)
+        return removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            pages, oldest = self._conn.execute("SELECT COUNT(*), MIN(fetched_at) FROM pages").fetchone()
+            blobs, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM blobs").fetchone()
+        return {
+            "pages": pages,
+            "blobs": blobs,
+            "bytes": size,
+            "oldest_fetched_at": oldest,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_page_cache() -> PageCache:
+    """output/page_cache/ 페이지 캐시를 반환합니다 (프로세스당 하나)."""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = PageCache(Path(OUTPUT_DIR) / PAGE_CACHE_DIR)
+    return _cache
+
+
+def _read_limited(resp, max_bytes: int) -> bytes | None:
+    """stream=True 응답 본문을 max_bytes까지만 읽습니다. 넘으면 연결을 닫고 None."""
+    try:
+        declared = int(resp.headers.get("Content-Length") or 0)
+    except ValueError:
+        declared = 0
+    if declared > max_bytes:
+        resp.close()
+        return None
+    chunks, size = [], 0
+    for chunk in resp.iter_content(READ_CHUNK_BYTES):
+        size += len(chunk)
+        if size > max_bytes:
+            resp.close()
+            return None
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+def _known_codec(name) -> str | None:
+    if not name:
+        return None
+    name = name.decode("ascii", "ignore") if isinstance(name, bytes) else name
+    try:
+        return codecs.lookup(name).name
+    except LookupError:
+        return None
+
+
+def decode_html(body: bytes, content_type: str = "") -> str:
+    """
+    HTML 바이트를 문자열로 바꿉니다. Content-Type의 charset → <meta charset> → UTF-8 → 내용으로 추측 순서.
+    (charset이 없을 때 requests가 쓰는 ISO-8859-1 기본값은 한국어 페이지를 깨뜨리므로 쓰지 않음)
+    """
+    header = _HEADER_CHARSET_RE.search(content_type or "")
+    meta = _META_CHARSET_RE.search(body[:4096])
+    for codec in (_known_codec(header and header.group(1)), _known_codec(meta and meta.group(1))):
+        if codec:
+            return body.decode(codec, errors="replace")
+    try:
+        return body.decode("utf-8")
+    except UnicodeDecodeError:
+        pass
+    try:
+        from charset_normalizer import from_bytes
+        best = from_bytes(body).best()
+        if best is not None:
+            return str(best)
+    except ImportError:
+        pass
+    return body.decode("utf-8", errors="replace")
+
+
+def fetch_page(url: str, cache: PageCache | None = None) -> tuple[str | None, str]:
+    """
+    페이지 HTML을 캐시에서 읽거나 받아 옵니다. (HTML 또는 None, "cached" | "fetched" | "failed")
+    HTML이 아닌 응답, 오류 응답, ARTICLE_FETCH_MAX_BYTES보다 큰 응답은 캐시하지 않습니다.
+    캐시에 쓰지 못해도 (디스크 부족, 권한 등) 받은 HTML은 그대로 돌려줍니다.
+    """
+    cache = cache or get_page_cache()
+    html = cache.get(url)
+    if html is not None:
+        return html, "cached"
+    try:
+        resp = http_client.get(url, timeout=FETCH_TIMEOUT_SECONDS, stream=True)
+        content_type = resp.headers.get("Content-Type", "text/html")
+        if resp.status_code != 200 or "html" not in content_type.lower():
+            resp.close()
+            return None, "failed"
+        body = _read_limited(resp, ARTICLE_FETCH_MAX_BYTES)
+    except Exception:
+        return None, "failed"
+    if body is None:
+        return None, "failed"
+    html = decode_html(body, content_type)
+    try:
+        cache.put(url, html)
+    except (OSError, sqlite3.Error) as e:
+        # 원문 가져오기는 요약 품질을 높이는 선택 단계라 캐시 실패로 실행 전체를 멈추지 않음
+        print(f"[!] 페이지 캐시 저장 실패 ({url}): {e}", file=sys.stderr)
+    return html, "fetched"
+
+
+def fetch_full_articles(
+    articles: list[dict],
+    cache: PageCache | None = None,
+    max_workers: int = ARTICLE_FETCH_CONCURRENCY,
+) -> dict:
+    """
+    기사마다 원문 페이지를 (캐시 우선으로) 받아 본문을 article["content_text"]에 넣습니다.
+    받지 못했거나 본문을 찾지 못한 기사(failed)는 그대로 두므로 요약은 RSS summary로 합니다.
+    반환: {"cached", "fetched", "failed"} 기사 수
+    """
+    cache = cache or get_page_cache()
+    targets = [a for a in articles if a.get("link") and not a.get("content_text")]
+    stats = {"cached": 0, "fetched": 0, "failed": 0}
+    if not targets:
+        return stats
+
+    def work(article):
+        html, result = fetch_page(article["link"], cache)
+        text = extract_main_text(html) if html else ""
+        if not text:
+            return "failed"
+        article["content_text"] = text
+        return result
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(targets)))) as pool:
+        for result in pool.map(work, targets):
+            stats[result] += 1
+            _FETCHES.inc(result=result)
+    try:
+        cache.evict()
+    except (OSError, sqlite3.Error) as e:
+        print(f"[!] 페이지 캐시 정리 실패: {e}", file=sys.stderr)
+    return stats
+
+
+def main(argv: list[str]) -> int:
+    cache = get_page_cache()
+    command = argv[1] if len(argv) > 1 else "stats"
+    if command == "stats":
+        s = cache.stats()
+        print(f"페이지 {s['pages']}개, 본문 파일 {s['blobs']}개, {s['bytes'] / 1024 / 1024:.1f} MB")
+    elif command == "evict":
+        print(f"정리 완료: 페이지 {cache.evict()}개")
+    elif "://" in command:
+        html, result = fetch_page(command, cache)
+        if html is None:
+            print(f"가져오기 실패: {command}", file=sys.stderr)
+            return 1
+        print(f"[{result}]")
+        print(extract_main_text(html))
+    else:
+        print(f"알 수 없는 명령: {command} (stats | evict | URL)", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,229 @@
+"""
+웹 서버용 기사 저장소 (프로세스 내 캐시).
+소스의 시그니처(기사 DB 버전)가 바뀔 때만 다시 읽고,
+요청 처리 쪽에는 변경 불가능한 스냅샷을 돌려줍니다.
+
+gunicorn 워커마다 저장소가 하나씩 생기지만, 각 워커가 같은 소스의 시그니처를 보고
+스스로 다시 읽기 때문에 워커 수와 상관없이 동일하게 동작합니다.
+"""
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from types import MappingProxyType
+
+from article_db import article_uid, get_article_db, published_timestamp
+from config import OUTPUT_DIR
+from html_text import excerpt, summary_text
+
+
+def _freeze(article: dict) -> MappingProxyType:
+    """기사 딕셔너리를 읽기 전용 매핑으로 감쌉니다."""
+    return MappingProxyType(dict(article))
+
+
+def _listing_item(article: dict, uid: str) -> MappingProxyType:
+    """목록 페이지에 필요한 필드만 담은 가벼운 사본 (원문 HTML summary는 제외, 발췌는 수집할 때 만든 평문)."""
+    item = {
+        "uid": uid,
+        "title": article.get("title", ""),
+        "published": article.get("published", ""),
+        "link": article.get("link", ""),
+        "summary_ko": article.get("summary_ko", ""),
+        "published_ts": published_timestamp(article),
+    }
+    if not item["summary_ko"]:
+        item["excerpt"] = excerpt(article)
+    return MappingProxyType(item)
+
+
+@dataclass(frozen=True)
+class Page:
+    """목록의 한 페이지."""
+    items: tuple
+    page: int
+    per_page: int
+    total: int
+
+    @property
+    def pages(self) -> int:
+        return max(1, -(-self.total // self.per_page))
+
+    @property
+    def has_prev(self) -> bool:
+        return self.page > 1
+
+    @property
+    def has_next(self) -> bool:
+        return self.page < self.pages
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """
+    특정 시점의 기사 목록 (읽기 전용).
+    listing은 목록 페이지용 가벼운 사본, by_uid는 고정 ID → 기사 색인입니다.
+    """
+    articles: tuple = ()
+    listing: tuple = ()
+    by_uid: MappingProxyType = field(default_factory=lambda: MappingProxyType({}))
+    version: str = "empty"
+    loaded_at: float = 0.0
+    last_modified: float = 0.0
+
+    def get(self, uid: str):
+        """고정 ID로 기사를 찾습니다 (없으면 None)."""
+        return self.by_uid.get(uid)
+
+    def uid_at(self, position: int) -> str | None:
+        """목록상 위치(예전 /article/<번호> 주소)에 있는 기사의 고정 ID."""
+        if 0 <= position < len(self.listing):
+            return self.listing[position]["uid"]
+        return None
+
+    def page(self, page: int, per_page: int) -> Page:
+        """page번째(1부터) 페이지를 잘라 반환합니다. 범위를 벗어나면 가장 가까운 페이지로 맞춥니다."""
+        per_page = max(1, per_page)
+        total = len(self.listing)
+        last = max(1, -(-total // per_page))
+        page = min(max(1, page), last)
+        start = (page - 1) * per_page
+        return Page(items=self.listing[start:start + per_page], page=page, per_page=per_page, total=total)
+
+
+class ArticleDBSource:
+    """기사 DB(article_db)를 읽는 소스. 시그니처는 DB 버전이라 파일 stat보다 정확합니다."""
+
+    def __init__(self, output_dir: Path):
+        self.output_dir = Path(output_dir)
+
+    def signature(self):
+        return get_article_db(self.output_dir).signature()
+
+    def last_modified(self) -> float | None:
+        updated_at = get_article_db(self.output_dir).updated_at()
+        if not updated_at:
+            return None
+        return datetime.fromisoformat(updated_at.rstrip("Z")).replace(tzinfo=timezone.utc).timestamp()
+
+    def load(self) -> list[dict]:
+        return get_article_db(self.output_dir).load_all()
+
+    def iter_articles(self):
+        return get_article_db(self.output_dir).iter_articles()
+
+
+@dataclass
+class StoreStats:
+    hits: int = 0
+    misses: int = 0
+    reloads: int = 0
+    errors: int = 0
+
+
+class ArticleStore:
+    """
+    소스의 시그니처가 바뀔 때만 다시 읽는 기사 저장소.
+    snapshot()은 락 없이 현재 스냅샷을 확인하고, 다시 읽어야 할 때만 락을 잡습니다.
+    """
+
+    def __init__(self, source):
+        self.source = source
+        self._snapshot = Snapshot()
+        self._signature = None
+        self._lock = threading.Lock()
+        self.stats = StoreStats()
+
+    def snapshot(self) -> Snapshot:
+        """현재 기사 스냅샷을 반환합니다. 소스가 바뀌었으면 다시 읽습니다."""
+        sig = self.source.signature()
+        if sig is not None and sig == self._signature:
+            self.stats.hits += 1
+            return self._snapshot
+        with self._lock:
+            # 다른 스레드가 이미 다시 읽었을 수 있음
+            if sig is not None and sig == self._signature:
+                self.stats.hits += 1
+                return self._snapshot
+            self.stats.misses += 1
+            self._reload(sig)
+            return self._snapshot
+
+    def _reload(self, sig) -> None:
+        if sig is None:
+            self._snapshot = Snapshot()
+            self._signature = None
+            return
+        try:
+            articles = self.source.load()
+        except Exception:
+            # 파싱 실패 시 이전 스냅샷을 유지 (다음 요청에서 다시 시도)
+            self.stats.errors += 1
+            return
+        now = time.time()
+        last_modified_fn = getattr(self.source, "last_modified", None)
+        last_modified = last_modified_fn() if last_modified_fn else None
+        frozen = []
+        listing = []
+        by_uid = {}
+        for a in articles:
+            uid = article_uid(a)
+            if uid in by_uid:
+                continue
+            # 예전에 저장된 기사는 정리된 평문이 없으므로 다시 읽을 때 한 번만 만들어 둠 (요청마다 변환하지 않음)
+            record = _freeze({**a, "uid": uid, "summary_text": summary_text(a)})
+            frozen.append(record)
+            listing.append(_listing_item(a, uid))
+            by_uid[uid] = record
+        self._snapshot = Snapshot(
+            articles=tuple(frozen),
+            listing=tuple(listing),
+            by_uid=MappingProxyType(by_uid),
+            version="-".join(str(x) for x in sig),
+            loaded_at=now,
+            last_modified=last_modified or now,
+        )
+        self._signature = sig
+        self.stats.reloads += 1
+
+    def articles(self) -> tuple:
+        return self.snapshot().articles
+
+    def iter_articles(self):
+        """
+        기사를 순서대로 하나씩 돌려줍니다. 소스가 지원하면 스냅샷을 거치지 않고 바로 읽으므로
+        전체 내보내기처럼 큰 응답도 메모리를 거의 쓰지 않습니다.
+        """
+        iter_fn = getattr(self.source, "iter_articles", None)
+        if iter_fn is not None:
+            for article in iter_fn():
+                yield {**article, "uid": article_uid(article)}
+        else:
+            yield from (dict(a) for a in self.snapshot().articles)
+
+    def stats_dict(self) -> dict:
+        snap = self._snapshot
+        return {
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+            "reloads": self.stats.reloads,
+            "errors": self.stats.errors,
+            "version": snap.version,
+            "count": len(snap.articles),
+        }
+
+
+_default_store = None
+_default_lock = threading.Lock()
+
+
+def get_store() -> ArticleStore:
+    """프로젝트 루트의 output/ 기사 DB를 보는 공용 저장소를 반환합니다."""
+    global _default_store
+    if _default_store is None:
+        with _default_lock:
+            if _default_store is None:
+                root = Path(__file__).resolve().parent
+                _default_store = ArticleStore(ArticleDBSource(root / OUTPUT_DIR))
+    return _default_store
@@ -0,0 +1,280 @@
+#!/usr/bin/env python3
+"""
+과거 기사 가져오기 (backfill).
+WordPress 페이지 피드(?paged=N)나 OPML에 적힌 피드들을 페이지 단위로 내려가며 읽고,
+저장소에 없는 기사만 요약해 목록 맨 뒤(오래된 쪽)에 덧붙입니다.
+
+- 피드 XML은 iterparse로 항목(<item>/<entry>)마다 읽고 바로 버리므로, 페이지가 커도 메모리가 일정합니다.
+- 기사는 batch_size개씩 요약·저장하므로 아무리 깊이 내려가도 메모리에 쌓이지 않습니다.
+- 이미 저장된 링크는 건너뛰고, 새 기사를 가져온 뒤 저장된 기사를 다시 만나면 (이미 가져온 구간) 멈춥니다.
+- 피드별로 마지막으로 저장을 마친 페이지를 output/backfill_state.json에 기록해, 중단해도 이어서 실행할 수 있습니다.
+- 업데이트 워커(worker.py)나 run_with_summary.py가 실행 중이면 같이 돌지 않고 바로 끝납니다 (종료 코드 1).
+
+사용법:
+  python backfill.py                                   # 기본 피드(TechCrunch AI)를 1페이지부터
+  python backfill.py --max-pages 50 --batch-size 10 https://techcrunch.com/category/artificial-intelligence/feed/
+  python backfill.py --opml feeds.opml --resume
+"""
+import argparse
+import json
+import os
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import http_client
+from article_db import get_article_db
+from config import (
+    FULL_ARTICLE_FETCH,
+    GEMINI_MAX_CONCURRENCY,
+    GEMINI_REQUESTS_PER_MINUTE,
+    OUTPUT_DIR,
+    TECHCRUNCH_AI_FEED_URL,
+)
+from html_text import add_text_fields
+from search_index import get_search_index
+
+BACKFILL_STATE_JSON = "backfill_state.json"
+_ATOM = "{http://www.w3.org/2005/Atom}"
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _child_text(elem, *names: str) -> str:
+    for child in elem:
+        if _local(child.tag) in names and (child.text or "").strip():
+            return child.text.strip()
+    return ""
+
+
+def _entry_to_article(elem) -> dict:
+    """<item>(RSS) 또는 <entry>(Atom) 요소를 parse_entries와 같은 형태의 딕셔너리로 바꿉니다."""
+    link = _child_text(elem, "link")
+    if not link:
+        # Atom: <link rel="alternate" href="..."/>
+        for child in elem.iter(_ATOM + "link"):
+            if child.get("rel", "alternate") == "alternate" and child.get("href"):
+                link = child.get("href")
+                break
+    return add_text_fields({
+        "title": _child_text(elem, "title"),
+        "link": link,
+        "published": _child_text(elem, "pubDate", "published", "updated"),
+        "summary": _child_text(elem, "description", "summary", "content"),
+        "id": _child_text(elem, "guid", "id") or link,
+    })
+
+
+def iter_feed_entries(stream):
+    """
+    RSS/Atom XML 스트림에서 기사를 하나씩 만들어 돌려줍니다.
+    처리한 항목은 트리에서 떼어 내므로 문서 전체가 메모리에 남지 않습니다.
+    """
+    parents = []
+    for event, elem in ET.iterparse(stream, events=("start", "end")):
+        if event == "start":
+            parents.append(elem)
+            continue
+        parents.pop()
+        if _local(elem.tag) in ("item", "entry"):
+            yield _entry_to_article(elem)
+            elem.clear()
+            if parents:
+                parents[-1].remove(elem)
+
+
+def iter_opml_feeds(source: str):
+    """OPML 파일(경로 또는 URL)의 outline xmlUrl을 차례로 돌려줍니다."""
+    stream = _open(source) if "://" in source else open(source, "rb")
+    with stream:
+        for _, elem in ET.iterparse(stream, events=("end",)):
+            if _local(elem.tag) == "outline":
+                url = elem.get("xmlUrl")
+                if url:
+                    yield url
+                elem.clear()
+
+
+def page_url(url: str, page: int) -> str:
+    """피드 URL에 WordPress 페이지 번호(paged=N)를 붙입니다."""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != "paged"]
+    if page > 1:
+        query.append(("paged", str(page)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+def _open(url: str, timeout: float = 30.0):
+    """URL을 공용 HTTP 세션으로 열어 (압축을 풀며 읽는) 스트림을 돌려줍니다. 4xx/5xx면 requests.HTTPError."""
+    resp = http_client.get(url, timeout=timeout, stream=True)
+    if resp.status_code >= 400:
+        resp.close()
+        resp.raise_for_status()
+    resp.raw.decode_content = True
+    return resp.raw
+
+
+def iter_paged_entries(url: str, start_page: int = 1, max_pages: int | None = None):
+    """
+    페이지 피드를 start_page부터 내려가며 (페이지 번호, 기사)를 돌려줍니다.
+    페이지가 없거나(404) 비어 있으면 끝납니다.
+    """
+    page = start_page
+    while max_pages is None or page < start_page + max_pages:
+        try:
+            stream = _open(page_url(url, page))
+        except Exception as e:
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            if status in (404, 410):
+                return
+            raise
+        found = False
+        with stream:
+            for article in iter_feed_entries(stream):
+                found = True
+                yield page, article
+        if not found:
+            return
+        page += 1
+
+
+def load_backfill_state(output_dir: str = OUTPUT_DIR) -> dict:
+    path = Path(output_dir) / BACKFILL_STATE_JSON
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_backfill_state(state: dict, output_dir: str = OUTPUT_DIR) -> None:
+    path = Path(output_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    filepath = path / BACKFILL_STATE_JSON
+    tmp = filepath.with_suffix(filepath.suffix + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, filepath)
+
+
+def _flush(batch: list[dict], output_dir: str, summarize_kwargs: dict) -> tuple[int, int]:
+    """기사 묶음을 요약해 저장소 맨 뒤에 덧붙입니다. (저장한 수, 요약 실패 수)"""
+    from summarizer import merge_and_summarize
+
+    if FULL_ARTICLE_FETCH:
+        from article_fetcher import fetch_full_articles
+        fetch_full_articles(batch)
+    summarized, failed = merge_and_summarize(batch, [], **summarize_kwargs)
+    for f in failed:
+        print(f"  [!] 요약 실패: {f['title'][:60]} ({f['error']})")
+    result = get_article_db(output_dir).append_older(summarized)
+    get_search_index(output_dir).update(changed=result.changed)
+    return result.written, len(failed)
+
+
+def backfill_feed(
+    url: str,
+    output_dir: str = OUTPUT_DIR,
+    start_page: int = 1,
+    max_pages: int | None = None,
+    batch_size: int = 20,
+    stop_at_known: bool = True,
+    **summarize_kwargs,
+) -> dict:
+    """
+    피드 하나를 페이지 단위로 가져옵니다.
+    - stop_at_known: 새 기사를 가져온 뒤 이미 저장된 기사를 만나면 멈춤
+    - summarize_kwargs: merge_and_summarize에 넘길 요약 설정 (client, requests_per_minute 등)
+    반환: {"saved", "failed", "skipped", "last_page", "stopped_at_known"}
+    """
+    db = get_article_db(output_dir)
+    stats = {"saved": 0, "failed": 0, "skipped": 0, "last_page": start_page - 1, "stopped_at_known": False}
+    batch: list[dict] = []
+    batch_links: set[str] = set()
+    batch_page = start_page
+    state = load_backfill_state(output_dir)
+
+    def flush():
+        saved, failed = _flush(batch, output_dir, summarize_kwargs)
+        stats["saved"] += saved
+        stats["failed"] += failed
+        # 이 페이지까지 저장했음을 기록 (다음 실행은 이 페이지부터 다시 보고, 저장된 기사는 건너뜀)
+        state[url] = {"next_page": batch_page}
+        save_backfill_state(state, output_dir)
+        print(f"  {batch_page}페이지까지 {stats['saved']}개 저장", flush=True)
+        batch.clear()
+        batch_links.clear()
+
+    for page, article in iter_paged_entries(url, start_page, max_pages):
+        stats["last_page"] = page
+        link = article.get("link")
+        if not link or link in batch_links:
+            continue
+        if db.has_link(link):
+            if stop_at_known and (stats["saved"] or batch):
+                stats["stopped_at_known"] = True
+                break
+            stats["skipped"] += 1
+            continue
+        batch.append(article)
+        batch_links.add(link)
+        batch_page = page
+        if len(batch) >= batch_size:
+            flush()
+    if batch:
+        flush()
+    return stats
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("urls", nargs="*", help=f"페이지 피드 URL (기본값 {TECHCRUNCH_AI_FEED_URL})")
+    parser.add_argument("--opml", help="피드 목록 OPML 파일 경로 또는 URL")
+    parser.add_argument("--start-page", type=int, default=1)
+    parser.add_argument("--max-pages", type=int, default=None, help="피드당 최대 페이지 수")
+    parser.add_argument("--batch-size", type=int, default=20, help="한 번에 요약·저장할 기사 수")
+    parser.add_argument("--resume", action="store_true", help="backfill_state.json에 기록된 페이지부터 이어서")
+    parser.add_argument("--no-stop", action="store_true", help="저장된 기사를 만나도 멈추지 않고 끝까지")
+    args = parser.parse_args(argv)
+    # 업데이트 워커와 동시에 돌면 요약 요청이 겹치고 저장소에 겹쳐 쓰므로 같은 잠금을 잡음
+    from worker import run_exclusive
+    return run_exclusive(lambda: _run(args), "backfill")
+
+
+def _run(args) -> int:
+    urls = list(args.urls)
+    if args.opml:
+        urls.extend(iter_opml_feeds(args.opml))
+    if not urls:
+        urls = [TECHCRUNCH_AI_FEED_URL]
+
+    state = load_backfill_state()
+    for url in urls:
+        start = state.get(url, {}).get("next_page", args.start_page) if args.resume else args.start_page
+        print(f"[backfill] {url} ({start}페이지부터)", flush=True)
+        try:
+            stats = backfill_feed(
+                url,
+                start_page=start,
+                max_pages=args.max_pages,
+                batch_size=args.batch_size,
+                stop_at_known=not args.no_stop,
+                requests_per_minute=GEMINI_REQUESTS_PER_MINUTE,
+                max_concurrency=GEMINI_MAX_CONCURRENCY,
+            )
+        except Exception as e:
+            print(f"  [!] 실패: {e}", file=sys.stderr)
+            continue
+        note = " (이미 저장된 기사에 도달해 중단)" if stats["stopped_at_known"] else ""
+        print(
+            f"  완료: 저장 {stats['saved']}개, 실패 {stats['failed']}개, "
+            f"건너뜀 {stats['skipped']}개, 마지막 페이지 {stats['last_page']}{note}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
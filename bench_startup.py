@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+시작 시간(import 시간) 벤치마크.
+진입점 모듈마다 새 인터프리터에서 `python -X importtime -c "import 모듈"`을 실행해 누적 import 시간을 재고,
+불러오면 안 되는 무거운 모듈(SDK 등)이 딸려 오는지 확인합니다. 결과는 JSON으로 저장되어 커밋 간 비교에 쓸 수 있습니다.
+
+진입점과 금지 모듈:
+  app               웹 워커 - Flask와 기사 저장소만 (genai, feedparser, requests, apscheduler, summarizer 금지)
+  worker            작업 워커 - 큐만 (genai, feedparser, requests, flask 금지)
+  scheduled_update  cron 진입점 - 오늘 이미 업데이트했으면 바로 끝나야 함 (genai, feedparser, requests, flask 금지)
+  run_with_summary  수집 + 요약 - SDK는 실제로 요약할 때만 (genai 금지)
+
+금지 모듈이 보이거나 --max-ms를 넘으면 종료 코드 1을 반환하므로 CI에서 회귀 검사로 쓸 수 있습니다.
+
+사용법:
+  python bench_startup.py
+  python bench_startup.py --repeat 10 --max-ms 400 --out bench/startup.json
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+
+ENTRY_POINTS = {
+    "app": ("google.genai", "feedparser", "requests", "apscheduler", "summarizer"),
+    "worker": ("google.genai", "feedparser", "requests", "flask"),
+    "scheduled_update": ("google.genai", "feedparser", "requests", "flask"),
+    "run_with_summary": ("google.genai",),
+}
+
+_IMPORTTIME_RE = re.compile(r"^import time:\s+(\d+)\s*\|\s*(\d+)\s*\|(\s*)(\S+)")
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=5)
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def measure(module: str) -> dict:
+    """새 인터프리터에서 모듈 하나를 import하고 (누적 시간, 불러온 모듈 목록, 가장 오래 걸린 모듈)을 돌려줍니다."""
+    env = {**os.environ, "METRICS_ENABLED": "false", "PYTHONDONTWRITEBYTECODE": "1"}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=120,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{module} import 실패:\n{proc.stderr[-2000:]}")
+    total_us = None
+    imported = []
+    children = []  # 측정 대상 모듈이 직접 불러온 모듈 (importtime은 자식을 부모보다 먼저 출력)
+    pending = []
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_RE.match(line)
+        if not match:
+            continue
+        _, cumulative_us, indent, name = match.groups()
+        imported.append(name)
+        if len(indent) == 1:
+            if name == module:
+                total_us = int(cumulative_us)
+                children = pending
+            pending = []
+        elif len(indent) == 3:
+            pending.append((name, int(cumulative_us)))
+    top = sorted(children, key=lambda x: -x[1])[:5]
+    return {
+        "total_ms": (total_us or 0) / 1000,
+        "modules": set(imported),
+        "top": [{"module": n, "ms": round(c / 1000, 2)} for n, c in top],
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", default=",".join(ENTRY_POINTS), help="잴 진입점 모듈 (쉼표로 구분)")
+    parser.add_argument("--repeat", type=int, default=5, help="모듈마다 반복 횟수 (중앙값 사용)")
+    parser.add_argument("--max-ms", type=float, default=None, help="진입점 하나의 import 시간 상한 (넘으면 실패)")
+    parser.add_argument("--out", default="output/bench_startup.json", help="결과 JSON 경로")
+    args = parser.parse_args(argv)
+
+    report = {
+        "commit": _git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {k: v for k, v in vars(args).items() if k != "out"},
+        "results": {},
+    }
+    failed = False
+    for module in [m.strip() for m in args.modules.split(",") if m.strip()]:
+        runs = [measure(module) for _ in range(max(1, args.repeat))]
+        median_ms = statistics.median(r["total_ms"] for r in runs)
+        forbidden = sorted(
+            name for name in ENTRY_POINTS.get(module, ())
+            if any(m == name or m.startswith(name + ".") for m in runs[-1]["modules"])
+        )
+        over = args.max_ms is not None and median_ms > args.max_ms
+        failed = failed or bool(forbidden) or over
+        report["results"][module] = {
+            "median_ms": round(median_ms, 2),
+            "min_ms": round(min(r["total_ms"] for r in runs), 2),
+            "modules": len(runs[-1]["modules"]),
+            "forbidden": forbidden,
+            "top": runs[-1]["top"],
+        }
+        note = ""
+        if forbidden:
+            note += f"  [!] 불러오면 안 되는 모듈: {', '.join(forbidden)}"
+        if over:
+            note += f"  [!] 상한 {args.max_ms:g} ms 초과"
+        top = ", ".join(f"{t['module']} {t['ms']:.0f}" for t in runs[-1]["top"][:3])
+        print(f"  {module:18s} {median_ms:8.1f} ms  ({top}){note}")
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"결과 저장: {out}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
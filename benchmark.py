@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""
+수집 → 요약 → 저장 → 웹 뷰 파이프라인 벤치마크.
+합성 RSS 피드와 기사 저장소를 만들고, Gemini 대신 fake_genai.FakeClient를 써서
+API 키·네트워크 없이 단계별 시간을 잽니다. 결과는 JSON으로 저장되어 커밋 간 비교에 쓸 수 있습니다.
+
+측정 단계:
+  feedparser_parse        합성 피드 XML 파싱 (feedparser)
+  parse_entries           합성 피드(기사 size개) 파싱 결과를 기사 목록으로 변환
+  save_summarized_initial 기존 저장소(size - new개) 처음 저장 (검색 색인 생성 포함)
+  merge_and_summarize     새 기사 new개 요약 + 병합 (가짜 클라이언트 지연/오류율 적용)
+  save_summarized         병합 결과 증분 저장
+  view_index / view_article_detail              렌더링 캐시 없이 요청당 시간
+  view_index_cached / view_article_detail_cached 렌더링 캐시 적중 시 요청당 시간
+
+사용법:
+  python benchmark.py --sizes 100,1000,10000 --new 50 --latency 0.02 --error-rate 0.05
+  python benchmark.py --sizes 100000 --requests 200 --out bench/big.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+# 벤치마크는 항상 가짜 클라이언트를 거치도록 요약 캐시·모델 라우터(상태 파일)와 JSON 내보내기를 끔 (config를 읽기 전에 설정)
+os.environ["SUMMARY_CACHE_ENABLED"] = "false"
+os.environ["MODEL_ROUTER_ENABLED"] = "false"
+os.environ["EXPORT_SUMMARIZED_JSON"] = "false"
+
+import feedparser  # noqa: E402
+
+import article_store  # noqa: E402
+from fake_genai import FakeClient  # noqa: E402
+from rss_fetcher import parse_entries  # noqa: E402
+from summarizer import merge_and_summarize, save_summarized  # noqa: E402
+
+_WORDS = (
+    "ai model startup funding agent robot chip nvidia openai google anthropic data center "
+    "inference training benchmark enterprise open source release launch partnership "
+    "regulation safety research developer api cloud gpu series round valuation"
+).split()
+_WORDS_KO = "인공지능 모델 스타트업 투자 에이전트 로봇 반도체 데이터센터 추론 학습 출시 규제 안전 연구 개발자 클라우드".split()
+
+
+def _sentence(rng: random.Random, words: list[str], n: int) -> str:
+    return " ".join(rng.choice(words) for _ in range(n))
+
+
+def make_articles(count: int, seed: int = 0) -> list[dict]:
+    """최신 순으로 정렬된 합성 기사 목록 (RSS에서 막 파싱한 형태)."""
+    rng = random.Random(seed)
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    articles = []
+    for i in range(count):
+        published = base - timedelta(minutes=7 * i)
+        paragraphs = "".join(f"<p>{_sentence(rng, _WORDS, 40)}.</p>" for _ in range(3))
+        articles.append({
+            "title": _sentence(rng, _WORDS, 8).capitalize(),
+            "link": f"https://techcrunch.com/{published:%Y/%m/%d}/bench-{i}/",
+            "published": format_datetime(published),
+            "summary": paragraphs,
+            "id": f"https://techcrunch.com/?p={1000000 + i}",
+        })
+    return articles
+
+
+def make_feed_xml(articles: list[dict]) -> bytes:
+    """기사 목록으로 RSS 2.0 문서를 만듭니다."""
+    items = "".join(
+        "<item>"
+        f"<title>{escape(a['title'])}</title>"
+        f"<link>{escape(a['link'])}</link>"
+        f"<guid isPermaLink=\"false\">{escape(a['id'])}</guid>"
+        f"<pubDate>{a['published']}</pubDate>"
+        f"<description>{escape(a['summary'])}</description>"
+        "</item>"
+        for a in articles
+    )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        "<title>TechCrunch AI (bench)</title><link>https://techcrunch.com/</link>"
+        f"<description>synthetic</description>{items}</channel></rss>"
+    ).encode("utf-8")
+
+
+def with_summaries(articles: list[dict], seed: int = 0) -> list[dict]:
+    """이미 요약해 둔 기사처럼 summary_ko를 채웁니다."""
+    rng = random.Random(seed)
+    return [{**a, "summary_ko": _sentence(rng, _WORDS_KO, 30) + "."} for a in articles]
+
+
+def timing_stats(samples: list[float]) -> dict:
+    """초 단위 측정값 목록의 요약 (밀리초)."""
+    ordered = sorted(samples)
+    n = len(ordered)
+    return {
+        "count": n,
+        "total_ms": round(sum(ordered) * 1000, 3),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 3),
+        "p50_ms": round(ordered[n // 2] * 1000, 3),
+        "p95_ms": round(ordered[min(n - 1, int(n * 0.95))] * 1000, 3),
+        "max_ms": round(ordered[-1] * 1000, 3),
+    }
+
+
+def _timed(fn, *args, **kwargs):
+    start = time.perf_counter()
+    value = fn(*args, **kwargs)
+    return value, time.perf_counter() - start
+
+
+def _time_requests(client, urls: list[str]) -> list[float]:
+    samples = []
+    for url in urls:
+        start = time.perf_counter()
+        response = client.get(url)
+        samples.append(time.perf_counter() - start)
+        if response.status_code != 200:
+            raise RuntimeError(f"{url} -> {response.status_code}")
+    return samples
+
+
+def bench_views(output_dir: Path, requests: int, seed: int) -> dict:
+    """Flask 테스트 클라이언트로 목록/상세 페이지를 요청해 시간을 잽니다."""
+    import app as web
+    from view_cache import RenderCache
+
+    article_store._default_store = article_store.ArticleStore(article_store.ArticleDBSource(output_dir))
+    snap = article_store.get_store().snapshot()
+    rng = random.Random(seed)
+    pages = max(1, -(-len(snap.listing) // web.INDEX_PER_PAGE))
+    index_urls = [f"/?page={rng.randint(1, pages)}" for _ in range(requests)]
+    detail_urls = [f"/articles/{snap.uid_at(rng.randrange(len(snap.listing)))}" for _ in range(requests)]
+
+    client = web.app.test_client()
+    results = {}
+    cache = web._render_cache
+    try:
+        web._render_cache = RenderCache(0)  # 아무것도 담지 않는 캐시 = 매번 렌더링
+        results["view_index"] = timing_stats(_time_requests(client, index_urls))
+        results["view_article_detail"] = timing_stats(_time_requests(client, detail_urls))
+        web._render_cache = RenderCache(web.RENDER_CACHE_MAX_BYTES)
+        _time_requests(client, index_urls + detail_urls)  # 캐시 채우기
+        results["view_index_cached"] = timing_stats(_time_requests(client, index_urls))
+        results["view_article_detail_cached"] = timing_stats(_time_requests(client, detail_urls))
+    finally:
+        web._render_cache = cache
+    return results
+
+
+def bench_size(size: int, args) -> dict:
+    new = min(args.new, size)
+    articles = make_articles(size, seed=args.seed)
+    stages = {}
+
+    feed, seconds = _timed(feedparser.parse, make_feed_xml(articles))
+    stages["feedparser_parse"] = timing_stats([seconds])
+
+    fresh, seconds = _timed(parse_entries, feed)
+    stages["parse_entries"] = timing_stats([seconds])
+
+    with tempfile.TemporaryDirectory(prefix="bench-") as tmp:
+        output_dir = Path(tmp)
+        existing = with_summaries(fresh[new:], seed=args.seed)
+        _, seconds = _timed(save_summarized, existing, str(output_dir))
+        stages["save_summarized_initial"] = timing_stats([seconds])
+
+        client = FakeClient(latency=args.latency, error_rate=args.error_rate, seed=args.seed)
+        (merged, failed), seconds = _timed(
+            merge_and_summarize, fresh, existing,
+            delay_seconds=0, client=client,
+            max_concurrency=args.concurrency, batch_size=args.batch_size,
+        )
+        stages["merge_and_summarize"] = {
+            **timing_stats([seconds]),
+            "new_articles": new,
+            "failed": len(failed),
+            "api_calls": client.calls,
+        }
+
+        _, seconds = _timed(save_summarized, merged, str(output_dir))
+        stages["save_summarized"] = timing_stats([seconds])
+
+        if args.requests:
+            stages.update(bench_views(output_dir, args.requests, args.seed))
+    return {"size": size, "stages": stages}
+
+
+def _git_commit() -> str | None:
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=Path(__file__).resolve().parent, capture_output=True, text=True, timeout=5,
+        )
+        return out.stdout.strip() or None
+    except Exception:
+        return None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="100,1000,10000", help="피드/저장소 기사 수 (쉼표로 구분)")
+    parser.add_argument("--new", type=int, default=50, help="요약할 새 기사 수")
+    parser.add_argument("--latency", type=float, default=0.02, help="가짜 API 호출당 지연(초)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="가짜 API 오류 비율 (0~1)")
+    parser.add_argument("--concurrency", type=int, default=4, help="동시 요약 수")
+    parser.add_argument("--batch-size", type=int, default=1, help="요청당 묶어 요약할 기사 수")
+    parser.add_argument("--requests", type=int, default=100, help="뷰마다 보낼 요청 수 (0이면 뷰 측정 생략)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="output/benchmark.json", help="결과 JSON 경로")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s.strip()]
+    report = {
+        "commit": _git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {k: v for k, v in vars(args).items() if k != "out"},
+        "results": [],
+    }
+    for size in sizes:
+        print(f"[bench] 기사 {size}개 ...", flush=True)
+        result = bench_size(size, args)
+        report["results"].append(result)
+        for name, stats in result["stages"].items():
+            print(f"  {name:28s} p50 {stats['p50_ms']:10.2f} ms  total {stats['total_ms']:10.2f} ms")
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"결과 저장: {out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
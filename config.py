@@ -1,12 +1,100 @@
+import os
+
 # TechCrunch AI 카테고리 RSS 피드 (공식)
 TECHCRUNCH_AI_FEED_URL = "https://techcrunch.com/category/artificial-intelligence/feed/"
 
+# 수집할 피드 목록 (name: 기사 source 필드에 기록, timeout: 피드별 요청 제한 시간(초))
+# 피드를 추가하면 모두 동시에 수집하고, 링크·GUID 기준으로 중복을 제거합니다.
+FEEDS = [
+    {"name": "techcrunch-ai", "url": TECHCRUNCH_AI_FEED_URL, "timeout": 30},
+    # {"name": "techcrunch-robotics", "url": "https://techcrunch.com/category/robotics/feed/", "timeout": 30},
+    # {"name": "venturebeat-ai", "url": "https://venturebeat.com/category/ai/feed/", "timeout": 30},
+]
+FEED_MAX_WORKERS = 4  # 동시에 가져올 피드 수
+
+# 외부 HTTP 요청 (피드·기사 본문) - 공용 세션의 연결 풀 크기, 같은 호스트에 동시에 보낼 요청 수, 재시도
+HTTP_POOL_SIZE = 10
+HTTP_PER_HOST_LIMIT = 2
+HTTP_MAX_RETRIES = int(os.environ.get("HTTP_MAX_RETRIES", "2"))
+HTTP_BACKOFF_SECONDS = 1.0  # 재시도 대기: 0 ~ HTTP_BACKOFF_SECONDS * 2^시도 사이 무작위
+
 # 수집 결과 저장 경로
 OUTPUT_DIR = "output"
 ARTICLES_JSON = "articles.json"
 SUMMARIZED_JSON = "summarized_articles.json"
+FEED_STATE_JSON = "feed_state.json"  # 피드별 ETag / Last-Modified (조건부 요청용)
+SUMMARY_CHECKPOINT_JSONL = "summary_checkpoint.jsonl"  # 실행 중 요약 체크포인트 (중단 후 이어서 실행용)
+ARTICLES_DB = "articles.sqlite3"  # 요약 기사 저장소 (summarized_articles.json 대신 사용)
+SEARCH_INDEX_DB = "search_index.sqlite3"  # 전문 검색 색인
+# 저장해서 바뀐 게 있으면 예전 형식의 summarized_articles.json도 다시 내보냄 (호환용, 필요 없으면 false)
+EXPORT_SUMMARIZED_JSON = os.environ.get("EXPORT_SUMMARIZED_JSON", "true").lower() == "true"
+
+# 웹 목록 페이지 - 기본 / 최대 페이지당 기사 수
+INDEX_PER_PAGE = 20
+INDEX_MAX_PER_PAGE = 100
+SEARCH_MAX_PAGES = int(os.environ.get("SEARCH_MAX_PAGES", "10"))  # 검색 결과는 이 페이지까지만 (색인 조회량·렌더 캐시 항목 제한)
+DETAIL_CACHE_MAX_AGE = 86400  # 기사 상세 페이지 Cache-Control max-age(초)
+FEED_CACHE_MAX_AGE = 300  # /feed.xml, /atom.xml Cache-Control max-age(초)
+RENDER_CACHE_MAX_BYTES = 32 * 1024 * 1024  # 렌더링한 HTML 캐시 상한 (워커당)
+API_MAX_LIMIT = 200  # /api/articles 한 번에 돌려줄 최대 기사 수
+API_RESULT_CACHE_MAX_BYTES = 4 * 1024 * 1024  # /api/articles 결과 캐시 상한 (워커당)
+EXCERPT_CHARS = 200  # 수집할 때 만들어 두는 본문 발췌(excerpt) 길이
+FEED_MAX_ENTRIES = int(os.environ.get("FEED_MAX_ENTRIES", "50"))  # RSS / Atom / JSON 피드에 넣을 최근 기사 수
+# 사이트의 공개 주소 (예: https://example.com). 피드의 절대 링크와 정적 사이트의 경로 접두어에 사용
+SITE_URL = os.environ.get("SITE_URL", "").rstrip("/")
+
+# 정적 사이트 내보내기 - 디렉터리를 주면 요약을 저장할 때마다 HTML·피드를 미리 렌더링해 씀 (비우면 끔)
+STATIC_SITE_DIR = os.environ.get("STATIC_SITE_DIR", "")
 
 # Gemini API - 반드시 환경 변수 GEMINI_API_KEY 설정 (config에 키 넣지 말 것, 유출 위험)
-import os
 GEMINI_API_KEY = os.environ.get("GEMINI_API_KEY", "")
 GEMINI_MODEL = "gemini-2.5-flash"
+# 프롬프트에 넣을 기사 본문의 토큰 예산 (추정치). 넘으면 리드 + 핵심어가 많은 문장만 골라 넣음
+PROMPT_TOKEN_BUDGET = int(os.environ.get("PROMPT_TOKEN_BUDGET", "1000"))
+PROMPT_TOKEN_BUDGETS = {  # 모델별 예산 (없으면 PROMPT_TOKEN_BUDGET)
+    # "gemini-2.0-flash": 600,
+}
+
+# 모델 상태 기반 라우팅 (output/model_health.json) - 연속 실패 몇 번에 회로를 열지, 다시 시험할 때까지 기다릴 시간(초)
+MODEL_ROUTER_ENABLED = os.environ.get("MODEL_ROUTER_ENABLED", "true").lower() == "true"
+MODEL_HEALTH_JSON = "model_health.json"
+CIRCUIT_FAILURE_THRESHOLD = int(os.environ.get("CIRCUIT_FAILURE_THRESHOLD", "3"))
+CIRCUIT_COOLDOWN_SECONDS = float(os.environ.get("CIRCUIT_COOLDOWN_SECONDS", "300"))
+ROUTER_EWMA_ALPHA = 0.3  # 오류율·지연 시간 EWMA 가중치
+ROUTER_SLOW_SECONDS = float(os.environ.get("ROUTER_SLOW_SECONDS", "30"))  # 평균 지연이 이보다 길면 쿨다운 동안 뒤로 미룸
+
+# 요약 실행기 - 분당 요청 수(토큰 버킷), 동시 실행 수, 실행 모드("thread" 또는 "asyncio")
+GEMINI_REQUESTS_PER_MINUTE = float(os.environ.get("GEMINI_REQUESTS_PER_MINUTE", "5"))
+GEMINI_MAX_CONCURRENCY = int(os.environ.get("GEMINI_MAX_CONCURRENCY", "2"))
+SUMMARY_EXECUTOR_MODE = os.environ.get("SUMMARY_EXECUTOR_MODE", "thread")
+# 여러 기사를 한 프롬프트로 묶어 요약 (1이면 기사마다 한 번씩 요청)
+SUMMARY_BATCH_SIZE = int(os.environ.get("SUMMARY_BATCH_SIZE", "1"))
+SUMMARY_BATCH_TOKEN_BUDGET = int(os.environ.get("SUMMARY_BATCH_TOKEN_BUDGET", "8000"))  # 묶음 프롬프트의 대략적인 입력 토큰 상한
+
+# 요약 캐시 (모델 + 프롬프트 해시 기준, output/summary_cache.sqlite3)
+SUMMARY_CACHE_ENABLED = os.environ.get("SUMMARY_CACHE_ENABLED", "true").lower() == "true"
+SUMMARY_CACHE_MAX_ENTRIES = int(os.environ.get("SUMMARY_CACHE_MAX_ENTRIES", "20000"))
+SUMMARY_CACHE_MAX_AGE_DAYS = float(os.environ.get("SUMMARY_CACHE_MAX_AGE_DAYS", "180"))
+SUMMARY_CACHE_MAX_BYTES = int(os.environ.get("SUMMARY_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+
+# 기사 원문 가져오기 (켜면 새 기사의 페이지 HTML을 받아 본문을 요약에 사용, output/page_cache/에 압축 캐시)
+FULL_ARTICLE_FETCH = os.environ.get("FULL_ARTICLE_FETCH", "false").lower() == "true"
+ARTICLE_FETCH_CONCURRENCY = int(os.environ.get("ARTICLE_FETCH_CONCURRENCY", "4"))
+ARTICLE_FETCH_MAX_BYTES = int(os.environ.get("ARTICLE_FETCH_MAX_BYTES", str(5 * 1024 * 1024)))  # 이보다 큰 페이지는 받지 않음
+PAGE_CACHE_TTL_DAYS = float(os.environ.get("PAGE_CACHE_TTL_DAYS", "30"))
+PAGE_CACHE_MAX_BYTES = int(os.environ.get("PAGE_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))  # 압축된 크기 기준
+
+# 업데이트 작업 큐 (output/jobs.sqlite3) - 워커 임대 시간, 작업당 최대 시도 횟수
+JOBS_DB = "jobs.sqlite3"
+JOB_LEASE_SECONDS = float(os.environ.get("JOB_LEASE_SECONDS", "300"))
+JOB_MAX_ATTEMPTS = int(os.environ.get("JOB_MAX_ATTEMPTS", "3"))
+# 요약에 계속 실패하는 기사: 재시도 간격(초, 실패할 때마다 두 배)과 최대 시도 횟수
+ARTICLE_RETRY_BACKOFF_SECONDS = float(os.environ.get("ARTICLE_RETRY_BACKOFF_SECONDS", "3600"))
+ARTICLE_RETRY_MAX_ATTEMPTS = int(os.environ.get("ARTICLE_RETRY_MAX_ATTEMPTS", "5"))
+
+# 내장 스케줄러 (매일 00:00 KST 업데이트). 켜면 gunicorn 마스터 / python app.py 프로세스 하나에서만 돎
+SCHEDULER_ENABLED = os.environ.get("SCHEDULER_ENABLED", "false").lower() == "true"
+
+# 계측 (/metrics) - 프로세스별 값을 output/metrics/<pid>.json에 주기적으로 기록해 워커 간 합산
+METRICS_ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() == "true"
+METRICS_FLUSH_SECONDS = float(os.environ.get("METRICS_FLUSH_SECONDS", "1"))
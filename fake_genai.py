@@ -0,0 +1,99 @@
+"""
+genai.Client 대신 쓸 수 있는 가짜 클라이언트 (API 키·네트워크 없이 요약 경로를 실행할 때 사용).
+같은 입력에는 항상 같은 응답을 돌려주고, 지연 시간과 오류 비율을 조절할 수 있습니다.
+
+사용 예:
+    from fake_genai import FakeClient
+    from summarizer import merge_and_summarize
+    merged, failed = merge_and_summarize(fresh, existing, client=FakeClient(latency=0.05))
+"""
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+
+
+class FakeAPIError(Exception):
+    """가짜 API 오류. code=429이면 rate limit 오류로 취급됩니다."""
+
+    def __init__(self, message: str, code: int = 500):
+        super().__init__(f"{code} {message}")
+        self.code = code
+
+
+class FakeResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _FakeModels:
+    def __init__(self, owner: "FakeClient"):
+        self._owner = owner
+
+    def generate_content(self, model: str, contents, **kwargs):
+        return self._owner._generate(model, contents)
+
+
+_ARTICLE_RE = re.compile(r'<article id="([^"]+)">(.*?)</article>', re.S)
+
+
+class FakeClient:
+    """
+    - latency: 호출당 지연 시간(초)
+    - error_rate: 일반 오류(500) 비율 (0~1)
+    - rate_limit_rate: 429 오류 비율 (0~1)
+    - failing_models: 항상 실패하는 모델 이름 집합
+    - batch_drop_rate: 묶음 프롬프트(<article id=...>) 응답에서 기사를 빠뜨리는 비율 (0~1)
+    - seed: 오류 발생을 재현 가능하게 하는 난수 시드
+    묶음 프롬프트에는 [{"id", "summary_ko"}] JSON 배열로 답합니다.
+    """
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        failing_models: set[str] | None = None,
+        batch_drop_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.failing_models = set(failing_models or ())
+        self.batch_drop_rate = batch_drop_rate
+        self.models = _FakeModels(self)
+        self.calls = 0
+        self.calls_by_model: dict[str, int] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def _generate(self, model: str, contents) -> FakeResponse:
+        with self._lock:
+            self.calls += 1
+            self.calls_by_model[model] = self.calls_by_model.get(model, 0) + 1
+            roll = self._random.random()
+        if self.latency:
+            time.sleep(self.latency)
+        if model in self.failing_models:
+            raise FakeAPIError(f"model {model} unavailable", code=503)
+        if roll < self.rate_limit_rate:
+            raise FakeAPIError("RESOURCE_EXHAUSTED: quota exceeded", code=429)
+        if roll < self.rate_limit_rate + self.error_rate:
+            raise FakeAPIError("internal error", code=500)
+        blocks = _ARTICLE_RE.findall(str(contents))
+        if blocks:
+            with self._lock:
+                kept = [b for b in blocks if self._random.random() >= self.batch_drop_rate]
+            return FakeResponse(json.dumps(
+                [{"id": article_id, "summary_ko": self._summary(model, body)} for article_id, body in kept],
+                ensure_ascii=False,
+            ))
+        return FakeResponse(self._summary(model, contents))
+
+    @staticmethod
+    def _summary(model: str, contents) -> str:
+        digest = hashlib.sha256(str(contents).encode("utf-8")).hexdigest()[:12]
+        return f"[{model}] 요약 {digest}"
@@ -0,0 +1,157 @@
+"""
+한국어 요약 피드 렌더링 (RSS 2.0, Atom 1.0, JSON Feed 1.1).
+웹 앱(/feed.xml, /atom.xml)과 정적 사이트 내보내기(static_site)가 같이 씁니다.
+입력은 기사 저장소 스냅샷의 목록(listing) 항목이고, 결과는 그대로 파일로 쓰거나 응답 본문으로 보낼 수 있는 bytes입니다.
+항목 하나의 XML 조각은 항목 내용으로 캐시하므로, 새 기사가 들어와도 새 항목만 새로 만듭니다.
+"""
+import json
+import re
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from functools import lru_cache
+from xml.sax.saxutils import escape
+
+FEED_TITLE = "TechCrunch AI 뉴스 요약"
+FEED_DESCRIPTION = "최신 AI 기술 소식을 한국어로 간단히 요약합니다"
+FEED_LANGUAGE = "ko"
+SOURCE_URL = "https://techcrunch.com/category/artificial-intelligence/"
+
+# XML 1.0에서 쓸 수 없는 제어 문자
+_INVALID_XML_RE = re.compile(r"[\x00-\x08\x0b\x0c\x0e-\x1f]")
+ITEM_CACHE_SIZE = 1024
+
+
+@dataclass(frozen=True)
+class FeedEntry:
+    uid: str
+    title: str
+    link: str  # 피드 항목 링크 (사이트 주소가 있으면 요약 페이지, 없으면 원문)
+    source_link: str  # TechCrunch 원문
+    summary: str
+    published_ts: float
+
+
+def entries_from_listing(listing, limit: int, article_url=None) -> list[FeedEntry]:
+    """
+    목록 항목에서 최근 limit개 피드 항목을 만듭니다.
+    article_url(uid) -> 절대 URL을 주면 항목 링크가 요약 페이지를 가리킵니다.
+    """
+    entries = []
+    for item in listing[:max(0, limit)]:
+        source_link = item.get("link", "")
+        entries.append(FeedEntry(
+            uid=item["uid"],
+            title=item.get("title", ""),
+            link=article_url(item["uid"]) if article_url else source_link,
+            source_link=source_link,
+            summary=item.get("summary_ko") or item.get("excerpt", ""),
+            published_ts=item.get("published_ts") or 0.0,
+        ))
+    return entries
+
+
+def _text(value: str) -> str:
+    return escape(_INVALID_XML_RE.sub("", value or ""))
+
+
+def _rfc822(ts: float) -> str:
+    return format_datetime(datetime.fromtimestamp(ts, tz=timezone.utc), usegmt=True)
+
+
+def _rfc3339(ts: float) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).isoformat(timespec="seconds").replace("+00:00", "Z")
+
+
+@lru_cache(maxsize=ITEM_CACHE_SIZE)
+def _rss_item(e: FeedEntry) -> str:
+    parts = [
+        "<item>\n",
+        f"<title>{_text(e.title)}</title>\n",
+        f"<link>{_text(e.link)}</link>\n",
+        f'<guid isPermaLink="false">{_text(e.uid)}</guid>\n',
+        f"<description>{_text(e.summary)}</description>\n",
+    ]
+    if e.published_ts:
+        parts.append(f"<pubDate>{_rfc822(e.published_ts)}</pubDate>\n")
+    parts.append("</item>\n")
+    return "".join(parts)
+
+
+@lru_cache(maxsize=ITEM_CACHE_SIZE)
+def _atom_entry(e: FeedEntry, fallback_ts: float) -> str:
+    updated = _rfc3339(e.published_ts or fallback_ts)
+    parts = [
+        "<entry>\n",
+        f"<id>urn:techcrunch-ai-rss:article:{_text(e.uid)}</id>\n",
+        f"<title>{_text(e.title)}</title>\n",
+        f'<link rel="alternate" href="{_text(e.link)}"/>\n',
+    ]
+    if e.source_link and e.source_link != e.link:
+        parts.append(f'<link rel="via" href="{_text(e.source_link)}"/>\n')
+    parts += [
+        f"<updated>{updated}</updated>\n",
+        f"<published>{updated}</published>\n" if e.published_ts else "",
+        f'<summary type="text">{_text(e.summary)}</summary>\n',
+        "</entry>\n",
+    ]
+    return "".join(parts)
+
+
+def render_rss(entries: list[FeedEntry], site_url: str, feed_url: str, updated_ts: float) -> bytes:
+    """RSS 2.0 문서. site_url / feed_url은 비어 있으면 생략하거나 원문 카테고리 주소로 대신합니다."""
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n',
+        '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom">\n<channel>\n',
+        f"<title>{_text(FEED_TITLE)}</title>\n",
+        f"<link>{_text(site_url or SOURCE_URL)}</link>\n",
+        f"<description>{_text(FEED_DESCRIPTION)}</description>\n",
+        f"<language>{FEED_LANGUAGE}</language>\n",
+        f"<lastBuildDate>{_rfc822(updated_ts)}</lastBuildDate>\n",
+    ]
+    if feed_url:
+        parts.append(f'<atom:link href="{_text(feed_url)}" rel="self" type="application/rss+xml"/>\n')
+    parts.extend(_rss_item(e) for e in entries)
+    parts.append("</channel>\n</rss>\n")
+    return "".join(parts).encode("utf-8")
+
+
+def render_atom(entries: list[FeedEntry], site_url: str, feed_url: str, updated_ts: float) -> bytes:
+    """Atom 1.0 문서. 발행일이 없는 항목은 updated_ts를 갱신 시각으로 씁니다."""
+    home = site_url or SOURCE_URL
+    parts = [
+        '<?xml version="1.0" encoding="UTF-8"?>\n',
+        f'<feed xmlns="http://www.w3.org/2005/Atom" xml:lang="{FEED_LANGUAGE}">\n',
+        f"<id>{_text(feed_url or home)}</id>\n",
+        f"<title>{_text(FEED_TITLE)}</title>\n",
+        f"<subtitle>{_text(FEED_DESCRIPTION)}</subtitle>\n",
+        f"<updated>{_rfc3339(updated_ts)}</updated>\n",
+        f"<author><name>{_text(FEED_TITLE)}</name></author>\n",
+        f'<link rel="alternate" href="{_text(home)}"/>\n',
+    ]
+    if feed_url:
+        parts.append(f'<link rel="self" type="application/atom+xml" href="{_text(feed_url)}"/>\n')
+    # 발행일이 있는 항목은 updated_ts와 상관없이 같은 조각이므로 캐시 키에서 뺌
+    parts.extend(_atom_entry(e, 0.0 if e.published_ts else updated_ts) for e in entries)
+    parts.append("</feed>\n")
+    return "".join(parts).encode("utf-8")
+
+
+def render_json_feed(entries: list[FeedEntry], site_url: str, feed_url: str) -> bytes:
+    """JSON Feed 1.1 문서."""
+    feed = {
+        "version": "https://jsonfeed.org/version/1.1",
+        "title": FEED_TITLE,
+        "description": FEED_DESCRIPTION,
+        "language": FEED_LANGUAGE,
+        "home_page_url": site_url or SOURCE_URL,
+    }
+    if feed_url:
+        feed["feed_url"] = feed_url
+    feed["items"] = []
+    for e in entries:
+        item = {"id": e.uid, "url": e.link, "external_url": e.source_link, "title": e.title, "content_text": e.summary}
+        if e.published_ts:
+            item["date_published"] = _rfc3339(e.published_ts)
+        feed["items"].append(item)
+    return json.dumps(feed, ensure_ascii=False, indent=1).encode("utf-8")
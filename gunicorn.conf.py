@@ -0,0 +1,15 @@
+"""
+gunicorn 설정 (gunicorn이 작업 디렉터리의 이 파일을 자동으로 읽음).
+내장 스케줄러는 워커가 아니라 마스터 프로세스에서 한 번만 시작합니다 (SCHEDULER_ENABLED=true일 때).
+워커는 마스터를 fork해 만들어지므로 post_fork에서 물려받은 스케줄러 잠금 파일을 닫습니다.
+"""
+
+
+def when_ready(server):
+    from scheduler import start_scheduler
+    start_scheduler()
+
+
+def post_fork(server, worker):
+    from scheduler import after_fork
+    after_fork()
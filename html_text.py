@@ -0,0 +1,154 @@
+"""
+기사 본문 HTML → 평문 변환.
+html.parser 토크나이저로 한 번만 훑으면서 태그를 버리고 엔티티(&amp; 등)를 풀며,
+script/style 안의 내용은 통째로 건너뜁니다.
+
+수집할 때 add_text_fields()로 summary_text(정리된 평문)와 excerpt(목록용 발췌)를 미리 넣어 두므로,
+화면·프롬프트·검색 색인에서는 HTML을 다시 정리하지 않습니다.
+extract_main_text()는 기사 페이지 전체 HTML에서 본문 문단만 골라냅니다 (article_fetcher에서 사용).
+"""
+import re
+from html.parser import HTMLParser
+
+from config import EXCERPT_CHARS
+
+_SKIP_TAGS = frozenset({"script", "style", "noscript", "template", "head"})
+# 앞뒤 글자가 붙지 않도록 공백으로 바꿀 태그 (인라인 태그 <a>, <b> 등은 그대로 이어 붙임)
+_BLOCK_TAGS = frozenset({
+    "address", "article", "aside", "blockquote", "br", "dd", "div", "dl", "dt", "figcaption", "figure",
+    "footer", "h1", "h2", "h3", "h4", "h5", "h6", "header", "hr", "img", "li", "main", "nav", "ol",
+    "p", "pre", "section", "table", "td", "th", "tr", "ul",
+})
+_WS_RE = re.compile(r"\s+")
+# 본문 추출 시 안의 문단을 버릴 영역 (메뉴, 머리말·꼬리말, 관련 기사, 댓글 폼 등)
+_BOILERPLATE_TAGS = frozenset({"nav", "header", "footer", "aside", "form", "figure", "button", "select"})
+_PARAGRAPH_TAGS = frozenset({"p", "h2", "h3", "li", "blockquote"})
+MIN_PARAGRAPH_CHARS = 40  # 이보다 짧은 문단(공유 버튼, 캡션 등)은 본문으로 보지 않음
+
+
+class _TextExtractor(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.parts: list[str] = []
+        self._skip_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append(" ")
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in _BLOCK_TAGS:
+            self.parts.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            if self._skip_depth:
+                self._skip_depth -= 1
+        elif tag in _BLOCK_TAGS:
+            self.parts.append(" ")
+
+    def handle_data(self, data):
+        if not self._skip_depth:
+            self.parts.append(data)
+
+
+def html_to_text(html: str) -> str:
+    """HTML을 평문으로 바꿉니다 (태그 제거, 엔티티 디코딩, script/style 제외, 공백 정리)."""
+    if not html:
+        return ""
+    if "<" not in html and "&" not in html:
+        return _WS_RE.sub(" ", html).strip()
+    parser = _TextExtractor()
+    parser.feed(html)
+    parser.close()
+    return _WS_RE.sub(" ", "".join(parser.parts)).strip()
+
+
+class _MainTextExtractor(HTMLParser):
+    """<article> 안의 문단을 모읍니다. <article>이 없으면 페이지 전체의 문단을 모읍니다."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.in_article: list[str] = []
+        self.anywhere: list[str] = []
+        self._skip_depth = 0
+        self._boilerplate_depth = 0
+        self._article_depth = 0
+        self._paragraph: list[str] | None = None
+        self._paragraph_tag = ""
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in _BOILERPLATE_TAGS:
+            self._boilerplate_depth += 1
+        elif tag == "article":
+            self._article_depth += 1
+        elif tag in _PARAGRAPH_TAGS and self._paragraph is None:
+            self._paragraph, self._paragraph_tag = [], tag
+        elif tag == "br" and self._paragraph is not None:
+            self._paragraph.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in _BOILERPLATE_TAGS:
+            self._boilerplate_depth = max(0, self._boilerplate_depth - 1)
+        elif tag == "article":
+            self._article_depth = max(0, self._article_depth - 1)
+        elif tag == self._paragraph_tag and self._paragraph is not None:
+            text = _WS_RE.sub(" ", "".join(self._paragraph)).strip()
+            self._paragraph = None
+            if len(text) >= MIN_PARAGRAPH_CHARS and not self._boilerplate_depth:
+                (self.in_article if self._article_depth else self.anywhere).append(text)
+
+    def handle_data(self, data):
+        if self._paragraph is not None and not self._skip_depth:
+            self._paragraph.append(data)
+
+
+def extract_main_text(html: str) -> str:
+    """기사 페이지 HTML에서 본문 문단만 평문으로 꺼냅니다 (문단은 줄바꿈으로 구분)."""
+    if not html:
+        return ""
+    parser = _MainTextExtractor()
+    parser.feed(html)
+    parser.close()
+    return "\n".join(parser.in_article or parser.anywhere)
+
+
+def make_excerpt(text: str, limit: int = EXCERPT_CHARS) -> str:
+    """평문을 limit자 이내로 자릅니다. 가능하면 단어 중간이 아니라 공백에서 자릅니다."""
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    space = cut.rfind(" ")
+    if space > limit // 2:
+        cut = cut[:space]
+    return cut.rstrip(" ,.;:")
+
+
+def add_text_fields(article: dict) -> dict:
+    """기사에 summary_text / excerpt 필드를 채웁니다 (article을 고쳐서 그대로 반환)."""
+    text = html_to_text(article.get("summary") or "")
+    article["summary_text"] = text
+    article["excerpt"] = make_excerpt(text)
+    return article
+
+
+def summary_text(article) -> str:
+    """기사의 정리된 평문. 필드가 없는 예전 기사는 그 자리에서 변환합니다."""
+    text = article.get("summary_text")
+    if text is None:
+        text = html_to_text(article.get("summary") or "")
+    return text
+
+
+def excerpt(article) -> str:
+    """기사의 목록용 발췌. 필드가 없는 예전 기사는 그 자리에서 만듭니다."""
+    text = article.get("excerpt")
+    if text is None:
+        text = make_excerpt(summary_text(article))
+    return text
@@ -0,0 +1,131 @@
+"""
+공용 HTTP 클라이언트 (피드 수집, 과거 기사 가져오기, 기사 본문 가져오기가 함께 사용).
+프로세스당 requests.Session 하나를 연결 풀과 함께 재사용하므로, 같은 호스트로 가는 요청은
+TCP 연결과 TLS 핸드셰이크를 한 번만 맺고 keep-alive로 이어 씁니다.
+
+- 압축: gzip/deflate (brotli 패키지가 있으면 br도) 요청, 본문은 urllib3가 풀어 줌
+- 재시도: 연결 오류·시간 초과·429/5xx는 HTTP_MAX_RETRIES번까지 지수 백오프 + 무작위 지터(full jitter)로 다시 시도,
+  Retry-After 헤더가 있으면 그 값을 따름
+- 호스트별 동시 요청 수 제한 (HTTP_PER_HOST_LIMIT)
+requests는 실제로 요청할 때 불러옵니다 (웹 앱 등 HTTP를 안 쓰는 프로세스의 시작 시간에 영향 없음).
+"""
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import metrics
+from config import HTTP_BACKOFF_SECONDS, HTTP_MAX_RETRIES, HTTP_PER_HOST_LIMIT, HTTP_POOL_SIZE
+
+USER_AGENT = "techcrunch-ai-rss/1.0 (+https://techcrunch.com/rss-terms-of-use/)"
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+MAX_RETRY_AFTER_SECONDS = 60.0
+
+_REQUESTS = metrics.counter("outbound_requests_total", "외부로 보낸 HTTP 요청 수 (status: 코드 또는 error)", ("host", "status"))
+_RETRIES = metrics.counter("outbound_retries_total", "외부 HTTP 요청 재시도 수", ("host",))
+
+_session = None
+_session_lock = threading.Lock()
+_host_limits: dict[str, threading.Semaphore] = {}
+_host_limits_lock = threading.Lock()
+
+
+def _accept_encoding() -> str:
+    try:
+        import brotli  # noqa: F401
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+        except ImportError:
+            return "gzip, deflate"
+    return "gzip, deflate, br"
+
+
+def get_session():
+    """공용 requests.Session을 반환합니다 (처음 호출할 때 만듦)."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                # 재시도는 request()에서 직접 (지터·Retry-After 처리), 어댑터는 연결 풀만 담당
+                adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE, max_retries=0)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                session.headers.update({"User-Agent": USER_AGENT, "Accept-Encoding": _accept_encoding()})
+                _session = session
+    return _session
+
+
+def host_limit(url: str) -> threading.Semaphore:
+    """호스트별 동시 요청 수 제한용 세마포어."""
+    host = urlsplit(url).netloc.lower()
+    with _host_limits_lock:
+        if host not in _host_limits:
+            _host_limits[host] = threading.Semaphore(HTTP_PER_HOST_LIMIT)
+        return _host_limits[host]
+
+
+def _retry_delay(attempt: int, response=None) -> float:
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            return min(max(0.0, float(retry_after)), MAX_RETRY_AFTER_SECONDS)
+        except ValueError:
+            pass
+    return random.uniform(0, HTTP_BACKOFF_SECONDS * (2 ** attempt))
+
+
+def request(
+    method: str,
+    url: str,
+    headers: dict | None = None,
+    timeout: float = 30.0,
+    stream: bool = False,
+    retries: int = HTTP_MAX_RETRIES,
+):
+    """
+    요청을 보내고 requests.Response를 반환합니다. 4xx 등 재시도하지 않는 상태 코드는 그대로 돌려줍니다.
+    stream=False면 본문까지 받은 뒤 호스트 슬롯을 풀고, stream=True면 헤더까지만 슬롯을 잡습니다.
+    연결 오류는 재시도를 모두 쓰면 다시 발생시킵니다.
+    """
+    import requests
+
+    session = get_session()
+    host = urlsplit(url).netloc.lower()
+    attempt = 0
+    while True:
+        try:
+            with host_limit(url):
+                response = session.request(method, url, headers=headers, timeout=timeout, stream=stream)
+                if not stream:
+                    response.content  # noqa: B018 - 본문을 받는 동안 슬롯 유지
+        except (requests.ConnectionError, requests.Timeout):
+            _REQUESTS.inc(host=host, status="error")
+            if attempt >= retries:
+                raise
+            delay = _retry_delay(attempt)
+        else:
+            _REQUESTS.inc(host=host, status=str(response.status_code))
+            if response.status_code not in RETRY_STATUSES or attempt >= retries:
+                return response
+            delay = _retry_delay(attempt, response)
+            response.close()
+        _RETRIES.inc(host=host)
+        time.sleep(delay)
+        attempt += 1
+
+
+def get(url: str, **kwargs):
+    return request("GET", url, **kwargs)
+
+
+def wire_bytes(response) -> int:
+    """응답 본문이 네트워크로 받은 (압축된) 바이트 수. 알 수 없으면 풀린 본문 길이."""
+    try:
+        return int(response.raw.tell()) or len(response.content)
+    except Exception:
+        return len(response.content)
@@ -0,0 +1,340 @@
+"""
+업데이트 작업 큐 (SQLite, output/jobs.sqlite3).
+웹 트리거·예약 실행·cron이 작업을 넣고, 워커 프로세스 하나(worker.py)가 꺼내 실행합니다.
+
+- 같은 dedupe_key의 작업이 이미 대기 중이거나 실행 중이면 새로 만들지 않고 그 작업에 합칩니다 (coalesce)
+- 작업을 꺼낸 워커는 임대(lease) 시간 동안 작업을 소유하고 주기적으로 연장합니다.
+  워커가 죽어 임대가 끝나면 다음 워커가 다시 가져가며, max_attempts를 넘으면 실패로 끝냅니다.
+- 기사별 요약 재시도 상태(시도 횟수, 마지막 오류, 다음 시도 시각)를 기록해
+  계속 실패하는 기사에 Gemini 요청을 반복해서 쓰지 않게 합니다.
+- WorkerLock(update_in_progress.lock 파일 잠금)으로 워커가 동시에 둘 이상 돌지 않게 합니다.
+"""
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from config import (
+    ARTICLE_RETRY_BACKOFF_SECONDS,
+    ARTICLE_RETRY_MAX_ATTEMPTS,
+    JOB_LEASE_SECONDS,
+    JOB_MAX_ATTEMPTS,
+    JOBS_DB,
+    OUTPUT_DIR,
+)
+
+ACTIVE_STATUSES = ("queued", "running")
+WORKER_LOCK_FILE = "update_in_progress.lock"
+
+
+def output_path() -> Path:
+    return Path(__file__).resolve().parent / OUTPUT_DIR
+
+
+class WorkerLock:
+    """파일 잠금으로 워커를 하나만 실행합니다. 프로세스가 죽으면 OS가 잠금을 풉니다."""
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = Path(path) if path else output_path() / WORKER_LOCK_FILE
+        self._fh = None
+
+    def acquire(self) -> bool:
+        """잠금을 얻으면 True, 다른 워커가 잡고 있으면 False (기다리지 않음)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # open()은 O_CLOEXEC로 열어 exec한 자식에는 넘어가지 않음 (fork한 자식은 detach()로 닫음)
+        fh = open(self.path, "a+")
+        try:
+            if fcntl is not None:
+                fcntl.flock(fh, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            else:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_NBLCK, 1)
+        except OSError:
+            fh.close()
+            return False
+        fh.seek(0)
+        fh.truncate()
+        fh.write(f"{os.getpid()}\n")
+        fh.flush()
+        self._fh = fh
+        return True
+
+    def release(self) -> None:
+        if self._fh is None:
+            return
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fh, fcntl.LOCK_UN)
+            else:
+                self._fh.seek(0)
+                msvcrt.locking(self._fh.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._fh.close()
+            self._fh = None
+
+    def detach(self) -> None:
+        """
+        fork한 자식에서 부모에게 물려받은 잠금 파일만 닫습니다.
+        flock은 열린 파일 단위라 자식에서 LOCK_UN하면 부모의 잠금까지 풀리므로 풀지 않고 닫기만 합니다.
+        """
+        if self._fh is None:
+            return
+        self._fh.close()
+        self._fh = None
+
+
+class JobQueue:
+    def __init__(
+        self,
+        path: str | Path,
+        lease_seconds: float = JOB_LEASE_SECONDS,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._local = threading.local()
+        self._conn().executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                kind TEXT NOT NULL,
+                dedupe_key TEXT NOT NULL,
+                status TEXT NOT NULL,
+                params TEXT NOT NULL DEFAULT '{}',
+                triggers INTEGER NOT NULL DEFAULT 1,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL,
+                lease_owner TEXT,
+                lease_expires REAL,
+                result TEXT,
+                error TEXT
+            );
+            CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, id);
+            CREATE INDEX IF NOT EXISTS idx_jobs_dedupe ON jobs(dedupe_key, status);
+            CREATE TABLE IF NOT EXISTS article_retries (
+                link TEXT PRIMARY KEY,
+                title TEXT NOT NULL DEFAULT '',
+                attempts INTEGER NOT NULL,
+                last_error TEXT,
+                next_attempt_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            """
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _transaction(self, fn):
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            value = fn(conn)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return value
+
+    # --- 작업 ---
+
+    def enqueue(self, kind: str, dedupe_key: str | None = None, params: dict | None = None) -> tuple[int, bool]:
+        """
+        작업을 넣습니다. 같은 dedupe_key(기본값 kind)의 작업이 대기·실행 중이면 그 작업에 합칩니다.
+        반환: (작업 id, 기존 작업에 합쳤는지)
+        """
+        key = dedupe_key or kind
+
+        def run(conn):
+            row = conn.execute(
+                "SELECT id FROM jobs WHERE dedupe_key = ? AND status IN (?, ?) ORDER BY id LIMIT 1",
+                (key, *ACTIVE_STATUSES),
+            ).fetchone()
+            if row is not None:
+                conn.execute("UPDATE jobs SET triggers = triggers + 1 WHERE id = ?", (row["id"],))
+                return row["id"], True
+            cur = conn.execute(
+                "INSERT INTO jobs (kind, dedupe_key, status, params, created_at) VALUES (?, ?, 'queued', ?, ?)",
+                (kind, key, json.dumps(params or {}, ensure_ascii=False), time.time()),
+            )
+            return cur.lastrowid, False
+
+        return self._transaction(run)
+
+    def claim(self, owner: str, reclaim_running: bool = False) -> dict | None:
+        """
+        실행할 작업 하나를 임대합니다 (대기 중인 작업, 또는 임대가 끝난 실행 중 작업).
+        reclaim_running: WorkerLock을 잡은 워커라면 다른 워커가 살아 있을 수 없으므로
+        임대가 남아 있는 실행 중 작업도 (죽은 워커의 것으로 보고) 다시 가져옵니다.
+        시도 횟수를 넘긴 작업은 실패로 처리하고 건너뜁니다.
+        """
+        def run(conn):
+            now = time.time()
+            while True:
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE status = 'queued' "
+                    "OR (status = 'running' AND (lease_expires < ? OR ?)) ORDER BY id LIMIT 1",
+                    (now, int(reclaim_running)),
+                ).fetchone()
+                if row is None:
+                    return None
+                if row["attempts"] >= self.max_attempts:
+                    conn.execute(
+                        "UPDATE jobs SET status = 'failed', finished_at = ?, lease_owner = NULL, "
+                        "error = COALESCE(error, '임대 만료: 최대 시도 횟수 초과') WHERE id = ?",
+                        (now, row["id"]),
+                    )
+                    continue
+                conn.execute(
+                    "UPDATE jobs SET status = 'running', attempts = attempts + 1, lease_owner = ?, "
+                    "lease_expires = ?, started_at = COALESCE(started_at, ?) WHERE id = ?",
+                    (owner, now + self.lease_seconds, now, row["id"]),
+                )
+                return self._row(conn.execute("SELECT * FROM jobs WHERE id = ?", (row["id"],)).fetchone())
+
+        return self._transaction(run)
+
+    def heartbeat(self, job_id: int, owner: str) -> bool:
+        """임대를 연장합니다. 임대를 잃었으면 False."""
+        cur = self._conn().execute(
+            "UPDATE jobs SET lease_expires = ? WHERE id = ? AND status = 'running' AND lease_owner = ?",
+            (time.time() + self.lease_seconds, job_id, owner),
+        )
+        return cur.rowcount == 1
+
+    def complete(self, job_id: int, owner: str, result: dict | None = None) -> None:
+        self._finish(job_id, owner, "succeeded", result=result)
+
+    def fail(self, job_id: int, owner: str, error: str, result: dict | None = None) -> None:
+        self._finish(job_id, owner, "failed", result=result, error=error)
+
+    def _finish(self, job_id: int, owner: str, status: str, result=None, error=None) -> None:
+        self._conn().execute(
+            "UPDATE jobs SET status = ?, finished_at = ?, lease_owner = NULL, lease_expires = NULL, "
+            "result = ?, error = ? WHERE id = ? AND lease_owner = ?",
+            (status, time.time(), json.dumps(result, ensure_ascii=False) if result is not None else None,
+             error, job_id, owner),
+        )
+
+    def has_queued(self) -> bool:
+        """아직 아무 워커도 가져가지 않은 작업이 있으면 True."""
+        return self._conn().execute("SELECT 1 FROM jobs WHERE status = 'queued' LIMIT 1").fetchone() is not None
+
+    @staticmethod
+    def _row(row) -> dict | None:
+        if row is None:
+            return None
+        job = dict(row)
+        job["params"] = json.loads(job["params"] or "{}")
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        return job
+
+    def get(self, job_id: int) -> dict | None:
+        return self._row(self._conn().execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone())
+
+    def recent(self, limit: int = 20) -> list[dict]:
+        rows = self._conn().execute("SELECT * FROM jobs ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        return [self._row(r) for r in rows]
+
+    # --- 기사별 요약 재시도 상태 ---
+
+    def blocked_links(self, links) -> dict[str, dict]:
+        """
+        지금 요약을 시도하지 말아야 할 기사: 재시도 대기 중이거나 최대 시도 횟수에 도달한 기사.
+        반환: {link: {"attempts", "last_error", "next_attempt_at", "exhausted"}}
+        """
+        links = [link for link in links if link]
+        if not links:
+            return {}
+        now = time.time()
+        blocked = {}
+        conn = self._conn()
+        for i in range(0, len(links), 500):
+            chunk = links[i:i + 500]
+            rows = conn.execute(
+                f"SELECT * FROM article_retries WHERE link IN ({','.join('?' * len(chunk))})", chunk,
+            ).fetchall()
+            for row in rows:
+                exhausted = row["attempts"] >= ARTICLE_RETRY_MAX_ATTEMPTS
+                if exhausted or row["next_attempt_at"] > now:
+                    blocked[row["link"]] = {
+                        "attempts": row["attempts"],
+                        "last_error": row["last_error"],
+                        "next_attempt_at": row["next_attempt_at"],
+                        "exhausted": exhausted,
+                    }
+        return blocked
+
+    def record_article_failures(self, failed: list[dict]) -> None:
+        """요약 실패한 기사의 시도 횟수를 늘리고 다음 시도 시각을 (지수적으로) 미룹니다."""
+        if not failed:
+            return
+
+        def run(conn):
+            now = time.time()
+            for f in failed:
+                row = conn.execute("SELECT attempts FROM article_retries WHERE link = ?", (f["link"],)).fetchone()
+                attempts = (row["attempts"] if row else 0) + 1
+                delay = ARTICLE_RETRY_BACKOFF_SECONDS * (2 ** (attempts - 1))
+                conn.execute(
+                    "INSERT OR REPLACE INTO article_retries "
+                    "(link, title, attempts, last_error, next_attempt_at, updated_at) VALUES (?, ?, ?, ?, ?, ?)",
+                    (f["link"], f.get("title", ""), attempts, str(f.get("error", ""))[:500], now + delay, now),
+                )
+
+        self._transaction(run)
+
+    def clear_article_failures(self, links) -> None:
+        """요약에 성공한 기사의 재시도 기록을 지웁니다."""
+        links = [link for link in links if link]
+        if not links:
+            return
+
+        def run(conn):
+            conn.executemany("DELETE FROM article_retries WHERE link = ?", [(link,) for link in links])
+
+        self._transaction(run)
+
+    def article_failures(self, limit: int = 50) -> list[dict]:
+        rows = self._conn().execute(
+            "SELECT * FROM article_retries ORDER BY updated_at DESC LIMIT ?", (limit,),
+        ).fetchall()
+        return [dict(r) for r in rows]
+
+
+def worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """프로젝트 루트 output/jobs.sqlite3의 작업 큐를 반환합니다 (프로세스당 하나)."""
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = JobQueue(output_path() / JOBS_DB)
+    return _queue
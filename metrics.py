@@ -0,0 +1,301 @@
+"""
+단계별 카운터·히스토그램 계측과 Prometheus 텍스트 형식 출력.
+
+각 프로세스(gunicorn 워커, run_with_summary 등)는 값을 메모리에 모으고,
+백그라운드 스레드가 METRICS_FLUSH_SECONDS마다 output/metrics/<pid>.json에 씁니다.
+/metrics를 요청받은 워커는 모든 프로세스 파일을 합산해 응답하므로
+워커가 여러 개여도, 수집·요약이 별도 프로세스에서 돌아도 값이 한곳에 모입니다.
+끝난 프로세스의 파일은 합산할 때 _dead.json으로 합쳐 두어 카운터가 줄어들지 않습니다.
+
+사용 예:
+    REQUESTS = counter("http_requests_total", "처리한 요청 수", ("endpoint", "status"))
+    REQUESTS.inc(endpoint="index", status="200")
+    LATENCY = histogram("http_request_duration_seconds", "요청 처리 시간", ("endpoint",))
+    with LATENCY.time(endpoint="index"):
+        ...
+"""
+import atexit
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows: 파일 잠금 없이 동작 (끝난 프로세스 파일 정리는 생략)
+    fcntl = None
+
+from config import METRICS_ENABLED, METRICS_FLUSH_SECONDS, OUTPUT_DIR
+
+PREFIX = "techcrunch_"
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+_DEAD_FILE = "_dead.json"
+_INF_LABEL = 'le="+Inf"'
+
+
+def metrics_dir() -> Path:
+    return Path(__file__).resolve().parent / OUTPUT_DIR / "metrics"
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...]):
+        self.name = PREFIX + name
+        self.help = help_text
+        self.labels = tuple(labels)
+        self._values: dict[tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(label, "")) for label in self.labels)
+
+    def _reset(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+        _registry.mark_dirty()
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return [[list(key), value] for key, value in self._values.items()]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labels: tuple[str, ...], buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                # [버킷별 개수..., +Inf 개수, 합계]
+                state = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[i] += 1
+                    break
+            else:
+                state[len(self.buckets)] += 1
+            state[-1] += value
+        _registry.mark_dirty()
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def snapshot(self) -> list:
+        with self._lock:
+            return [[list(key), list(state)] for key, state in self._values.items()]
+
+
+class _Registry:
+    def __init__(self):
+        self.metrics: dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._thread: threading.Thread | None = None
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            existing = self.metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self.metrics[metric.name] = metric
+            return metric
+
+    def mark_dirty(self) -> None:
+        self._dirty = True
+        if self._thread is None and METRICS_ENABLED:
+            self._start_flusher()
+
+    def _start_flusher(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._flush_loop, name="metrics-flush", daemon=True)
+            self._thread.start()
+
+    def _flush_loop(self) -> None:
+        while True:
+            time.sleep(METRICS_FLUSH_SECONDS)
+            self.flush()
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            metrics = list(self.metrics.values())
+        return {
+            m.name: {"type": m.kind, "help": m.help, "labels": list(m.labels),
+                     "buckets": list(getattr(m, "buckets", ())), "samples": m.snapshot()}
+            for m in metrics
+        }
+
+    def flush(self) -> None:
+        """바뀐 값이 있으면 이 프로세스의 파일에 씁니다 (임시 파일 → rename)."""
+        if not self._dirty or not METRICS_ENABLED:
+            return
+        self._dirty = False
+        try:
+            directory = metrics_dir()
+            directory.mkdir(parents=True, exist_ok=True)
+            path = directory / f"{os.getpid()}.json"
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(self.snapshot()), encoding="utf-8")
+            os.replace(tmp, path)
+        except OSError:
+            self._dirty = True
+
+    def after_fork(self) -> None:
+        # 부모 프로세스의 값이 자식 워커에 복사되어 두 번 세지지 않도록 비움
+        for metric in self.metrics.values():
+            metric._reset()
+        self._dirty = False
+        self._thread = None
+        self._lock = threading.Lock()
+
+
+_registry = _Registry()
+atexit.register(_registry.flush)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_registry.after_fork)
+
+
+def counter(name: str, help_text: str, labels: tuple[str, ...] = ()) -> Counter:
+    return _registry.register(Counter(name, help_text, labels))
+
+
+def histogram(name: str, help_text: str, labels: tuple[str, ...] = (), buckets=DEFAULT_BUCKETS) -> Histogram:
+    return _registry.register(Histogram(name, help_text, labels, buckets))
+
+
+def _merge(total: dict, snapshot: dict) -> None:
+    for name, data in snapshot.items():
+        entry = total.setdefault(name, {**data, "samples": {}})
+        samples = entry["samples"]
+        for labels, value in data["samples"]:
+            key = tuple(labels)
+            if isinstance(value, list):
+                current = samples.get(key)
+                samples[key] = value if current is None else [a + b for a, b in zip(current, value)]
+            else:
+                samples[key] = samples.get(key, 0.0) + value
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _read(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def _compact_dead(directory: Path) -> None:
+    """끝난 프로세스의 파일을 _dead.json에 합치고 지웁니다 (POSIX에서만, 파일 잠금 아래)."""
+    if fcntl is None or os.name != "posix":
+        return
+    dead = [p for p in directory.glob("[0-9]*.json") if not _pid_alive(int(p.stem))]
+    if not dead:
+        return
+    with open(directory / ".lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        total: dict = {}
+        _merge(total, _read(directory / _DEAD_FILE))
+        merged = []
+        for path in dead:
+            if path.exists():
+                _merge(total, _read(path))
+                merged.append(path)
+        if not merged:
+            return
+        out = {name: {**data, "samples": [[list(k), v] for k, v in data["samples"].items()]}
+               for name, data in total.items()}
+        tmp = directory / (_DEAD_FILE + ".tmp")
+        tmp.write_text(json.dumps(out), encoding="utf-8")
+        os.replace(tmp, directory / _DEAD_FILE)
+        for path in merged:
+            path.unlink(missing_ok=True)
+
+
+def collect_all() -> dict:
+    """모든 프로세스의 값을 합산합니다. 이 프로세스의 값은 파일 대신 메모리에서 읽습니다."""
+    total: dict = {}
+    directory = metrics_dir()
+    if METRICS_ENABLED and directory.is_dir():
+        try:
+            _compact_dead(directory)
+        except OSError:
+            pass
+        own = f"{os.getpid()}.json"
+        for path in directory.glob("*.json"):
+            if path.name != own:
+                _merge(total, _read(path))
+    _merge(total, _registry.snapshot())
+    return total
+
+
+def _format_labels(names, values, extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def render_prometheus() -> str:
+    """합산한 값을 Prometheus 텍스트 형식(0.0.4)으로 만듭니다."""
+    lines = []
+    for name, data in sorted(collect_all().items()):
+        lines.append(f"# HELP {name} {data['help']}")
+        lines.append(f"# TYPE {name} {data['type']}")
+        labels = data["labels"]
+        for key, value in sorted(data["samples"].items()):
+            if data["type"] == "histogram":
+                cumulative = 0
+                for bound, count in zip(data["buckets"], value):
+                    cumulative += count
+                    le = f'le="{_format_value(bound)}"'
+                    lines.append(f"{name}_bucket{_format_labels(labels, key, le)} {cumulative}")
+                cumulative += value[len(data["buckets"])]
+                lines.append(f"{name}_bucket{_format_labels(labels, key, _INF_LABEL)} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels, key)} {_format_value(value[-1])}")
+                lines.append(f"{name}_count{_format_labels(labels, key)} {cumulative}")
+            else:
+                lines.append(f"{name}{_format_labels(labels, key)} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,197 @@
+"""
+모델별 상태(오류율·지연 시간 EWMA)와 회로 차단기로 fallback 모델 순서를 정합니다.
+
+- 연속으로 CIRCUIT_FAILURE_THRESHOLD번 실패한 모델은 회로를 열고(open) CIRCUIT_COOLDOWN_SECONDS 동안 요청을 보내지 않습니다.
+- 쿨다운이 지나면 반쯤 열고(half_open) 요청 하나만 시험 삼아 보냅니다. 성공하면 닫고, 실패하면 다시 엽니다.
+- 모든 모델의 회로가 열려 있으면 빈 목록을 돌려주므로, 요약은 요청 없이 CircuitOpenError로 바로 실패합니다 (기사는 재시도 대기열로).
+- 닫힌 모델 중 오류율이 높은 모델은 마지막 실패 후, 느린 모델은 마지막으로 느렸던 호출 후 쿨다운 동안 뒤로 미루고,
+  나머지는 설정된 순서(지정 모델 → fallback)를 따릅니다.
+상태는 output/model_health.json에 저장되어 다음 실행(cron)도 마지막 상태에서 시작합니다.
+"""
+import atexit
+import json
+import os
+import threading
+import time
+from pathlib import Path
+
+from config import (
+    CIRCUIT_COOLDOWN_SECONDS,
+    CIRCUIT_FAILURE_THRESHOLD,
+    MODEL_HEALTH_JSON,
+    MODEL_ROUTER_ENABLED,
+    OUTPUT_DIR,
+    ROUTER_EWMA_ALPHA,
+    ROUTER_SLOW_SECONDS,
+)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+DEGRADED_ERROR_RATE = 0.5  # 오류율 EWMA가 이 값 이상이면 뒤로 미룸
+SAVE_INTERVAL_SECONDS = 5.0  # 상태가 바뀌지 않은 기록은 이 간격보다 자주 저장하지 않음
+
+
+class CircuitOpenError(RuntimeError):
+    """요청할 수 있는 모델이 없음 (모든 모델의 회로가 열려 있거나 시험 요청이 이미 나가 있음)."""
+
+
+class ModelRouter:
+    def __init__(
+        self,
+        path: str | Path | None = None,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        cooldown_seconds: float = CIRCUIT_COOLDOWN_SECONDS,
+        alpha: float = ROUTER_EWMA_ALPHA,
+        slow_seconds: float = ROUTER_SLOW_SECONDS,
+    ):
+        self.path = Path(path) if path else None
+        self.failure_threshold = max(1, failure_threshold)
+        self.cooldown_seconds = cooldown_seconds
+        self.alpha = alpha
+        self.slow_seconds = slow_seconds
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._models: dict[str, dict] = {}
+        self._probing: dict[str, float] = {}  # 시험 요청을 내준 모델 → 내준 시각
+        self._last_save = 0.0
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if self.path is None:
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        for model, state in (data.get("models") or {}).items():
+            if isinstance(state, dict):
+                self._models[model] = {**self._new_state(), **state}
+
+    @staticmethod
+    def _new_state() -> dict:
+        return {
+            "state": CLOSED,
+            "consecutive_failures": 0,
+            "error_rate": 0.0,
+            "latency": None,
+            "opened_at": None,
+            "last_failure_at": None,
+            "slow_at": None,  # 지연 시간 EWMA가 slow_seconds를 넘은 마지막 호출 시각
+            "successes": 0,
+            "failures": 0,
+        }
+
+    def _state(self, model: str) -> dict:
+        state = self._models.get(model)
+        if state is None:
+            state = self._models[model] = self._new_state()
+        return state
+
+    def _current(self, state: dict, now: float) -> str:
+        if state["state"] == OPEN and now - (state["opened_at"] or 0) >= self.cooldown_seconds:
+            return HALF_OPEN
+        return state["state"]
+
+    def order(self, models: list[str]) -> list[str]:
+        """
+        요청할 모델 순서. 회로가 열린 모델은 빼고, 반쯤 열린 모델은 쿨다운마다 시험 요청 하나만 허용합니다.
+        모든 모델이 막혀 있으면 빈 목록입니다 (쿨다운이 끝나기 전에는 어떤 모델에도 요청하지 않음).
+        """
+        now = time.time()
+        ready = []
+        with self._lock:
+            for index, m in enumerate(models):
+                state = self._state(m)
+                current = self._current(state, now)
+                if current == OPEN:
+                    continue
+                if current == HALF_OPEN:
+                    # 시험 요청은 하나만. 내준 요청이 쓰이지 않았으면 (앞 모델이 성공) 쿨다운 뒤에 다시 내줌
+                    if now - self._probing.get(m, 0.0) < self.cooldown_seconds:
+                        continue
+                    self._probing[m] = now
+                # 뒤로 미룬 모델도 한동안 실패하거나 느린 호출이 없으면 다시 앞 순서로
+                # (뒤로 미루면 요청이 안 가서 오류율·지연 시간이 바뀌지 않으므로 쿨다운이 지나면 다시 시험)
+                recent_failure = now - (state["last_failure_at"] or 0) < self.cooldown_seconds
+                recent_slow = now - (state["slow_at"] or 0) < self.cooldown_seconds
+                degraded = recent_failure and state["error_rate"] >= DEGRADED_ERROR_RATE or (
+                    recent_slow and state["latency"] is not None and state["latency"] > self.slow_seconds
+                )
+                ready.append((current != CLOSED, degraded, index, m))
+        return [m for *_, m in sorted(ready)]
+
+    def record(self, model: str, ok: bool, seconds: float | None = None) -> None:
+        """모델 호출 결과를 반영합니다 (오류·빈 응답·rate limit 모두 실패로 셈)."""
+        now = time.time()
+        with self._lock:
+            state = self._state(model)
+            previous = state["state"]
+            self._probing.pop(model, None)
+            state["error_rate"] += self.alpha * ((0.0 if ok else 1.0) - state["error_rate"])
+            if seconds is not None:
+                latency = state["latency"]
+                state["latency"] = seconds if latency is None else latency + self.alpha * (seconds - latency)
+                state["slow_at"] = now if state["latency"] > self.slow_seconds else None
+            if ok:
+                state["successes"] += 1
+                state["consecutive_failures"] = 0
+                state["state"] = CLOSED
+                state["opened_at"] = None
+            else:
+                state["failures"] += 1
+                state["consecutive_failures"] += 1
+                state["last_failure_at"] = now
+                if self._current(state, now) == HALF_OPEN or state["consecutive_failures"] >= self.failure_threshold:
+                    state["state"] = OPEN
+                    state["opened_at"] = now
+            changed = state["state"] != previous or state["state"] == OPEN
+            self._dirty = True
+            due = changed or now - self._last_save >= SAVE_INTERVAL_SECONDS
+        if due:
+            self.save()
+
+    def status(self) -> dict:
+        now = time.time()
+        with self._lock:
+            return {m: {**s, "state": self._current(s, now)} for m, s in self._models.items()}
+
+    def save(self) -> None:
+        """상태를 임시 파일에 쓴 뒤 교체해 저장합니다."""
+        if self.path is None:
+            return
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                data = {"updated_at": time.time(), "models": {m: dict(s) for m, s in self._models.items()}}
+                self._dirty = False
+                self._last_save = time.time()
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                tmp = self.path.with_suffix(f"{self.path.suffix}.{os.getpid()}.tmp")
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(data, f, ensure_ascii=False, indent=2)
+                os.replace(tmp, self.path)
+            except OSError:
+                pass
+
+
+_router = None
+_router_lock = threading.Lock()
+
+
+def get_router() -> ModelRouter | None:
+    """설정에서 켜져 있으면 프로젝트 루트의 output/model_health.json을 쓰는 공용 라우터를 반환합니다."""
+    global _router
+    if not MODEL_ROUTER_ENABLED:
+        return None
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                root = Path(__file__).resolve().parent
+                _router = ModelRouter(root / OUTPUT_DIR / MODEL_HEALTH_JSON)
+                atexit.register(_router.save)
+    return _router
@@ -0,0 +1,149 @@
+"""
+요약 프롬프트 본문 고르기 (토큰 예산 기준).
+글자 수로 자르면 단어 중간에서 끊기고 앞부분 상투 문구에 예산을 쓰게 되므로,
+문장 단위로 나눠 첫 문장(리드)과 핵심어가 많은 문장을 모델별 토큰 예산 안에서 고릅니다.
+고른 문장은 원래 순서대로 이어 붙입니다.
+
+토큰 수는 오프라인 근사치입니다 (토크나이저를 내려받지 않음). 영어는 단어·숫자·구두점 단위,
+한글은 글자당 1토큰으로 세므로, 같은 글자 수라도 한국어가 영어보다 훨씬 비싸게 잡힙니다.
+"""
+import re
+import threading
+from collections import Counter
+
+from config import PROMPT_TOKEN_BUDGET, PROMPT_TOKEN_BUDGETS
+
+_TOKEN_PIECE_RE = re.compile(r"[A-Za-z]+|[0-9]+|[가-힣]|[^\sA-Za-z0-9가-힣]")
+_SENTENCE_RE = re.compile(r"[^.!?。]+(?:[.!?。]+[\"'”’)]*|$)")
+_WORD_RE = re.compile(r"[a-z0-9][a-z0-9'-]*|[가-힣]+")
+_STOPWORDS = frozenset(
+    """a about after all also an and are as at be been but by can could for from has have he her his how
+    in into is it its more new not of on one or our said says she so than that the their them they this
+    to up was we were what when which who will with would you your""".split()
+)
+LEAD_SENTENCES = 2  # 항상 먼저 넣을 앞 문장 수 (기사의 리드)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    입력 토큰 수를 대략 추정합니다.
+    영어 단어는 8글자마다 1토큰씩 더하고, 숫자는 3자리당 1토큰, 구두점·한글 글자·그 밖의 문자는 1토큰으로 셉니다.
+    """
+    tokens = 0
+    for piece in _TOKEN_PIECE_RE.findall(text):
+        first = piece[0]
+        if first.isascii() and first.isalpha():
+            tokens += 1 + (len(piece) - 1) // 8
+        elif first.isdigit():
+            tokens += (len(piece) + 2) // 3
+        else:
+            tokens += 1
+    return tokens + 1
+
+
+def token_budget(model: str) -> int:
+    """모델별 본문 토큰 예산 (PROMPT_TOKEN_BUDGETS에 없으면 PROMPT_TOKEN_BUDGET)."""
+    return PROMPT_TOKEN_BUDGETS.get(model, PROMPT_TOKEN_BUDGET)
+
+
+def split_sentences(text: str) -> list[str]:
+    return [s.strip() for s in _SENTENCE_RE.findall(text) if s.strip()]
+
+
+def _keywords(title: str, text: str) -> Counter:
+    """본문에 두 번 이상 나오는 단어와 제목 단어 (제목 단어는 가중치 2)."""
+    words = Counter(w for w in _WORD_RE.findall(text.lower()) if w not in _STOPWORDS and len(w) > 1)
+    keywords = Counter({w: 1 for w, n in words.items() if n > 1})
+    for w in _WORD_RE.findall(title.lower()):
+        if w not in _STOPWORDS and len(w) > 1:
+            keywords[w] = 2
+    return keywords
+
+
+def _truncate_words(sentence: str, budget: int) -> str:
+    """문장 하나가 예산보다 길면 단어 경계에서 자릅니다."""
+    words = sentence.split()
+    kept: list[str] = []
+    used = 1
+    for w in words:
+        cost = estimate_tokens(w)
+        if used + cost > budget:
+            break
+        kept.append(w)
+        used += cost
+    return " ".join(kept)
+
+
+def select_content(title: str, text: str, budget: int) -> str:
+    """
+    본문에서 예산(추정 토큰) 안에 들어갈 문장을 고릅니다.
+    리드 문장을 먼저 넣고, 나머지는 핵심어 밀도(토큰당 핵심어 점수)가 높은 순서로 채운 뒤 원래 순서로 돌려놓습니다.
+    """
+    if estimate_tokens(text) <= budget:
+        return text
+    sentences = split_sentences(text)
+    costs = [estimate_tokens(s) for s in sentences]
+    keywords = _keywords(title, text)
+
+    def density(i: int) -> float:
+        # 같은 단어가 한 문장에서 반복돼도 한 번만 셈
+        score = sum(keywords.get(w, 0) for w in set(_WORD_RE.findall(sentences[i].lower())))
+        return score / costs[i]
+
+    lead = list(range(min(LEAD_SENTENCES, len(sentences))))
+    rest = sorted(range(len(lead), len(sentences)), key=density, reverse=True)
+    chosen: list[int] = []
+    used = 0
+    for i in lead + rest:
+        if used + costs[i] <= budget:
+            chosen.append(i)
+            used += costs[i]
+    if not chosen:
+        # 첫 문장조차 예산을 넘으면 단어 경계에서 자름
+        return _truncate_words(sentences[0] if sentences else text, budget)
+    return " ".join(sentences[i] for i in sorted(chosen))
+
+
+class TokenUsage:
+    """실행 중 보낸 입력 토큰(추정) 집계. 기사별·모델별로 모읍니다 (여러 스레드에서 호출해도 됨)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.by_article: dict[str, int] = {}
+            self.by_model: Counter = Counter()
+            self.requests = 0
+
+    def add(self, model: str, tokens: int, links=()) -> None:
+        with self._lock:
+            self.requests += 1
+            self.by_model[model] += tokens
+            links = [link for link in links if link]
+            for link in links:
+                self.by_article[link] = self.by_article.get(link, 0) + tokens // len(links)
+
+    def article(self, link: str) -> int:
+        with self._lock:
+            return self.by_article.get(link, 0)
+
+    def total(self) -> int:
+        with self._lock:
+            return sum(self.by_model.values())
+
+    def summary(self) -> dict:
+        with self._lock:
+            articles = len(self.by_article)
+            total = sum(self.by_model.values())
+            return {
+                "requests": self.requests,
+                "input_tokens": total,
+                "articles": articles,
+                "per_article": round(total / articles) if articles else 0,
+                "by_model": dict(self.by_model),
+            }
+
+
+usage = TokenUsage()
@@ -1,44 +1,163 @@
 """
 TechCrunch AI 카테고리 RSS 피드를 수집하는 모듈.
+config.FEEDS의 피드들을 공용 HTTP 세션(http_client, keep-alive 연결 풀·호스트별 동시 수 제한)으로 동시에 가져오고,
+링크·GUID 기준으로 중복을 제거합니다. 받은 본문 바이트를 feedparser에 넘기므로 feedparser가 따로 연결을 열지 않습니다.
+피드마다 ETag / Last-Modified 값을 output/feed_state.json에 저장해 두고 조건부 요청을 보내므로,
+피드가 바뀌지 않았으면(304) 다시 파싱하거나 저장하지 않습니다.
 """
 import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
-import feedparser
+import http_client
+import metrics
+from article_db import published_timestamp
+from config import (
+    ARTICLES_JSON,
+    FEED_MAX_WORKERS,
+    FEED_STATE_JSON,
+    FEEDS,
+    OUTPUT_DIR,
+    TECHCRUNCH_AI_FEED_URL,
+)
+from html_text import add_text_fields
 
-from config import TECHCRUNCH_AI_FEED_URL, OUTPUT_DIR, ARTICLES_JSON
+if TYPE_CHECKING:
+    import feedparser
 
+_FEED_FETCHES = metrics.counter("feed_fetches_total", "피드 요청 수 (status: ok, not_modified, error)", ("feed", "status"))
+_FEED_FETCH_SECONDS = metrics.histogram("feed_fetch_duration_seconds", "피드 다운로드 시간(초)", ("feed",))
+_FEED_PARSE_SECONDS = metrics.histogram("feed_parse_duration_seconds", "피드 파싱 시간(초)", ("feed",))
+_FEED_BYTES = metrics.counter("feed_received_bytes_total", "피드 응답 본문 바이트 수", ("feed",))
+_COLLECT_SECONDS = metrics.histogram("collect_duration_seconds", "collect() 전체 시간(초)", ("outcome",))
+_COLLECTED_ARTICLES = metrics.counter("collected_articles_total", "collect()가 반환한 기사 수 (중복 제거 후)")
 
-def fetch_techcrunch_ai_feed(url: str = TECHCRUNCH_AI_FEED_URL) -> feedparser.FeedParserDict:
-    """TechCrunch AI RSS 피드를 가져옵니다."""
-    return feedparser.parse(url)
 
+@dataclass
+class FetchResult:
+    """피드 한 번 가져온 결과와 측정값."""
+    url: str
+    status: int
+    feed: "feedparser.FeedParserDict | None" = None
+    etag: str | None = None
+    modified: str | None = None
+    bytes_received: int = 0
+    fetch_seconds: float = 0.0
+    parse_seconds: float = 0.0
+    name: str = ""
+    error: Exception | None = None
 
-def parse_entries(feed: feedparser.FeedParserDict) -> list[dict]:
+    @property
+    def not_modified(self) -> bool:
+        return self.status == 304
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.feed is not None
+
+
+class FeedNotModified(Exception):
+    """모든 피드가 지난번 이후 바뀌지 않음 (HTTP 304). 이후 단계를 모두 건너뛰면 됩니다."""
+
+    def __init__(self, results: list[FetchResult]):
+        super().__init__(f"피드 변경 없음 (304): {len(results)}개")
+        self.results = results
+
+
+_last_fetches: list[FetchResult] = []
+_pending_state: dict | None = None
+
+
+def fetch_feed(
+    url: str = TECHCRUNCH_AI_FEED_URL,
+    etag: str | None = None,
+    modified: str | None = None,
+    timeout: float = 30.0,
+) -> FetchResult:
+    """
+    피드를 가져와 파싱합니다. etag/modified를 주면 조건부 요청을 보내고,
+    304 응답이면 feed 없이 status=304인 결과를 반환합니다.
+    """
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if modified:
+        headers["If-Modified-Since"] = modified
+
+    started = time.perf_counter()
+    resp = http_client.get(url, headers=headers, timeout=timeout)
+    if resp.status_code == 304:
+        return FetchResult(
+            url=url,
+            status=304,
+            etag=resp.headers.get("ETag") or etag,
+            modified=resp.headers.get("Last-Modified") or modified,
+            fetch_seconds=time.perf_counter() - started,
+        )
+    resp.raise_for_status()
+    body = resp.content  # gzip/deflate는 이미 풀려 있음
+    fetch_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    import feedparser  # 304면 파싱하지 않으므로 필요할 때만 불러옴
+
+    # 본문은 이미 풀었으므로 인코딩 관련 헤더는 넘기지 않음 (charset 판단용 content-type 등만 전달)
+    resp_headers = {k.lower(): v for k, v in resp.headers.items()}
+    parse_headers = {k: v for k, v in resp_headers.items() if k not in ("content-encoding", "content-length")}
+    feed = feedparser.parse(body, response_headers=parse_headers)
+    parse_seconds = time.perf_counter() - started
+    return FetchResult(
+        url=url,
+        status=resp.status_code,
+        feed=feed,
+        etag=resp_headers.get("etag"),
+        modified=resp_headers.get("last-modified"),
+        bytes_received=http_client.wire_bytes(resp),
+        fetch_seconds=fetch_seconds,
+        parse_seconds=parse_seconds,
+    )
+
+
+def fetch_techcrunch_ai_feed(url: str = TECHCRUNCH_AI_FEED_URL) -> "feedparser.FeedParserDict":
+    """TechCrunch AI RSS 피드를 가져옵니다 (조건부 요청 없이 항상 전체를 받음)."""
+    return fetch_feed(url).feed
+
+
+def parse_entries(feed: "feedparser.FeedParserDict") -> list[dict]:
     """피드에서 기사 목록을 파싱해 딕셔너리 리스트로 반환합니다."""
     entries = []
     for entry in feed.entries:
         # published 파싱 (포맷이 다양할 수 있음)
         published = getattr(entry, "published", None) or getattr(entry, "updated", "")
-        entries.append({
+        entries.append(add_text_fields({
             "title": getattr(entry, "title", ""),
             "link": getattr(entry, "link", ""),
             "published": published,
             "summary": getattr(entry, "summary", ""),
             "id": getattr(entry, "id", ""),
-        })
+        }))
     return entries
 
 
-def save_articles(articles: list[dict], output_dir: str = OUTPUT_DIR, filename: str = ARTICLES_JSON) -> Path:
+def save_articles(
+    articles: list[dict],
+    output_dir: str = OUTPUT_DIR,
+    filename: str = ARTICLES_JSON,
+    sources: list[str] | None = None,
+) -> Path:
     """수집한 기사를 JSON 파일로 저장합니다."""
     path = Path(output_dir)
     path.mkdir(parents=True, exist_ok=True)
     filepath = path / filename
     data = {
         "fetched_at": datetime.utcnow().isoformat() + "Z",
-        "source": TECHCRUNCH_AI_FEED_URL,
+        "source": sources[0] if sources and len(sources) == 1 else (sources or TECHCRUNCH_AI_FEED_URL),
         "count": len(articles),
         "articles": articles,
     }
@@ -47,14 +166,196 @@ def save_articles(articles: list[dict], output_dir: str = OUTPUT_DIR, filename:
     return filepath
 
 
-def collect() -> tuple[list[dict], Path | None]:
+def load_feed_state(output_dir: str = OUTPUT_DIR, filename: str = FEED_STATE_JSON) -> dict:
+    """피드별 ETag / Last-Modified 저장값을 읽습니다. {url: {"etag": ..., "modified": ...}}"""
+    filepath = Path(output_dir) / filename
+    if not filepath.exists():
+        return {}
+    try:
+        with open(filepath, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return {}
+
+
+def save_feed_state(state: dict, output_dir: str = OUTPUT_DIR, filename: str = FEED_STATE_JSON) -> Path:
+    """피드 상태를 임시 파일에 쓴 뒤 교체해 저장합니다."""
+    path = Path(output_dir)
+    path.mkdir(parents=True, exist_ok=True)
+    filepath = path / filename
+    tmp = filepath.with_suffix(filepath.suffix + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, filepath)
+    return filepath
+
+
+def last_fetches() -> list[FetchResult]:
+    """마지막 collect()의 피드별 요청 결과 (전송 바이트, 파싱 시간, 오류 등)."""
+    return list(_last_fetches)
+
+
+def fetch_report_lines(results: list[FetchResult]) -> list[str]:
+    """피드별 수집 결과를 콘솔 출력용 문자열 목록으로 만듭니다."""
+    lines = []
+    for r in results:
+        if r.error:
+            lines.append(f"[!] {r.name}: 수집 실패 ({r.error})")
+        elif r.not_modified:
+            lines.append(f"{r.name}: 변경 없음 (304)")
+        else:
+            lines.append(f"{r.name}: {r.bytes_received:,} bytes, 파싱 {r.parse_seconds * 1000:.1f}ms")
+    return lines
+
+
+def commit_feed_state() -> None:
+    """
+    collect(commit_state=False)로 미뤄 둔 ETag / Last-Modified 값을 저장합니다.
+    요약·저장까지 끝난 뒤 호출해야, 중간에 실패했을 때 다음 실행이 304로 건너뛰지 않습니다.
+    """
+    global _pending_state
+    if _pending_state is not None:
+        save_feed_state(_pending_state)
+        _pending_state = None
+
+
+def normalize_link(link: str) -> str:
+    """중복 판정용 링크: 스킴·호스트 소문자, 끝 슬래시·fragment·utm_* 파라미터 제거."""
+    if not link:
+        return ""
+    parts = urlsplit(link.strip())
+    query = urlencode([(k, v) for k, v in parse_qsl(parts.query) if not k.startswith("utm_")])
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ""))
+
+
+def dedupe_articles(articles: list[dict]) -> list[dict]:
+    """정규화한 링크나 GUID가 이미 나온 기사를 제거합니다 (먼저 나온 것을 유지)."""
+    seen_links = set()
+    seen_ids = set()
+    result = []
+    for a in articles:
+        link = normalize_link(a.get("link", ""))
+        guid = a.get("id") or ""
+        if (link and link in seen_links) or (guid and guid in seen_ids):
+            continue
+        if link:
+            seen_links.add(link)
+        if guid:
+            seen_ids.add(guid)
+        result.append(a)
+    return result
+
+
+def _fetch_one(feed_cfg: dict, validators: dict) -> FetchResult:
+    """피드 하나를 가져옵니다. 실패해도 예외 대신 error가 채워진 결과를 반환합니다."""
+    url = feed_cfg["url"]
+    name = feed_cfg.get("name") or url
+    try:
+        # 호스트별 동시 요청 수는 http_client가 제한
+        result = fetch_feed(
+            url,
+            etag=validators.get("etag"),
+            modified=validators.get("modified"),
+            timeout=feed_cfg.get("timeout", 30),
+        )
+        if result.feed is not None and result.feed.bozo and not result.feed.entries:
+            raise RuntimeError("RSS 파싱 실패 또는 피드가 비어 있음")
+    except Exception as e:
+        _FEED_FETCHES.inc(feed=name, status="error")
+        return FetchResult(url=url, status=0, name=name, error=e)
+    result.name = name
+    _FEED_FETCHES.inc(feed=name, status="not_modified" if result.not_modified else "ok")
+    _FEED_FETCH_SECONDS.observe(result.fetch_seconds, feed=name)
+    _FEED_BYTES.inc(result.bytes_received, feed=name)
+    if result.feed is not None:
+        _FEED_PARSE_SECONDS.observe(result.parse_seconds, feed=name)
+    return result
+
+
+def fetch_feeds(feeds: list[dict], state: dict, conditional: bool = True) -> list[FetchResult]:
+    """여러 피드를 동시에 가져옵니다. 결과는 feeds 순서대로 반환됩니다."""
+    if not feeds:
+        return []
+    workers = max(1, min(FEED_MAX_WORKERS, len(feeds)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(
+            lambda cfg: _fetch_one(cfg, state.get(cfg["url"], {}) if conditional else {}),
+            feeds,
+        ))
+
+
+def _load_previous_articles(output_dir: str = OUTPUT_DIR, filename: str = ARTICLES_JSON) -> list[dict]:
+    filepath = Path(output_dir) / filename
+    if not filepath.exists():
+        return []
+    try:
+        with open(filepath, "r", encoding="utf-8") as f:
+            return json.load(f).get("articles", [])
+    except Exception:
+        return []
+
+
+def collect(
+    conditional: bool = True,
+    commit_state: bool = True,
+    feeds: list[dict] | None = None,
+) -> tuple[list[dict], Path | None]:
     """
-    TechCrunch AI RSS를 수집하고 저장합니다.
+    설정된 모든 피드를 수집하고 저장합니다.
+    - conditional: 저장된 ETag / Last-Modified로 조건부 요청. 새로 받은 피드가 없으면(304/실패뿐) FeedNotModified 발생
+    - commit_state: False면 새 검증값 저장을 commit_feed_state() 호출 때까지 미룸
+    - feeds: 수집할 피드 목록 (기본값 config.FEEDS)
+    일부 피드가 실패하거나 304면, 그 피드는 지난번 articles.json의 기사를 그대로 씁니다.
+    모든 피드가 실패한 경우에만 RuntimeError를 발생시킵니다.
     Returns: (기사 리스트, 저장된 파일 경로 또는 None)
     """
-    feed = fetch_techcrunch_ai_feed()
-    if feed.bozo and not feed.entries:
-        raise RuntimeError("RSS 파싱 실패 또는 피드가 비어 있음")
-    articles = parse_entries(feed)
-    filepath = save_articles(articles)
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        articles, filepath = _collect(conditional, commit_state, feeds)
+        outcome = "ok"
+        _COLLECTED_ARTICLES.inc(len(articles))
+        return articles, filepath
+    except FeedNotModified:
+        outcome = "not_modified"
+        raise
+    finally:
+        _COLLECT_SECONDS.observe(time.perf_counter() - start, outcome=outcome)
+
+
+def _collect(conditional: bool, commit_state: bool, feeds: list[dict] | None) -> tuple[list[dict], Path | None]:
+    global _last_fetches, _pending_state
+    feeds = feeds if feeds is not None else FEEDS
+    state = load_feed_state()
+    results = fetch_feeds(feeds, state, conditional=conditional)
+    _last_fetches = results
+
+    if not any(r.ok for r in results) and any(r.not_modified for r in results):
+        # 새로 받은 피드가 없음 (나머지는 304이거나 실패) → 이후 단계 생략
+        raise FeedNotModified(results)
+    if not any(r.ok for r in results):
+        errors = "; ".join(f"{r.name}: {r.error}" for r in results if r.error)
+        raise RuntimeError(f"모든 피드 수집 실패 ({errors})")
+
+    previous = None
+    articles = []
+    for r in results:
+        if r.ok:
+            for a in parse_entries(r.feed):
+                articles.append({**a, "source": r.name})
+            state[r.url] = {"etag": r.etag, "modified": r.modified}
+        else:
+            # 304 또는 실패: 지난번에 받아 둔 이 피드의 기사를 유지
+            if previous is None:
+                previous = _load_previous_articles()
+            articles.extend(a for a in previous if a.get("source", feeds[0].get("name")) == r.name)
+    if len(feeds) > 1:
+        articles.sort(key=published_timestamp, reverse=True)
+    articles = dedupe_articles(articles)
+    filepath = save_articles(articles, sources=[cfg["url"] for cfg in feeds])
+
+    _pending_state = state
+    if commit_state:
+        commit_feed_state()
     return articles, filepath
@@ -3,16 +3,21 @@ TechCrunch AI RSS 수집 스크립트.
 실행 시 피드를 가져와 output/articles.json에 저장하고 콘솔에 요약을 출력합니다.
 """
 import sys
-from rss_fetcher import collect
+from rss_fetcher import FeedNotModified, collect, fetch_report_lines, last_fetches
 
 
 def main():
     print("TechCrunch AI RSS 수집 중...")
     try:
         articles, filepath = collect()
+    except FeedNotModified:
+        print("피드 변경 없음 (304). 저장된 파일을 그대로 둡니다.")
+        return 0
     except Exception as e:
         print(f"오류: {e}", file=sys.stderr)
         sys.exit(1)
+    for line in fetch_report_lines(last_fetches()):
+        print(f"  {line}")
     print(f"수집 완료: {len(articles)}개 기사")
     print(f"저장 위치: {filepath}\n")
     print("--- 최근 기사 ---")
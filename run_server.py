@@ -7,6 +7,16 @@ import os
 import sys
 from pathlib import Path
 
+def _start_scheduler(server):
+    from scheduler import start_scheduler
+    start_scheduler()
+
+
+def _after_fork(server, worker):
+    from scheduler import after_fork
+    after_fork()
+
+
 def main():
     # 프로젝트 루트를 작업 디렉터리로 (output/ 경로 맞추기)
     root = Path(__file__).resolve().parent
@@ -43,6 +53,10 @@ def main():
         "timeout": 30,
         "accesslog": "-",
         "errorlog": "-",
+        # 내장 스케줄러는 마스터 프로세스에서 한 번만 (gunicorn.conf.py와 같음, SCHEDULER_ENABLED=true일 때)
+        "when_ready": _start_scheduler,
+        # fork한 워커는 물려받은 스케줄러 잠금 파일을 닫음
+        "post_fork": _after_fork,
     }
     print(f"Gunicorn 시작: {bind} (workers={workers})")
     StandaloneApplication("app:app", options).run()
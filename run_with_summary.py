@@ -1,14 +1,34 @@
 """
 TechCrunch AI RSS 수집 + Gemini 요약 스크립트.
-RSS 수집 후 각 기사를 Gemini API로 한국어 요약해 output/summarized_articles.json에 저장합니다.
+RSS 수집 후 각 기사를 Gemini API로 한국어 요약해 기사 저장소(output/articles.sqlite3)에 저장하고,
+호환용으로 output/summarized_articles.json도 내보냅니다 (EXPORT_SUMMARIZED_JSON=false로 끄기).
 실행 전에 환경 변수 GEMINI_API_KEY를 설정하세요.
+
+요약은 끝나는 대로 output/summary_checkpoint.jsonl에 기록되므로, 실행이 중간에 죽어도 받은 요약은 잃지 않습니다.
+  python run_with_summary.py            # 수집 + 새 기사 요약 (체크포인트에 남은 요약은 재사용)
+  python run_with_summary.py --resume   # 중단된 실행의 기사 목록 그대로, 남은 기사만 요약
+업데이트 워커(worker.py)나 backfill.py가 실행 중이면 같이 돌지 않고 바로 끝납니다 (종료 코드 1).
 """
+import argparse
 import sys
 from datetime import date
 from pathlib import Path
 
-from config import OUTPUT_DIR
-from rss_fetcher import collect
+from article_fetcher import fetch_full_articles
+from config import (
+    FULL_ARTICLE_FETCH,
+    GEMINI_MAX_CONCURRENCY,
+    GEMINI_REQUESTS_PER_MINUTE,
+    OUTPUT_DIR,
+    STATIC_SITE_DIR,
+    SUMMARY_BATCH_SIZE,
+)
+from job_queue import get_job_queue
+from model_router import get_router
+from prompt_builder import usage as token_usage
+from rss_fetcher import FeedNotModified, collect, commit_feed_state, fetch_report_lines, last_fetches
+from summary_cache import get_summary_cache
+from summary_checkpoint import get_checkpoint
 from summarizer import (
     load_existing_summarized,
     merge_and_summarize,
@@ -17,31 +37,94 @@ from summarizer import (
 )
 
 
-def main():
+def _mark_updated_today() -> None:
+    """오늘 업데이트했음을 기록 (예약 실행 시 "이미 오늘 했는지" 판단용)"""
+    Path(OUTPUT_DIR).mkdir(parents=True, exist_ok=True)
+    (Path(OUTPUT_DIR) / "last_update_date.txt").write_text(date.today().isoformat(), encoding="utf-8")
+
+
+def run(resume: bool = False) -> int:
+    """
+    수집·요약·저장을 한 번 실행합니다. 워커 잠금을 잡은 쪽에서만 호출합니다
+    (워커 작업은 scheduled_update.run_update, 직접 실행은 main()이 잠금을 잡음).
+    resume: 중단된 실행의 기사 목록으로 남은 기사만 요약
+    """
     removed = remove_failed_articles_from_file()
     if removed > 0:
-        print(f"기존 파일에서 요약 실패한 기사 {removed}건을 제거했습니다.\n")
+        print(f"저장소에서 요약 실패한 기사 {removed}건을 제거했습니다.\n")
 
-    print("TechCrunch AI RSS 수집 중...")
-    try:
-        articles, articles_path = collect()
-    except Exception as e:
-        print(f"오류: {e}", file=sys.stderr)
-        sys.exit(1)
-    print(f"수집 완료: {len(articles)}개 기사")
-    print(f"원본 저장: {articles_path}\n")
+    checkpoint = get_checkpoint()
+    resumed = checkpoint.run_articles() if resume else None
+    if resumed is not None:
+        articles = resumed
+        print(f"중단된 실행을 이어서 합니다: 기사 {len(articles)}개, 이미 받은 요약 {len(checkpoint.summaries())}개\n")
+    else:
+        if resume:
+            print("이어서 할 실행이 없습니다. 새로 수집합니다.")
+        print("TechCrunch AI RSS 수집 중...")
+        try:
+            # 검증값(ETag 등)은 요약·저장이 끝난 뒤에 기록
+            articles, articles_path = collect(commit_state=False)
+        except FeedNotModified:
+            print("피드 변경 없음 (304). 요약·저장 단계를 건너뜁니다.")
+            _mark_updated_today()
+            return 0
+        except Exception as e:
+            print(f"오류: {e}", file=sys.stderr)
+            sys.exit(1)
+        for line in fetch_report_lines(last_fetches()):
+            print(f"  {line}")
+        print(f"수집 완료: {len(articles)}개 기사")
+        print(f"원본 저장: {articles_path}\n")
+        checkpoint.start_run(articles)
 
     existing = load_existing_summarized()
-    new_count = sum(1 for a in articles if a.get("link") not in {e.get("link") for e in existing})
-    print(f"기존 요약: {len(existing)}개 / 이번 피드에서 새 글: {new_count}개")
+    existing_links = {e.get("link") for e in existing}
+    new_links = [a.get("link") for a in articles if a.get("link") not in existing_links]
+    print(f"기존 요약: {len(existing)}개 / 이번 피드에서 새 글: {len(new_links)}개")
+
+    # 최근에 요약이 실패한 기사는 재시도 시각까지 (최대 시도 횟수를 넘겼으면 계속) 건너뜀
+    queue = get_job_queue()
+    blocked = queue.blocked_links(new_links)
+    if blocked:
+        exhausted = sum(1 for b in blocked.values() if b["exhausted"])
+        print(f"요약 재시도 대기 중인 기사 {len(blocked)}개는 건너뜁니다 (포기 {exhausted}개).")
+        articles = [a for a in articles if a.get("link") not in blocked]
+    new_count = len(new_links) - len(blocked)
+
+    if FULL_ARTICLE_FETCH and new_count > 0:
+        targets = [a for a in articles if a.get("link") not in existing_links]
+        print(f"새 기사 원문 가져오는 중... ({len(targets)}개)")
+        fetched = fetch_full_articles(targets)
+        print(f"원문: 캐시 {fetched['cached']}개 / 새로 받음 {fetched['fetched']}개 / 실패 {fetched['failed']}개 (RSS 요약문 사용)")
 
     if new_count > 0:
-        print("Gemini API로 새 기사만 한국어 요약 중... (기사당 15초 간격, 무료 한도 5회/분 준수)")
+        print(
+            f"Gemini API로 새 기사만 한국어 요약 중... "
+            f"(분당 최대 {GEMINI_REQUESTS_PER_MINUTE:g}회, 동시 {GEMINI_MAX_CONCURRENCY}개"
+            + (f", 요청당 최대 {SUMMARY_BATCH_SIZE}개 기사)" if SUMMARY_BATCH_SIZE > 1 else ")")
+        )
     else:
         print("새 기사 없음. 기존 요약과 피드 순서만 반영합니다.")
+    token_usage.reset()
     try:
-        merged, failed_list = merge_and_summarize(articles, existing, delay_seconds=15.0)
-        summary_path = save_summarized(merged)
+        merged, failed_list = merge_and_summarize(
+            articles,
+            existing,
+            requests_per_minute=GEMINI_REQUESTS_PER_MINUTE,
+            max_concurrency=GEMINI_MAX_CONCURRENCY,
+            batch_size=SUMMARY_BATCH_SIZE,
+            checkpoint=checkpoint,
+        )
+        # 기존 기사는 저장소에서 읽은 그대로이므로 새로 요약한 기사만 비교해서 씀
+        summary_path = save_summarized(merged, changed_links=[a["link"] for a in merged if a["link"] not in existing_links])
+        checkpoint.clear()
+        failed_links = {f["link"] for f in failed_list}
+        queue.record_article_failures(failed_list)
+        queue.clear_article_failures(link for link in new_links if link not in blocked and link not in failed_links)
+        # 요약 실패가 있으면 다음 실행에서 피드를 다시 받아 재시도하도록 검증값을 남기지 않음
+        if not failed_list:
+            commit_feed_state()
     except Exception as e:
         print(f"오류: {e}", file=sys.stderr)
         sys.exit(1)
@@ -58,9 +141,42 @@ def main():
 
     print(f"저장 완료: {len(merged)}개 기사 → {summary_path}\n")
 
-    # 오늘 업데이트했음을 기록 (예약 실행 시 "이미 오늘 했는지" 판단용)
-    Path(OUTPUT_DIR).mkdir(parents=True, exist_ok=True)
-    (Path(OUTPUT_DIR) / "last_update_date.txt").write_text(date.today().isoformat(), encoding="utf-8")
+    if STATIC_SITE_DIR:
+        from static_site import export_site
+        try:
+            site = export_site(STATIC_SITE_DIR)
+            print(
+                f"정적 사이트: 렌더링 {site['rendered']}개 / 그대로 {site['skipped']}개 / 삭제 {site['removed']}개 "
+                f"→ {STATIC_SITE_DIR}\n"
+            )
+        except Exception as e:
+            # 요약은 이미 저장됐으므로 실패해도 실행은 계속 (다음 실행이나 static_site.py로 다시 내보내면 됨)
+            print(f"[!] 정적 사이트 내보내기 실패: {e}\n", file=sys.stderr)
+
+    tokens = token_usage.summary()
+    if tokens["requests"]:
+        print(
+            f"입력 토큰(추정): {tokens['input_tokens']:,} / 요청 {tokens['requests']}회, "
+            f"기사당 약 {tokens['per_article']:,}\n"
+        )
+
+    router = get_router()
+    if router is not None:
+        router.save()
+        blocked_models = [m for m, s in router.status().items() if s["state"] != "closed"]
+        if blocked_models:
+            print(f"회로가 열린 모델 (다음 실행까지 건너뜀): {', '.join(blocked_models)}\n")
+
+    cache = get_summary_cache()
+    if cache is not None:
+        evicted = cache.evict()
+        stats = cache.stats()
+        print(
+            f"요약 캐시: 적중 {stats['hits']}회 / 미적중 {stats['misses']}회, "
+            f"저장 {stats['entries']}건 (정리 {evicted}건)\n"
+        )
+
+    _mark_updated_today()
 
     print("--- 최근 기사 (한국어 요약) ---")
     for i, a in enumerate(merged[:5], 1):
@@ -71,5 +187,14 @@ def main():
     return 0
 
 
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="TechCrunch AI RSS 수집 + Gemini 요약")
+    parser.add_argument("--resume", action="store_true", help="중단된 실행의 기사 목록으로 남은 기사만 요약")
+    args = parser.parse_args(argv)
+    # 워커(worker.py)와 동시에 돌면 같은 기사를 두 번 요약하고 저장소·체크포인트에 겹쳐 쓰므로 같은 잠금을 잡음
+    from worker import run_exclusive
+    return run_exclusive(lambda: run(resume=args.resume), "run_with_summary")
+
+
 if __name__ == "__main__":
     sys.exit(main())
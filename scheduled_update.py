@@ -1,6 +1,8 @@
 """
 서버에서 예약 실행용 스크립트.
-- 오늘 이미 업데이트했으면 건너뛰고, 아니면 run_with_summary를 실행합니다.
+- 업데이트 작업을 작업 큐에 넣고 워커로 처리합니다 (이미 대기·실행 중인 업데이트가 있으면 그 작업에 합침).
+- 작업은 오늘 이미 업데이트했으면 건너뛰고, 아니면 run_with_summary를 실행합니다.
+- 다른 워커가 실행 중이면 그 워커가 처리하므로 바로 끝납니다.
 
 사용법 (Linux 서버):
   - cron: crontab -e 로 매일 실행 시간 설정
@@ -30,26 +32,41 @@ def already_updated_today() -> bool:
         return False
 
 
+def run_update(force: bool = False, resume: bool = False) -> int:
+    """
+    업데이트 한 번 (워커가 작업을 실행할 때 호출).
+    오늘 이미 업데이트했으면 건너뜁니다. run_with_summary의 종료 코드를 반환합니다.
+    resume: 중단된 실행의 체크포인트에서 이어서 요약
+    """
+    if not force and already_updated_today():
+        print("오늘은 이미 업데이트했습니다. 건너뜁니다.")
+        return 0
+
+    print("오늘 업데이트가 없습니다. RSS 수집 및 요약을 실행합니다.\n")
+    from run_with_summary import run
+    try:
+        return run(resume=resume) or 0
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else 1
+
+
 def main():
     if SCRIPT_DIR != Path.cwd():
         import os
         os.chdir(SCRIPT_DIR)
 
-    lock_file = SCRIPT_DIR / OUTPUT_DIR / "update_in_progress.lock"
-    try:
-        if already_updated_today():
-            print("오늘은 이미 업데이트했습니다. 건너뜁니다.")
-            return 0
-
-        print("오늘 업데이트가 없습니다. RSS 수집 및 요약을 실행합니다.\n")
-        from run_with_summary import main as run_main
-        return run_main()
-    finally:
-        if lock_file.exists():
-            try:
-                lock_file.unlink()
-            except Exception:
-                pass
+    from job_queue import get_job_queue
+    from worker import run_worker
+
+    queue = get_job_queue()
+    job_id, coalesced = queue.enqueue("update")
+    print(f"업데이트 작업 {job_id}" + (" (이미 대기 중인 작업에 합침)" if coalesced else ""))
+    run_worker()
+    job = queue.get(job_id)
+    if job["status"] == "failed":
+        print(f"작업 {job_id} 실패: {job['error']}", file=sys.stderr)
+        return 1
+    return 0
 
 
 if __name__ == "__main__":
@@ -0,0 +1,62 @@
+"""
+내장 스케줄러 (매일 00:00 KST에 업데이트 작업을 큐에 넣음).
+앱을 import할 때는 시작하지 않습니다. SCHEDULER_ENABLED=true일 때만 start_scheduler()가 시작하며,
+output/scheduler.lock 파일 잠금을 잡은 프로세스 하나에서만 돕니다.
+
+- gunicorn: gunicorn.conf.py의 when_ready 훅(마스터 프로세스)에서 시작하고,
+  fork한 워커는 post_fork 훅에서 after_fork()로 물려받은 잠금 파일을 닫음
+- python app.py / run_server.py: 시작할 때 직접 호출
+"""
+from config import SCHEDULER_ENABLED
+from job_queue import WorkerLock, output_path
+
+SCHEDULER_LOCK_FILE = "scheduler.lock"
+
+_scheduler = None
+_lock = None
+
+
+def _run_scheduled_update():
+    """매일 00:00 (한국 시간)에 실행되는 RSS 수집·요약 작업 (이미 대기·실행 중이면 그 작업에 합쳐짐)"""
+    from worker import start_update_job
+    try:
+        start_update_job()
+    except Exception as e:
+        print(f"[scheduler] 업데이트 실패: {e}", flush=True)
+
+
+def start_scheduler(force: bool = False) -> bool:
+    """
+    스케줄러를 시작합니다. 시작했으면 True.
+    설정에서 꺼져 있거나 (force=False) 다른 프로세스가 이미 스케줄러를 돌리고 있으면 False입니다.
+    """
+    global _scheduler, _lock
+    if _scheduler is not None:
+        return True
+    if not (SCHEDULER_ENABLED or force):
+        return False
+    lock = WorkerLock(output_path() / SCHEDULER_LOCK_FILE)
+    if not lock.acquire():
+        print("[scheduler] 다른 프로세스가 스케줄러를 실행 중입니다.", flush=True)
+        return False
+    from apscheduler.schedulers.background import BackgroundScheduler
+
+    scheduler = BackgroundScheduler(timezone="Asia/Seoul")
+    scheduler.add_job(_run_scheduled_update, "cron", hour=0, minute=0)
+    scheduler.start()
+    # 잠금은 프로세스가 끝날 때까지 잡고 있음 (죽으면 OS가 풀어 다른 프로세스가 이어받을 수 있음)
+    _scheduler, _lock = scheduler, lock
+    print("[scheduler] 매일 00:00 (Asia/Seoul) 업데이트 예약", flush=True)
+    return True
+
+
+def after_fork() -> None:
+    """
+    fork한 자식 프로세스에서 호출합니다 (gunicorn post_fork 훅).
+    스케줄러 스레드는 자식으로 넘어오지 않으므로 상태를 비우고, 물려받은 잠금 파일은 닫습니다.
+    닫지 않으면 마스터가 죽어도 워커가 살아 있는 동안 잠금이 풀리지 않아 새 마스터가 스케줄러를 시작하지 못합니다.
+    """
+    global _scheduler, _lock
+    if _lock is not None:
+        _lock.detach()
+    _scheduler, _lock = None, None
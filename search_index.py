@@ -0,0 +1,262 @@
+"""
+기사 전문 검색 색인 (SQLite에 저장하는 역색인 + BM25 점수).
+제목, 영어 원문 요약, 한국어 요약(summary_ko)을 색인합니다.
+- 영어/숫자: 소문자 단어 단위
+- 한글: 글자 바이그램 (한 글자짜리 덩어리는 그대로)
+
+기사가 저장될 때(save_summarized) 새로 들어오거나 바뀐 기사만 색인에 반영하고,
+웹 워커는 파일로 저장된 색인을 그대로 조회하므로 시작할 때 다시 만들 필요가 없습니다.
+
+사용법:
+  python search_index.py rebuild        # 기사 저장소 전체로 색인 다시 만들기
+  python search_index.py "검색어"
+"""
+import heapq
+import math
+import re
+import sqlite3
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+
+from article_db import article_uid, get_article_db
+from config import OUTPUT_DIR, SEARCH_INDEX_DB
+from html_text import summary_text
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_WEIGHT = 2  # 제목 단어는 본문보다 두 배로 셈
+# 아주 흔한 단어(한글 바이그램 "했다" 등)는 기여도(impact)가 큰 문서부터 이만큼만 읽음
+MAX_POSTINGS_PER_TERM = 1000
+_IMPACT_AVGDL = 100.0  # impact 정렬용 기준 문서 길이 (순서만 정하므로 대략적인 값이면 충분)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+|[가-힣]+")
+_STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the this to was were will with".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """검색용 토큰 목록. 영어는 단어, 한글은 글자 바이그램으로 자릅니다."""
+    tokens = []
+    for chunk in _TOKEN_RE.findall((text or "").lower()):
+        if chunk[0] >= "가":
+            if len(chunk) == 1:
+                tokens.append(chunk)
+            else:
+                tokens.extend(chunk[i:i + 2] for i in range(len(chunk) - 1))
+        elif chunk not in _STOPWORDS and (len(chunk) > 1 or chunk.isdigit()):
+            tokens.append(chunk)
+    return tokens
+
+
+def _document_terms(article: dict) -> Counter:
+    terms = Counter()
+    for token in tokenize(article.get("title", "")):
+        terms[token] += TITLE_WEIGHT
+    body = summary_text(article) + " " + (article.get("summary_ko") or "")
+    terms.update(tokenize(body))
+    return terms
+
+
+def _bm25_tf(tf: int, dl: int, avgdl: float) -> float:
+    return tf * (BM25_K1 + 1) / (tf + BM25_K1 * (1 - BM25_B + BM25_B * dl / avgdl))
+
+
+class SearchIndex:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self._conn()
+        conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS docs (
+                doc_id INTEGER PRIMARY KEY,
+                uid TEXT UNIQUE NOT NULL,
+                length INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                doc_id INTEGER NOT NULL,
+                tf INTEGER NOT NULL,
+                dl INTEGER NOT NULL,
+                impact REAL NOT NULL,
+                PRIMARY KEY (term, doc_id)
+            ) WITHOUT ROWID;
+            CREATE INDEX IF NOT EXISTS idx_postings_doc ON postings(doc_id);
+            CREATE INDEX IF NOT EXISTS idx_postings_impact ON postings(term, impact DESC);
+            CREATE TABLE IF NOT EXISTS terms (term TEXT PRIMARY KEY, df INTEGER NOT NULL) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS stats (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+            """
+        )
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _stats(self, conn) -> tuple[int, int]:
+        rows = dict(conn.execute("SELECT key, value FROM stats"))
+        return rows.get("docs", 0), rows.get("total_length", 0)
+
+    def count(self) -> int:
+        return self._stats(self._conn())[0]
+
+    def _remove(self, conn, uid: str) -> None:
+        row = conn.execute("SELECT doc_id, length FROM docs WHERE uid = ?", (uid,)).fetchone()
+        if row is None:
+            return
+        doc_id, length = row
+        for (term,) in conn.execute("SELECT term FROM postings WHERE doc_id = ?", (doc_id,)).fetchall():
+            conn.execute("UPDATE terms SET df = df - 1 WHERE term = ?", (term,))
+        conn.execute("DELETE FROM terms WHERE df <= 0")
+        conn.execute("DELETE FROM postings WHERE doc_id = ?", (doc_id,))
+        conn.execute("DELETE FROM docs WHERE doc_id = ?", (doc_id,))
+        conn.execute("UPDATE stats SET value = value - 1 WHERE key = 'docs'")
+        conn.execute("UPDATE stats SET value = value - ? WHERE key = 'total_length'", (length,))
+
+    def _add(self, conn, article: dict) -> None:
+        uid = article_uid(article)
+        self._remove(conn, uid)
+        terms = _document_terms(article)
+        length = sum(terms.values())
+        doc_id = conn.execute("INSERT INTO docs (uid, length) VALUES (?, ?)", (uid, length)).lastrowid
+        conn.executemany(
+            "INSERT INTO postings (term, doc_id, tf, dl, impact) VALUES (?, ?, ?, ?, ?)",
+            [(term, doc_id, tf, length, _bm25_tf(tf, length, _IMPACT_AVGDL)) for term, tf in terms.items()],
+        )
+        conn.executemany(
+            "INSERT INTO terms (term, df) VALUES (?, 1) ON CONFLICT(term) DO UPDATE SET df = df + 1",
+            [(term,) for term in terms],
+        )
+        conn.execute(
+            "INSERT INTO stats (key, value) VALUES ('docs', 1) "
+            "ON CONFLICT(key) DO UPDATE SET value = value + 1"
+        )
+        conn.execute(
+            "INSERT INTO stats (key, value) VALUES ('total_length', ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = value + excluded.value",
+            (length,),
+        )
+
+    def update(self, changed: list[dict] = (), removed: list[dict] = ()) -> None:
+        """새로 들어오거나 바뀐 기사를 색인하고, 지워진 기사를 색인에서 뺍니다 (한 트랜잭션)."""
+        if not changed and not removed:
+            return
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for article in removed:
+                self._remove(conn, article_uid(article))
+            for article in changed:
+                self._add(conn, article)
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def rebuild(self, articles) -> int:
+        """색인을 비우고 주어진 기사로 다시 만듭니다. 색인한 개수를 반환합니다."""
+        conn = self._conn()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            for table in ("docs", "postings", "terms", "stats"):
+                conn.execute(f"DELETE FROM {table}")
+            count = 0
+            for article in articles:
+                self._add(conn, article)
+                count += 1
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return count
+
+    def search(self, query: str, limit: int = 20) -> list[tuple[str, float]]:
+        """BM25 점수가 높은 순으로 (uid, 점수) 목록을 반환합니다."""
+        query_terms = list(dict.fromkeys(tokenize(query)))
+        if not query_terms:
+            return []
+        conn = self._conn()
+        n_docs, total_length = self._stats(conn)
+        if not n_docs:
+            return []
+        avgdl = total_length / n_docs
+        placeholders = ",".join("?" * len(query_terms))
+        dfs = dict(conn.execute(f"SELECT term, df FROM terms WHERE term IN ({placeholders})", query_terms))
+
+        scores: dict[int, float] = {}
+        # 드문 단어부터 처리해, 흔한 단어는 이미 후보가 된 문서 위주로 점수를 더함
+        for term, df in sorted(dfs.items(), key=lambda item: item[1]):
+            idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+            if df <= MAX_POSTINGS_PER_TERM:
+                rows = conn.execute("SELECT doc_id, tf, dl FROM postings WHERE term = ?", (term,)).fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT doc_id, tf, dl FROM postings WHERE term = ? ORDER BY impact DESC LIMIT ?",
+                    (term, MAX_POSTINGS_PER_TERM),
+                ).fetchall()
+                if scores and len(scores) <= MAX_POSTINGS_PER_TERM:
+                    ids = list(scores)
+                    rows += conn.execute(
+                        f"SELECT doc_id, tf, dl FROM postings WHERE term = ? "
+                        f"AND doc_id IN ({','.join('?' * len(ids))})",
+                        (term, *ids),
+                    ).fetchall()
+            seen = set()
+            for doc_id, tf, dl in rows:
+                if doc_id in seen:
+                    continue
+                seen.add(doc_id)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * _bm25_tf(tf, dl, avgdl)
+        if not scores:
+            return []
+        top = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        ids = [doc_id for doc_id, _ in top]
+        uids = dict(conn.execute(
+            f"SELECT doc_id, uid FROM docs WHERE doc_id IN ({','.join('?' * len(ids))})", ids
+        ))
+        return [(uids[doc_id], score) for doc_id, score in top]
+
+
+_indexes: dict[str, SearchIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_search_index(output_dir: str | Path = OUTPUT_DIR) -> SearchIndex:
+    """output_dir의 검색 색인을 반환합니다 (경로당 하나)."""
+    key = str(Path(output_dir).resolve())
+    index = _indexes.get(key)
+    if index is None:
+        with _indexes_lock:
+            index = _indexes.get(key)
+            if index is None:
+                index = SearchIndex(Path(output_dir) / SEARCH_INDEX_DB)
+                _indexes[key] = index
+    return index
+
+
+def main(argv: list[str]) -> int:
+    index = get_search_index()
+    if len(argv) > 1 and argv[1] == "rebuild":
+        count = index.rebuild(get_article_db().iter_articles())
+        print(f"색인 완료: {count}개 기사")
+        return 0
+    if len(argv) < 2:
+        print(__doc__)
+        return 1
+    db_articles = {article_uid(a): a for a in get_article_db().iter_articles()}
+    for uid, score in index.search(" ".join(argv[1:])):
+        article = db_articles.get(uid, {})
+        print(f"{score:6.2f}  {article.get('title', uid)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
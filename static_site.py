@@ -0,0 +1,241 @@
+"""
+정적 사이트 내보내기.
+기사 저장소를 읽어 웹 앱과 같은 템플릿으로 HTML을 미리 렌더링하고, 피드와 함께 한 디렉터리에 씁니다.
+nginx나 CDN이 이 디렉터리를 그대로 서비스하면 요청 처리에 Python이 끼지 않습니다.
+
+  index.html, page/<N>/index.html   목록 (INDEX_PER_PAGE개씩)
+  articles/<uid>/index.html         기사 상세
+  feed.xml, atom.xml, feed.json     최근 FEED_MAX_ENTRIES개 기사의 RSS 2.0 / Atom / JSON Feed (웹 앱의 /feed.xml, /atom.xml과 같은 내용)
+  static/                           CSS 등 (저장소의 static/ 복사)
+
+- 증분: 페이지마다 입력(기사 데이터 + 템플릿 + 설정)의 해시를 .manifest.json에 기록해 두고, 바뀐 페이지만 다시 렌더링
+- 사라진 기사·페이지의 파일은 지움
+- 파일마다 .gz (brotli 패키지가 있으면 .br도) 압축본을 같이 씀 (nginx gzip_static / brotli_static용)
+- 파일은 임시 파일에 쓴 뒤 교체하고, 상세 → 목록 → 피드 순으로 써서 목록이 없는 페이지를 가리키지 않게 함
+검색(/search)은 정적으로 만들 수 없으므로 웹 앱으로 프록시해야 합니다.
+
+STATIC_SITE_DIR가 설정돼 있으면 run_with_summary.py가 요약을 저장한 뒤 자동으로 실행합니다.
+
+사용법:
+  python static_site.py --out public
+  python static_site.py --out public --force   # 해시와 상관없이 전부 다시 렌더링
+"""
+import argparse
+import gzip
+import hashlib
+import json
+import os
+import sys
+from dataclasses import asdict
+from pathlib import Path
+from urllib.parse import urlsplit
+
+from article_store import ArticleDBSource, ArticleStore
+from config import FEED_MAX_ENTRIES, INDEX_PER_PAGE, OUTPUT_DIR, SITE_URL, STATIC_SITE_DIR
+from feed_writer import entries_from_listing, render_atom, render_json_feed, render_rss
+
+ROOT = Path(__file__).resolve().parent
+STATIC_MANIFEST = ".manifest.json"
+# 출력 형식(경로 구조 등)을 바꾸면 올려서 전체를 다시 렌더링하게 함
+EXPORT_VERSION = "1"
+COMPRESS_SUFFIXES = (".html", ".xml", ".json", ".css", ".js", ".svg", ".txt")
+
+
+def _brotli():
+    try:
+        import brotli
+    except ImportError:
+        try:
+            import brotlicffi as brotli
+        except ImportError:
+            return None
+    return brotli
+
+
+def _digest(*parts) -> str:
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(part if isinstance(part, bytes) else json.dumps(part, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+class _Site:
+    """정적 경로 규칙과 템플릿 렌더러."""
+
+    def __init__(self, site_url: str):
+        from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+        self.site_url = site_url
+        self.base = urlsplit(site_url).path.rstrip("/") if site_url else ""
+        self.env = Environment(
+            loader=FileSystemLoader(str(ROOT / "templates")),
+            autoescape=select_autoescape(["html", "xml"]),
+        )
+        self.env.globals["url_for"] = self.url_for
+        self.template_hash = _digest(*(
+            (ROOT / "templates" / name).read_bytes() for name in ("index.html", "article.html")
+        ))
+
+    def url_for(self, endpoint: str, **values) -> str:
+        """템플릿의 url_for를 정적 경로로 바꿉니다 (Flask 라우트와 같은 이름)."""
+        if endpoint == "static":
+            return f"{self.base}/static/{values['filename']}"
+        if endpoint == "index":
+            page = values.get("page") or 1
+            return f"{self.base}/" if page <= 1 else f"{self.base}/page/{page}/"
+        if endpoint == "article_detail":
+            return f"{self.base}/articles/{values['uid']}/"
+        if endpoint == "search":
+            return f"{self.base}/search"
+        if endpoint == "rss_feed":
+            return f"{self.base}/feed.xml"
+        if endpoint == "atom_feed":
+            return f"{self.base}/atom.xml"
+        raise ValueError(f"정적 사이트에 없는 경로: {endpoint}")
+
+    def absolute(self, path: str) -> str:
+        """사이트 주소가 있으면 절대 URL, 없으면 빈 문자열."""
+        if not self.site_url:
+            return ""
+        parts = urlsplit(self.site_url)
+        return f"{parts.scheme}://{parts.netloc}{path}"
+
+    def render(self, template: str, **context) -> bytes:
+        return self.env.get_template(template).render(**context).encode("utf-8")
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+def _write_file(site_dir: Path, rel: str, body: bytes) -> None:
+    """파일과 압축본(.gz, 가능하면 .br)을 씁니다."""
+    path = site_dir / rel
+    _write_atomic(path, body)
+    if path.suffix in COMPRESS_SUFFIXES:
+        # mtime=0: 내용이 같으면 .gz도 바이트 단위로 같게 (CDN 캐시·rsync에 유리)
+        _write_atomic(path.with_name(path.name + ".gz"), gzip.compress(body, compresslevel=9, mtime=0))
+        brotli = _brotli()
+        if brotli is not None:
+            _write_atomic(path.with_name(path.name + ".br"), brotli.compress(body))
+
+
+def _remove_file(site_dir: Path, rel: str) -> None:
+    path = site_dir / rel
+    for p in (path, path.with_name(path.name + ".gz"), path.with_name(path.name + ".br")):
+        p.unlink(missing_ok=True)
+    # 비게 된 디렉터리 정리 (articles/<uid>/ 등)
+    parent = path.parent
+    while parent != site_dir:
+        try:
+            parent.rmdir()
+        except OSError:
+            break
+        parent = parent.parent
+
+
+def _load_manifest(site_dir: Path) -> dict:
+    try:
+        return json.loads((site_dir / STATIC_MANIFEST).read_text(encoding="utf-8")).get("files", {})
+    except (OSError, ValueError):
+        return {}
+
+
+def export_site(
+    site_dir: str | Path = STATIC_SITE_DIR,
+    output_dir: str | Path = OUTPUT_DIR,
+    per_page: int = INDEX_PER_PAGE,
+    site_url: str = SITE_URL,
+    force: bool = False,
+) -> dict:
+    """
+    기사 저장소를 site_dir에 정적 사이트로 내보냅니다.
+    반환: {"rendered", "skipped", "removed", "articles", "pages"}
+    """
+    if not site_dir:
+        raise ValueError("내보낼 디렉터리가 없습니다 (STATIC_SITE_DIR 또는 --out)")
+    site_dir = Path(site_dir)
+    site_dir.mkdir(parents=True, exist_ok=True)
+    snap = ArticleStore(ArticleDBSource(Path(output_dir))).snapshot()
+    site = _Site(site_url)
+    common = _digest(EXPORT_VERSION, site_url, per_page, FEED_MAX_ENTRIES, site.template_hash)
+
+    # (경로, 입력 해시, 렌더 함수) - 쓰는 순서대로
+    jobs = []
+    static_dir = ROOT / "static"
+    for path in sorted(p for p in static_dir.rglob("*") if p.is_file()):
+        body = path.read_bytes()
+        jobs.append((f"static/{path.relative_to(static_dir).as_posix()}", _digest(body), lambda body=body: body))
+    for article in snap.articles:
+        record = dict(article)
+        jobs.append((
+            f"articles/{record['uid']}/index.html",
+            _digest(common, record),
+            lambda record=record: site.render("article.html", article=record, uid=record["uid"]),
+        ))
+    first = snap.page(1, per_page)
+    for n in range(1, first.pages + 1):
+        page = snap.page(n, per_page)
+        rel = "index.html" if n == 1 else f"page/{n}/index.html"
+        jobs.append((
+            rel,
+            _digest(common, n, page.pages, [dict(item) for item in page.items]),
+            lambda page=page: site.render("index.html", articles=page.items, page=page, default_per_page=per_page),
+        ))
+    entries = entries_from_listing(
+        snap.listing, FEED_MAX_ENTRIES,
+        article_url=(lambda uid: site.absolute(site.url_for("article_detail", uid=uid))) if site_url else None,
+    )
+    feed_hash = _digest(common, [asdict(e) for e in entries])
+    home = site.absolute(site.url_for("index"))
+    jobs.append((
+        "feed.xml", feed_hash,
+        lambda: render_rss(entries, home, site.absolute(f"{site.base}/feed.xml"), snap.last_modified),
+    ))
+    jobs.append((
+        "atom.xml", feed_hash,
+        lambda: render_atom(entries, home, site.absolute(f"{site.base}/atom.xml"), snap.last_modified),
+    ))
+    jobs.append(("feed.json", feed_hash, lambda: render_json_feed(entries, home, site.absolute(f"{site.base}/feed.json"))))
+
+    previous = _load_manifest(site_dir)
+    old = {} if force else previous
+    files = {}
+    stats = {"rendered": 0, "skipped": 0, "removed": 0, "articles": len(snap.articles), "pages": first.pages}
+    for rel, digest, render in jobs:
+        files[rel] = digest
+        if old.get(rel) == digest and (site_dir / rel).exists():
+            stats["skipped"] += 1
+            continue
+        _write_file(site_dir, rel, render())
+        stats["rendered"] += 1
+    for rel in previous:
+        if rel not in files:
+            _remove_file(site_dir, rel)
+            stats["removed"] += 1
+    manifest = {"version": snap.version, "files": files}
+    _write_atomic(site_dir / STATIC_MANIFEST, json.dumps(manifest, ensure_ascii=False, indent=0).encode("utf-8"))
+    return stats
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", default=STATIC_SITE_DIR, help="내보낼 디렉터리 (기본: STATIC_SITE_DIR)")
+    parser.add_argument("--force", action="store_true", help="바뀌지 않은 페이지도 다시 렌더링")
+    args = parser.parse_args(argv)
+    if not args.out:
+        parser.error("--out 또는 STATIC_SITE_DIR 환경 변수로 디렉터리를 지정하세요.")
+    stats = export_site(args.out, force=args.force)
+    print(
+        f"정적 사이트: 기사 {stats['articles']}개, 목록 {stats['pages']}페이지 → {args.out} "
+        f"(렌더링 {stats['rendered']}, 그대로 {stats['skipped']}, 삭제 {stats['removed']})"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
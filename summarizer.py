@@ -7,20 +7,51 @@ import re
 import time
 from pathlib import Path
 
-from google import genai
-
-from config import GEMINI_API_KEY, GEMINI_MODEL, OUTPUT_DIR, SUMMARIZED_JSON
+import metrics
+from article_db import get_article_db
+from config import (
+    EXPORT_SUMMARIZED_JSON,
+    GEMINI_API_KEY,
+    GEMINI_MODEL,
+    OUTPUT_DIR,
+    SUMMARIZED_JSON,
+    SUMMARY_BATCH_SIZE,
+    SUMMARY_BATCH_TOKEN_BUDGET,
+    SUMMARY_EXECUTOR_MODE,
+)
+from html_text import summary_text
+from model_router import CircuitOpenError, get_router
+from prompt_builder import estimate_tokens, select_content, token_budget, usage
+from search_index import get_search_index
+from summary_cache import cache_key, get_summary_cache
+from summary_executor import RateLimitedClient, SummaryExecutor, TaskResult, TokenBucket, is_rate_limit_error
 
 _client = None
 
+_ATTEMPTS = metrics.counter(
+    "summary_attempts_total", "모델 호출 수 (outcome: ok, empty, rate_limited, error)", ("kind", "model", "outcome"),
+)
+_ATTEMPT_SECONDS = metrics.histogram("summary_attempt_duration_seconds", "모델 호출 한 번의 시간(초)", ("kind", "model", "outcome"))
+_SUMMARIES = metrics.counter("summaries_total", "요약에 성공한 기사 수 (요약을 만든 모델 기준)", ("kind", "model"))
+_SUMMARY_CACHE_HITS = metrics.counter("summary_cache_hits_total", "요약 캐시로 API 호출을 건너뛴 기사 수", ("kind",))
+_INPUT_TOKENS = metrics.counter("summary_input_tokens_total", "모델에 보낸 입력 토큰 수 (추정치)", ("kind", "model"))
+_SUMMARY_FAILURES = metrics.counter("summary_failures_total", "모든 모델에서 요약에 실패한 호출 수", ("kind",))
+_SAVE_SECONDS = metrics.histogram("save_summarized_duration_seconds", "save_summarized() 시간(초, 검색 색인 갱신 포함)")
+_ARTICLES_WRITTEN = metrics.counter("articles_written_total", "기사 저장소에 새로 쓰거나 고친 행 수")
+_ARTICLES_DELETED = metrics.counter("articles_deleted_total", "기사 저장소에서 지운 행 수")
+
+
+def _record_attempt(kind: str, model: str, started: float, outcome: str) -> None:
+    elapsed = time.perf_counter() - started
+    _ATTEMPTS.inc(kind=kind, model=model, outcome=outcome)
+    _ATTEMPT_SECONDS.observe(elapsed, kind=kind, model=model, outcome=outcome)
+    router = get_router()
+    if router is not None:
+        router.record(model, outcome == "ok", elapsed)
+
 
-def _strip_html(text: str) -> str:
-    """HTML 태그를 제거하고 공백을 정리합니다."""
-    if not text:
-        return ""
-    text = re.sub(r"<[^>]+>", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
-    return text
+def _error_outcome(exc: BaseException) -> str:
+    return "rate_limited" if is_rate_limit_error(exc) else "error"
 
 
 def _get_client():
@@ -33,122 +64,355 @@ def _get_client():
             "발급: https://aistudio.google.com/apikey"
         )
     if _client is None:
+        # SDK는 실제로 요약할 때만 불러옴 (import만으로 수백 ms가 걸림)
+        from google import genai
         _client = genai.Client(api_key=GEMINI_API_KEY)
     return _client
 
 
-def summarize_article(article: dict, model_name: str = GEMINI_MODEL) -> str:
-    """
-    기사 하나를 Gemini로 한국어 요약합니다.
-    article: title, link, summary 등이 있는 딕셔너리
-    """
+def _article_content(article: dict, model: str = GEMINI_MODEL) -> tuple[str, str]:
+    """프롬프트에 넣을 (제목, 모델의 토큰 예산 안에서 고른 본문)."""
     title = article.get("title", "")
-    raw_summary = article.get("summary", "")
-    summary_clean = _strip_html(raw_summary)
+    # 원문을 가져왔으면 (article_fetcher) 그 본문을, 아니면 수집할 때 정리해 둔 RSS 평문을 씀
+    summary_clean = article.get("content_text") or summary_text(article)
     if not summary_clean:
         summary_clean = title
+    return title, select_content(title, summary_clean, token_budget(model))
 
-    prompt = f"""다음 TechCrunch AI 기사를 한국어로 2~4문장으로 간단히 요약해주세요. 핵심만 담고, 마크다운이나 제목 형식은 쓰지 말고 평문으로만 답하세요.
+
+def build_prompt(article: dict, model: str = GEMINI_MODEL) -> str:
+    """기사로 요약 프롬프트를 만듭니다 (캐시 키에도 이 문자열이 그대로 쓰임)."""
+    title, summary_clean = _article_content(article, model)
+
+    return f"""다음 TechCrunch AI 기사를 한국어로 2~4문장으로 간단히 요약해주세요. 핵심만 담고, 마크다운이나 제목 형식은 쓰지 말고 평문으로만 답하세요.
 
 제목: {title}
 
 내용:
-{summary_clean[:4000]}
+{summary_clean}
 """
 
+
+def _model_chain(model_name: str) -> list[str]:
+    """요청할 모델 순서 (지정 모델 → fallback 모델, 중복 제거)."""
     fallback_models = [
         model_name,
         "gemini-2.5-flash",
         "gemini-2.0-flash-exp",
         "gemini-2.0-flash",
     ]
-    seen = set()
+    return list(dict.fromkeys(m for m in fallback_models if m))
+
+
+def _route(models: list[str]) -> list[str]:
+    """
+    모델 상태에 따라 실제로 요청할 순서 (회로가 열린 모델은 건너뜀).
+    요청할 모델이 하나도 없으면 API를 부르지 않고 CircuitOpenError를 발생시킵니다.
+    """
+    router = get_router()
+    if router is None:
+        return models
+    routed = router.order(models)
+    if not routed:
+        raise CircuitOpenError("모든 모델의 회로가 열려 있습니다 (쿨다운이 끝난 뒤 다시 시도)")
+    return routed
+
+
+def _prompts_by_model(article: dict, models: list[str]) -> dict[str, str]:
+    """모델별 프롬프트. 토큰 예산이 같은 모델끼리는 한 번만 만듭니다."""
+    by_budget: dict[int, str] = {}
+    prompts = {}
+    for m in models:
+        budget = token_budget(m)
+        if budget not in by_budget:
+            by_budget[budget] = build_prompt(article, m)
+        prompts[m] = by_budget[budget]
+    return prompts
+
+
+def _record_input_tokens(kind: str, model: str, prompt: str, articles: list[dict]) -> None:
+    tokens = estimate_tokens(prompt)
+    _INPUT_TOKENS.inc(tokens, kind=kind, model=model)
+    usage.add(model, tokens, [a.get("link") for a in articles])
+
+
+def summarize_article(article: dict, model_name: str = GEMINI_MODEL, client=None, use_cache: bool = True) -> str:
+    """
+    기사 하나를 Gemini로 한국어 요약합니다.
+    article: title, link, summary 등이 있는 딕셔너리
+    client: genai.Client 호환 객체 (없으면 기본 클라이언트 사용)
+    use_cache: 요약 캐시를 먼저 확인하고, 성공한 요약을 캐시에 저장
+    """
+    models = _model_chain(model_name)
+    prompts = _prompts_by_model(article, models)
+
+    cache = get_summary_cache() if use_cache else None
+    if cache is not None:
+        cached = cache.get_first([cache_key(m, prompts[m]) for m in models])
+        if cached:
+            _SUMMARY_CACHE_HITS.inc(kind="single")
+            return cached
+
     last_error = None
-    client = _get_client()
-    for m in fallback_models:
-        if not m or m in seen:
-            continue
-        seen.add(m)
+    if client is None:
+        client = _get_client()
+    for m in _route(models):
+        prompt = prompts[m]
+        _record_input_tokens("single", m, prompt, [article])
+        started = time.perf_counter()
         try:
             response = client.models.generate_content(model=m, contents=prompt)
             text = getattr(response, "text", None) if response else None
             if text:
-                return str(text).strip()
+                _record_attempt("single", m, started, "ok")
+                _SUMMARIES.inc(kind="single", model=m)
+                text = str(text).strip()
+                if cache is not None:
+                    cache.put(cache_key(m, prompt), m, text)
+                return text
+            _record_attempt("single", m, started, "empty")
         except Exception as e:
+            _record_attempt("single", m, started, _error_outcome(e))
             last_error = e
             continue
+    _SUMMARY_FAILURES.inc(kind="single")
     raise last_error or RuntimeError("요약 실패")
 
 
+_BATCH_HEADER = """다음 TechCrunch AI 기사 {count}개를 각각 한국어로 2~4문장으로 간단히 요약해주세요. 핵심만 담고, 마크다운이나 제목 형식은 쓰지 말고 평문으로 쓰세요.
+답은 JSON 배열 하나로만 하세요. 각 원소는 {{"id": "기사 id", "summary_ko": "요약"}} 형식이고, 모든 기사를 한 번씩 포함해야 합니다.
+"""
+
+
+def _batch_block(article_id: str, article: dict, model: str = GEMINI_MODEL) -> str:
+    title, summary_clean = _article_content(article, model)
+    return f"""
+<article id="{article_id}">
+제목: {title}
+
+내용:
+{summary_clean}
+</article>
+"""
+
+
+def build_batch_prompt(articles: list[dict], model: str = GEMINI_MODEL) -> str:
+    """여러 기사를 한 프롬프트로 묶습니다. 기사 id는 "1"부터 순서대로 붙습니다."""
+    blocks = "".join(_batch_block(str(i), a, model) for i, a in enumerate(articles, 1))
+    return _BATCH_HEADER.format(count=len(articles)) + blocks
+
+
+def pack_batches(articles: list[dict], max_items: int, token_budget: int = SUMMARY_BATCH_TOKEN_BUDGET) -> list[list[dict]]:
+    """
+    기사를 순서대로 묶음으로 나눕니다.
+    묶음마다 기사 수는 max_items 이하, 추정 입력 토큰은 token_budget 이하 (기사 하나가 넘으면 혼자 한 묶음).
+    """
+    header_tokens = estimate_tokens(_BATCH_HEADER)
+    batches: list[list[dict]] = []
+    current: list[dict] = []
+    used = header_tokens
+    for article in articles:
+        tokens = estimate_tokens(_batch_block(str(len(current) + 1), article))
+        if current and (len(current) >= max_items or used + tokens > token_budget):
+            batches.append(current)
+            current, used = [], header_tokens
+        current.append(article)
+        used += tokens
+    if current:
+        batches.append(current)
+    return batches
+
+
+def parse_batch_response(text: str) -> dict[str, str]:
+    """묶음 응답에서 {기사 id: 요약}을 꺼냅니다. 형식이 잘못된 원소는 건너뜁니다."""
+    match = re.search(r"\[.*\]", text or "", re.S)
+    if not match:
+        return {}
+    try:
+        data = json.loads(match.group(0))
+    except ValueError:
+        return {}
+    if not isinstance(data, list):
+        return {}
+    summaries = {}
+    for item in data:
+        if not isinstance(item, dict):
+            continue
+        summary = item.get("summary_ko")
+        if isinstance(summary, str) and summary.strip():
+            summaries[str(item.get("id", ""))] = summary.strip()
+    return summaries
+
+
+def summarize_batch(articles: list[dict], model_name: str = GEMINI_MODEL, client=None, use_cache: bool = True) -> list[str | None]:
+    """
+    여러 기사를 한 번의 요청으로 요약합니다.
+    입력 순서대로 요약 목록을 반환하며, 응답에서 빠지거나 형식이 잘못된 기사는 None입니다.
+    성공한 요약은 기사 하나씩 요약할 때와 같은 캐시 키(모델별 build_prompt 기준)로 저장됩니다.
+    모든 모델 호출이 오류로 끝나면 마지막 오류를 다시 발생시킵니다.
+    """
+    models = _model_chain(model_name)
+    prompts = [_prompts_by_model(a, models) for a in articles]
+    results: list[str | None] = [None] * len(articles)
+
+    cache = get_summary_cache() if use_cache else None
+    if cache is not None:
+        for i, by_model in enumerate(prompts):
+            results[i] = cache.get_first([cache_key(m, by_model[m]) for m in models])
+            if results[i]:
+                _SUMMARY_CACHE_HITS.inc(kind="batch")
+    pending = [i for i, value in enumerate(results) if not value]
+    if not pending:
+        return results
+
+    last_error = None
+    if client is None:
+        client = _get_client()
+    for m in _route(models):
+        prompt = build_batch_prompt([articles[i] for i in pending], m)
+        _record_input_tokens("batch", m, prompt, [articles[i] for i in pending])
+        started = time.perf_counter()
+        try:
+            response = client.models.generate_content(
+                model=m, contents=prompt, config={"response_mime_type": "application/json"},
+            )
+        except Exception as e:
+            _record_attempt("batch", m, started, _error_outcome(e))
+            last_error = e
+            continue
+        summaries = parse_batch_response(getattr(response, "text", None) if response else None)
+        if not summaries:
+            # 응답 전체를 해석할 수 없으면 다음 모델로 (모두 실패하면 기사별로 다시 요약됨)
+            _record_attempt("batch", m, started, "empty")
+            continue
+        _record_attempt("batch", m, started, "ok")
+        for n, i in enumerate(pending, 1):
+            text = summaries.get(str(n))
+            if text:
+                results[i] = text
+                _SUMMARIES.inc(kind="batch", model=m)
+                if cache is not None:
+                    cache.put(cache_key(m, prompts[i][m]), m, text)
+        return results
+    _SUMMARY_FAILURES.inc(kind="batch")
+    if last_error is not None:
+        raise last_error
+    return results
+
+
+def _summarize_many(
+    articles: list[dict],
+    model_name: str,
+    client=None,
+    delay_seconds: float = 0.0,
+    requests_per_minute: float | None = None,
+    max_concurrency: int = 1,
+    mode: str = SUMMARY_EXECUTOR_MODE,
+    batch_size: int = SUMMARY_BATCH_SIZE,
+    on_success=None,
+):
+    """
+    SummaryExecutor로 여러 기사를 요약하고 입력 순서대로 TaskResult 목록을 반환합니다.
+    requests_per_minute가 없으면 delay_seconds로부터 분당 요청 수를 계산합니다 (예전 sleep 간격과 같은 속도).
+    batch_size가 2 이상이면 기사를 묶어 한 요청으로 요약하고, 묶음 응답에서 빠진 기사만 하나씩 다시 요약합니다.
+    on_success(article, summary): 요약이 하나 끝날 때마다 (전체가 끝나기 전에) 호출됩니다.
+    """
+    if client is None:
+        client = _get_client()
+    if requests_per_minute is None and delay_seconds:
+        requests_per_minute = 60.0 / delay_seconds
+    if requests_per_minute:
+        client = RateLimitedClient(client, TokenBucket(requests_per_minute))
+
+    def summarize_one(article):
+        summary = summarize_article(article, model_name=model_name, client=client)
+        if on_success is not None:
+            on_success(article, summary)
+        return summary
+
+    def summarize_group(batch):
+        summaries = summarize_batch(batch, model_name=model_name, client=client)
+        if on_success is not None:
+            for article, summary in zip(batch, summaries):
+                if summary:
+                    on_success(article, summary)
+        return summaries
+
+    executor = SummaryExecutor(summarize_one, max_concurrency=max_concurrency, mode=mode)
+    if batch_size <= 1 or len(articles) <= 1:
+        return executor.run(articles)
+
+    batch_executor = SummaryExecutor(summarize_group, max_concurrency=max_concurrency, mode=mode)
+    results: list[TaskResult | None] = []
+    retry = []
+    for br in batch_executor.run(pack_batches(articles, batch_size)):
+        values = br.value if br.error is None else [None] * len(br.item)
+        for article, value in zip(br.item, values):
+            if value:
+                results.append(TaskResult(item=article, value=value, attempts=br.attempts))
+            else:
+                results.append(None)
+                retry.append(article)
+    retried = iter(executor.run(retry))
+    return [r if r is not None else next(retried) for r in results]
+
+
+def _with_summary(article: dict, summary: str) -> dict:
+    """저장할 기사 (요약 추가, 원문 본문 content_text는 페이지 캐시에 있으므로 저장소에 넣지 않음)."""
+    stored = {k: v for k, v in article.items() if k != "content_text"}
+    stored["summary_ko"] = summary
+    return stored
+
+
 def summarize_articles(
     articles: list[dict],
     model_name: str = GEMINI_MODEL,
     delay_seconds: float = 2.0,
+    client=None,
+    requests_per_minute: float | None = None,
+    max_concurrency: int = 1,
+    mode: str = SUMMARY_EXECUTOR_MODE,
+    batch_size: int = SUMMARY_BATCH_SIZE,
 ) -> list[dict]:
     """
-    기사 목록을 순서대로 요약합니다.
+    기사 목록을 요약합니다 (결과는 입력 순서 유지).
     각 기사에 summary_ko 필드를 추가한 새 리스트를 반환합니다.
-    delay_seconds: API rate limit 방지용 대기 시간(초)
+    delay_seconds: API rate limit 방지용 요청 간격(초). requests_per_minute를 주면 그 값을 우선합니다.
+    max_concurrency / mode: 동시 실행 수와 실행 방식 ("thread" 또는 "asyncio")
+    batch_size: 한 요청에 묶어 요약할 최대 기사 수 (1이면 기사마다 요청)
     """
-    _get_client()
+    results = _summarize_many(
+        articles, model_name, client=client, delay_seconds=delay_seconds,
+        requests_per_minute=requests_per_minute, max_concurrency=max_concurrency, mode=mode,
+        batch_size=batch_size,
+    )
     result = []
-    for i, article in enumerate(articles):
-        try:
-            summary_ko = summarize_article(article, model_name=model_name)
-            result.append({**article, "summary_ko": summary_ko})
-        except Exception as e:
-            result.append({**article, "summary_ko": f"[요약 실패: {e}]"})
-        if delay_seconds and i < len(articles) - 1:
-            time.sleep(delay_seconds)
+    for r in results:
+        if r.error is None:
+            result.append(_with_summary(r.item, r.value))
+        else:
+            result.append(_with_summary(r.item, f"[요약 실패: {r.error}]"))
     return result
 
 
-def _is_failed_summary(summary_ko: str) -> bool:
-    """요약 실패 메시지인지 확인합니다."""
-    if not summary_ko or not isinstance(summary_ko, str):
-        return True
-    return summary_ko.strip().startswith("[요약 실패:")
-
-
 def remove_failed_articles_from_file(
     output_dir: str = OUTPUT_DIR,
     filename: str = SUMMARIZED_JSON,
 ) -> int:
-    """기존 요약 파일에서 요약 실패한 기사를 제거하고 파일을 다시 저장합니다. 제거한 개수를 반환합니다."""
-    from datetime import datetime
-
-    from config import TECHCRUNCH_AI_FEED_URL
-
-    filepath = Path(output_dir) / filename
-    if not filepath.exists():
-        return 0
-    with open(filepath, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    articles = data.get("articles", [])
-    ok = [a for a in articles if not _is_failed_summary(a.get("summary_ko", ""))]
-    removed = len(articles) - len(ok)
-    if removed == 0:
-        return 0
-    data["articles"] = ok
-    data["count"] = len(ok)
-    data["fetched_at"] = datetime.utcnow().isoformat() + "Z"
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    return removed
+    """기사 저장소에서 요약 실패한 기사를 제거합니다. 제거한 개수를 반환합니다."""
+    removed = get_article_db(output_dir, filename).remove_failed()
+    if removed:
+        get_search_index(output_dir).update(removed=removed)
+    return len(removed)
 
 
 def load_existing_summarized(
     output_dir: str = OUTPUT_DIR,
     filename: str = SUMMARIZED_JSON,
 ) -> list[dict]:
-    """기존 요약 파일이 있으면 기사 목록을 반환하고, 없으면 빈 리스트를 반환합니다."""
-    filepath = Path(output_dir) / filename
-    if not filepath.exists():
-        return []
+    """기사 저장소의 기사 목록을 반환합니다 (처음이면 기존 summarized_articles.json을 가져옴)."""
     try:
-        with open(filepath, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            return data.get("articles", [])
+        return get_article_db(output_dir, filename).load_all()
     except Exception:
         return []
 
@@ -158,12 +422,21 @@ def merge_and_summarize(
     existing_articles: list[dict],
     model_name: str = GEMINI_MODEL,
     delay_seconds: float = 2.0,
+    client=None,
+    requests_per_minute: float | None = None,
+    max_concurrency: int = 1,
+    mode: str = SUMMARY_EXECUTOR_MODE,
+    batch_size: int = SUMMARY_BATCH_SIZE,
+    checkpoint=None,
 ) -> tuple[list[dict], list[dict]]:
     """
     기존 요약은 유지하고, RSS에서 새로 나타난 기사만 요약해 병합합니다.
     요약에 실패한 기사는 목록에 넣지 않습니다.
     - fresh_articles: 방금 수집한 RSS 기사 목록 (최신 순)
     - existing_articles: 기존에 요약해 둔 기사 목록
+    - requests_per_minute / max_concurrency / mode / batch_size: 요약 실행기 설정 (summarize_articles 참고)
+    - checkpoint: SummaryCheckpoint. 이미 기록된 요약은 다시 요청하지 않고, 새 요약은 끝나는 즉시 기록
+    새로 요약한 기사에는 보낸 입력 토큰(추정, 묶음 요청이면 기사 수로 나눈 몫)을 input_tokens로 남깁니다.
     반환: (저장할 기사 목록, 요약 실패한 기사 목록 [{title, link, error}, ...])
     """
     existing_by_link = {a.get("link"): a for a in existing_articles if a.get("link")}
@@ -173,20 +446,34 @@ def merge_and_summarize(
     summarized_new_by_link = {}
     failed_list = []
 
+    if checkpoint is not None and new_articles:
+        done = checkpoint.summaries()
+        for a in new_articles:
+            if a.get("link") in done:
+                summarized_new_by_link[a["link"]] = _with_summary(a, done[a["link"]])
+        new_articles = [a for a in new_articles if a.get("link") not in summarized_new_by_link]
+
     if new_articles:
-        _get_client()
-        for i, article in enumerate(new_articles):
-            try:
-                summary_ko = summarize_article(article, model_name=model_name)
-                summarized_new_by_link[article["link"]] = {**article, "summary_ko": summary_ko}
-            except Exception as e:
+        tokens_before = {a["link"]: usage.article(a["link"]) for a in new_articles}
+        results = _summarize_many(
+            new_articles, model_name, client=client, delay_seconds=delay_seconds,
+            requests_per_minute=requests_per_minute, max_concurrency=max_concurrency, mode=mode,
+            batch_size=batch_size, on_success=checkpoint.record if checkpoint is not None else None,
+        )
+        for r in results:
+            article = r.item
+            if r.error is None:
+                stored = _with_summary(article, r.value)
+                tokens = usage.article(article["link"]) - tokens_before[article["link"]]
+                if tokens > 0:  # 요약 캐시 적중이면 요청을 보내지 않았음
+                    stored["input_tokens"] = tokens
+                summarized_new_by_link[article["link"]] = stored
+            else:
                 failed_list.append({
                     "title": article.get("title", ""),
                     "link": article.get("link", ""),
-                    "error": str(e),
+                    "error": str(r.error),
                 })
-            if delay_seconds and i < len(new_articles) - 1:
-                time.sleep(delay_seconds)
 
     merged = []
     for a in fresh_articles:
@@ -208,21 +495,28 @@ def save_summarized(
     articles_with_summary: list[dict],
     output_dir: str = OUTPUT_DIR,
     filename: str = SUMMARIZED_JSON,
+    changed_links=None,
 ) -> Path:
-    """요약이 포함된 기사 목록을 JSON으로 저장합니다."""
-    from datetime import datetime
-
-    from config import TECHCRUNCH_AI_FEED_URL
-
-    path = Path(output_dir)
-    path.mkdir(parents=True, exist_ok=True)
-    filepath = path / filename
-    data = {
-        "fetched_at": datetime.utcnow().isoformat() + "Z",
-        "source": TECHCRUNCH_AI_FEED_URL,
-        "count": len(articles_with_summary),
-        "articles": articles_with_summary,
-    }
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-    return filepath
+    """
+    요약이 포함된 기사 목록을 기사 저장소(SQLite)에 저장합니다.
+    새 기사와 바뀐 기사만 기록하고 검색 색인에도 그 기사만 반영합니다.
+    changed_links를 주면 그 기사만 내용을 비교합니다 (ArticleDB.save 참고).
+    EXPORT_SUMMARIZED_JSON(기본값 켜짐)이면 예전 형식 JSON도 내보냅니다 (바뀐 게 없고 파일이 있으면 건너뜀).
+    """
+    with _SAVE_SECONDS.time():
+        db = get_article_db(output_dir, filename)
+        result = db.save(articles_with_summary, changed_links=changed_links)
+        index = get_search_index(output_dir)
+        if index.count() == 0 and db.count() > 0:
+            # 색인이 아직 없으면 (처음 실행 / 업그레이드 직후) 전체를 한 번 만듦
+            index.rebuild(db.iter_articles())
+        else:
+            index.update(changed=result.changed, removed=result.deleted_articles)
+    _ARTICLES_WRITTEN.inc(result.written)
+    _ARTICLES_DELETED.inc(result.deleted)
+    if EXPORT_SUMMARIZED_JSON:
+        json_path = Path(output_dir) / filename
+        if result.written or result.deleted or not json_path.exists():
+            db.export_json(json_path)
+        return json_path
+    return db.path
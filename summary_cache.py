@@ -0,0 +1,172 @@
+"""
+요약 결과 캐시 (SQLite).
+키는 "모델 이름 + summarize_article이 만든 프롬프트 전체"의 SHA-256 해시이므로,
+URL이 바뀌어 다시 올라온 기사라도 제목·본문이 같으면 Gemini를 다시 호출하지 않습니다.
+
+- 오래된 항목(max_age_days)과 개수·용량 초과분(max_entries, max_bytes; 가장 오래 사용하지 않은 것부터)은 evict()로 정리
+- stats()로 항목 수, 용량, 적중/실패 횟수 확인
+"""
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from config import (
+    OUTPUT_DIR,
+    SUMMARY_CACHE_ENABLED,
+    SUMMARY_CACHE_MAX_AGE_DAYS,
+    SUMMARY_CACHE_MAX_BYTES,
+    SUMMARY_CACHE_MAX_ENTRIES,
+)
+
+SUMMARY_CACHE_DB = "summary_cache.sqlite3"
+
+
+def cache_key(model: str, prompt: str) -> str:
+    """모델 이름과 프롬프트로 캐시 키를 만듭니다."""
+    h = hashlib.sha256()
+    h.update(model.encode("utf-8"))
+    h.update(b"\0")
+    h.update(prompt.encode("utf-8"))
+    return h.hexdigest()
+
+
+class SummaryCache:
+    def __init__(
+        self,
+        path: str | Path,
+        max_entries: int = SUMMARY_CACHE_MAX_ENTRIES,
+        max_age_days: float = SUMMARY_CACHE_MAX_AGE_DAYS,
+        max_bytes: int = SUMMARY_CACHE_MAX_BYTES,
+    ):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entries = max_entries
+        self.max_age_days = max_age_days
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """CREATE TABLE IF NOT EXISTS summaries (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                summary TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used REAL NOT NULL,
+                size INTEGER NOT NULL
+            )"""
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_summaries_last_used ON summaries(last_used)")
+        self._conn.commit()
+
+    def get(self, key: str) -> str | None:
+        """캐시된 요약을 반환합니다. 없거나 만료됐으면 None."""
+        return self.get_first([key])
+
+    def get_first(self, keys: list[str]) -> str | None:
+        """여러 키 중 캐시에 있는 첫 번째 키(목록 순서 기준)의 요약을 반환합니다."""
+        if not keys:
+            return None
+        now = time.time()
+        min_created = now - self.max_age_days * 86400 if self.max_age_days else 0
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = dict(self._conn.execute(
+                f"SELECT key, summary FROM summaries WHERE key IN ({placeholders}) AND created_at >= ?",
+                (*keys, min_created),
+            ).fetchall())
+            for key in keys:
+                if key in rows:
+                    self._conn.execute("UPDATE summaries SET last_used = ? WHERE key = ?", (now, key))
+                    self._conn.commit()
+                    self.hits += 1
+                    return rows[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, model: str, summary: str) -> None:
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, model, summary, created_at, last_used, size) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, model, summary, now, now, len(summary.encode("utf-8"))),
+            )
+            self._conn.commit()
+
+    def evict(self) -> int:
+        """만료된 항목과 max_entries를 넘는 항목을 지웁니다. 지운 개수를 반환합니다."""
+        removed = 0
+        with self._lock:
+            if self.max_age_days:
+                cutoff = time.time() - self.max_age_days * 86400
+                removed += self._conn.execute("DELETE FROM summaries WHERE created_at < ?", (cutoff,)).rowcount
+            if self.max_entries:
+                (count,) = self._conn.execute("SELECT COUNT(*) FROM summaries").fetchone()
+                excess = count - self.max_entries
+                if excess > 0:
+                    removed += self._conn.execute(
+                        "DELETE FROM summaries WHERE key IN "
+                        "(SELECT key FROM summaries ORDER BY last_used ASC LIMIT ?)",
+                        (excess,),
+                    ).rowcount
+            if self.max_bytes:
+                (total,) = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM summaries").fetchone()
+                if total > self.max_bytes:
+                    # 최근에 쓴 것부터 누적해서 한도 안에 드는 것만 남김
+                    keep, cut_key = 0, None
+                    for key, size in self._conn.execute("SELECT key, size FROM summaries ORDER BY last_used DESC"):
+                        keep += size
+                        if keep > self.max_bytes:
+                            cut_key = key
+                            break
+                    if cut_key is not None:
+                        (cut_used,) = self._conn.execute(
+                            "SELECT last_used FROM summaries WHERE key = ?", (cut_key,)
+                        ).fetchone()
+                        removed += self._conn.execute(
+                            "DELETE FROM summaries WHERE last_used <= ?", (cut_used,)
+                        ).rowcount
+            self._conn.commit()
+        return removed
+
+    def stats(self) -> dict:
+        with self._lock:
+            count, size, oldest = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0), MIN(created_at) FROM summaries"
+            ).fetchone()
+            by_model = dict(self._conn.execute("SELECT model, COUNT(*) FROM summaries GROUP BY model").fetchall())
+        total = self.hits + self.misses
+        return {
+            "entries": count,
+            "bytes": size,
+            "oldest_created_at": oldest,
+            "by_model": by_model,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / total, 4) if total else 0.0,
+        }
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_summary_cache() -> SummaryCache | None:
+    """설정에서 켜져 있으면 output/summary_cache.sqlite3 캐시를 반환합니다 (프로세스당 하나)."""
+    global _cache
+    if not SUMMARY_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SummaryCache(Path(OUTPUT_DIR) / SUMMARY_CACHE_DB)
+    return _cache
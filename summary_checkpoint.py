@@ -0,0 +1,104 @@
+"""
+요약 실행 체크포인트 (output/summary_checkpoint.jsonl).
+요약이 하나 끝날 때마다 한 줄씩 덧붙이고 fsync하므로, 실행이 중간에 죽어도
+이미 받은 요약은 남아 있고 다음 실행에서 API를 다시 호출하지 않습니다.
+
+- 첫 줄: {"type": "run", "articles": [...]} 이번 실행에서 수집한 기사 목록 (--resume에서 그대로 다시 씀)
+- 이후: {"type": "summary", "link": ..., "summary_ko": ...}
+- 저장(save_summarized)까지 끝나면 clear()로 지웁니다.
+마지막 줄이 쓰다 만 상태로 남아 있으면 읽을 때 건너뛰고, 다음 기록은 새 줄에서 시작합니다.
+"""
+import json
+import os
+import threading
+from pathlib import Path
+
+from config import OUTPUT_DIR, SUMMARY_CHECKPOINT_JSONL
+
+
+def _fsync_dir(path: Path) -> None:
+    if os.name != "posix":
+        return
+    fd = os.open(str(path), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class SummaryCheckpoint:
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def _records(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        yield json.loads(line)
+                    except ValueError:
+                        continue
+        except FileNotFoundError:
+            return
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def run_articles(self) -> list[dict] | None:
+        """중단된 실행의 기사 목록 (없으면 None)."""
+        for record in self._records():
+            if record.get("type") == "run":
+                return record.get("articles", [])
+        return None
+
+    def summaries(self) -> dict[str, str]:
+        """체크포인트에 기록된 {link: summary_ko}."""
+        return {
+            r["link"]: r["summary_ko"]
+            for r in self._records()
+            if r.get("type") == "summary" and r.get("link") and r.get("summary_ko")
+        }
+
+    def start_run(self, articles: list[dict]) -> None:
+        """
+        새 실행을 시작합니다. 기사 목록을 첫 줄에 기록하고,
+        이전에 중단된 실행의 요약은 그대로 남겨 이번 실행에서도 재사용합니다.
+        """
+        previous = self.summaries()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with self._lock:
+            with open(tmp, "w", encoding="utf-8") as f:
+                f.write(json.dumps({"type": "run", "articles": articles}, ensure_ascii=False) + "\n")
+                for link, summary in previous.items():
+                    f.write(json.dumps({"type": "summary", "link": link, "summary_ko": summary}, ensure_ascii=False) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp, self.path)
+            _fsync_dir(self.path.parent)
+
+    def record(self, article: dict, summary: str) -> None:
+        """요약 하나를 덧붙이고 디스크에 내려 씁니다 (여러 스레드에서 호출해도 됨)."""
+        line = json.dumps({"type": "summary", "link": article.get("link"), "summary_ko": summary}, ensure_ascii=False)
+        with self._lock:
+            with open(self.path, "a+b") as f:
+                # 죽은 실행이 쓰다 만 줄 뒤에 바로 붙이면 이 줄까지 읽을 수 없게 되므로 줄을 바꿈
+                if f.tell() > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        f.write(b"\n")
+                f.write((line + "\n").encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+
+    def clear(self) -> None:
+        with self._lock:
+            try:
+                self.path.unlink()
+            except FileNotFoundError:
+                pass
+
+
+def get_checkpoint(output_dir: str = OUTPUT_DIR) -> SummaryCheckpoint:
+    return SummaryCheckpoint(Path(output_dir) / SUMMARY_CHECKPOINT_JSONL)
@@ -0,0 +1,191 @@
+"""
+요약 API 호출을 동시에 실행하는 실행기.
+- 토큰 버킷으로 분당 요청 수를 제한 (고정 sleep 대신)
+- 스레드 풀 또는 asyncio 모드로 최대 동시 실행 수 제한
+- 429 / 할당량 오류가 오면 전송 속도를 줄이고 지수 백오프 후 재시도
+결과는 항상 입력 순서대로 반환됩니다.
+"""
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable
+
+
+def is_rate_limit_error(exc: BaseException) -> bool:
+    """429 / 할당량 초과 오류인지 판단합니다."""
+    code = getattr(exc, "code", None) or getattr(exc, "status_code", None)
+    if code == 429:
+        return True
+    text = str(exc).lower()
+    return any(key in text for key in ("429", "resource_exhausted", "quota", "rate limit"))
+
+
+class TokenBucket:
+    """
+    분당 요청 수 기반 토큰 버킷.
+    throttle()이 호출되면 속도를 절반으로 줄이고 잠시 멈추며,
+    성공할 때마다 설정된 속도까지 조금씩 되돌립니다 (AIMD).
+    """
+
+    def __init__(self, requests_per_minute: float, burst: int | None = None, min_rpm: float = 1.0):
+        self.max_rate = requests_per_minute / 60.0
+        self.rate = self.max_rate
+        self.min_rate = min(min_rpm, requests_per_minute) / 60.0
+        # burst가 크면 1분 창 안에서 분당 한도를 넘을 수 있으므로 기본값은 1
+        self.capacity = float(max(1, burst or 1))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def acquire(self) -> float:
+        """토큰 하나를 얻을 때까지 기다립니다. 기다린 시간(초)을 반환합니다."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if now < self.paused_until:
+                    wait = self.paused_until - now
+                elif self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return waited
+                else:
+                    wait = (1.0 - self.tokens) / self.rate
+            time.sleep(wait)
+            waited += wait
+
+    def throttle(self, pause_seconds: float) -> None:
+        """rate limit 응답을 받았을 때 호출: 속도를 낮추고 잠시 전송을 멈춥니다."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = min(self.tokens, 0.0)
+            self.paused_until = max(self.paused_until, now + pause_seconds)
+
+    def success(self) -> None:
+        """요청이 성공하면 속도를 조금씩 원래대로 되돌립니다."""
+        with self._lock:
+            if self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+
+class _RateLimitedModels:
+    def __init__(self, models, bucket: TokenBucket, pause_seconds: float):
+        self._models = models
+        self._bucket = bucket
+        self._pause_seconds = pause_seconds
+
+    def generate_content(self, *args, **kwargs):
+        self._bucket.acquire()
+        try:
+            response = self._models.generate_content(*args, **kwargs)
+        except Exception as e:
+            if is_rate_limit_error(e):
+                self._bucket.throttle(self._pause_seconds)
+            raise
+        self._bucket.success()
+        return response
+
+    def __getattr__(self, name):
+        return getattr(self._models, name)
+
+
+class RateLimitedClient:
+    """
+    genai.Client를 감싸서 models.generate_content 호출마다 토큰 버킷을 거치게 합니다.
+    fallback 모델로 넘어가는 호출도 각각 한 번의 요청으로 계산됩니다.
+    """
+
+    def __init__(self, client, bucket: TokenBucket, pause_seconds: float = 5.0):
+        self._client = client
+        self.models = _RateLimitedModels(client.models, bucket, pause_seconds)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+@dataclass
+class TaskResult:
+    """기사 하나의 요약 결과. 성공하면 value, 실패하면 error가 채워집니다."""
+    item: Any
+    value: Any = None
+    error: BaseException | None = None
+    attempts: int = 0
+
+
+class SummaryExecutor:
+    """
+    fn(item)을 여러 항목에 대해 동시에 실행합니다.
+    - mode: "thread" (ThreadPoolExecutor) 또는 "asyncio" (asyncio.to_thread)
+    - max_concurrency: 동시에 실행할 최대 작업 수
+    - max_retries: rate limit 오류일 때 항목당 추가 재시도 횟수
+    rate limit 이외의 오류는 재시도하지 않고 바로 실패로 기록합니다.
+    """
+
+    def __init__(
+        self,
+        fn: Callable[[Any], Any],
+        max_concurrency: int = 1,
+        mode: str = "thread",
+        max_retries: int = 3,
+        backoff_base: float = 5.0,
+        backoff_max: float = 60.0,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if mode not in ("thread", "asyncio"):
+            raise ValueError(f"알 수 없는 실행 모드: {mode}")
+        self.fn = fn
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.mode = mode
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._sleep = sleep
+
+    def _backoff(self, attempt: int) -> float:
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (attempt - 1)))
+        return delay * random.uniform(0.8, 1.2)
+
+    def _run_one(self, item) -> TaskResult:
+        result = TaskResult(item=item)
+        while True:
+            result.attempts += 1
+            try:
+                result.value = self.fn(item)
+                result.error = None
+                return result
+            except Exception as e:
+                result.error = e
+                if not is_rate_limit_error(e) or result.attempts > self.max_retries:
+                    return result
+                self._sleep(self._backoff(result.attempts))
+
+    def run(self, items: list) -> list[TaskResult]:
+        """모든 항목을 실행하고 입력 순서대로 결과를 반환합니다."""
+        items = list(items)
+        if not items:
+            return []
+        if self.max_concurrency == 1:
+            return [self._run_one(item) for item in items]
+        if self.mode == "asyncio":
+            return asyncio.run(self._run_async(items))
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(items))) as pool:
+            return list(pool.map(self._run_one, items))
+
+    async def _run_async(self, items: list) -> list[TaskResult]:
+        sem = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(item):
+            async with sem:
+                return await asyncio.to_thread(self._run_one, item)
+
+        return list(await asyncio.gather(*(run(item) for item in items)))
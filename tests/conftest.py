@@ -0,0 +1,41 @@
+"""
+테스트 공통 설정.
+프로젝트 모듈을 불러오기 전에 캐시·지표·모델 라우터를 끄고 (config가 import 시점에 환경 변수를 읽음),
+테스트마다 임시 디렉터리로 옮겨 output/이 저장소를 건드리지 않게 합니다.
+"""
+import os
+import sys
+from pathlib import Path
+
+os.environ.setdefault("SUMMARY_CACHE_ENABLED", "false")
+os.environ.setdefault("METRICS_ENABLED", "false")
+os.environ.setdefault("MODEL_ROUTER_ENABLED", "false")
+os.environ.setdefault("HTTP_MAX_RETRIES", "0")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pytest  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def _in_tmp_dir(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.fixture
+def web(tmp_path, monkeypatch):
+    """
+    웹 앱 테스트 클라이언트. 프로젝트 루트 output/ 대신 tmp_path/output의 기사 DB·검색 색인을 보고,
+    렌더 캐시도 테스트마다 새로 씁니다. 기사는 summarizer.save_summarized(...)로 넣으면 됩니다 (작업 디렉터리가 tmp_path).
+    """
+    import app
+    import article_store
+    from search_index import get_search_index
+    from view_cache import RenderCache
+
+    output = tmp_path / "output"
+    monkeypatch.setattr(article_store, "_default_store", article_store.ArticleStore(article_store.ArticleDBSource(output)))
+    monkeypatch.setattr(app, "get_search_index", lambda _root: get_search_index(output))
+    monkeypatch.setattr(app, "_render_cache", RenderCache(app.RENDER_CACHE_MAX_BYTES))
+    monkeypatch.setattr(app, "_api_cache", RenderCache(app.API_RESULT_CACHE_MAX_BYTES))
+    return app.app.test_client()
@@ -0,0 +1,143 @@
+"""기사 저장소 (SQLite) - 저장 순서·증분 저장, 뒤에 덧붙이기, 실패 기사 제거, JSON 가져오기·내보내기."""
+import json
+import threading
+
+import pytest
+
+from article_db import ArticleDB
+
+
+def _article(i: int, summary_ko: str | None = None) -> dict:
+    return {
+        "title": f"Article {i}",
+        "link": f"https://example.com/{i}",
+        "summary": f"summary {i}",
+        "summary_ko": summary_ko if summary_ko is not None else f"요약 {i}",
+    }
+
+
+@pytest.fixture
+def db(tmp_path):
+    return ArticleDB(tmp_path / "articles.sqlite3")
+
+
+def _links(articles) -> list[int]:
+    return [int(a["link"].rsplit("/", 1)[1]) for a in articles]
+
+
+def test_save_round_trip_keeps_order_and_is_idempotent(db):
+    articles = [_article(i) for i in (5, 4, 3, 2, 1)]
+    result = db.save(articles)
+    assert result.written == 5 and len(result.changed) == 5 and result.version == 1
+    assert db.load_all() == articles
+
+    again = db.save(articles)
+    assert (again.written, again.deleted, again.changed, again.version) == (0, 0, [], 1)
+
+
+def test_save_writes_only_new_moved_and_changed_rows(db):
+    db.save([_article(i) for i in (3, 2, 1)])
+
+    # 새 기사 하나 + 기존 기사는 그대로: 새 기사만 씀
+    result = db.save([_article(i) for i in (4, 3, 2, 1)], changed_links=["https://example.com/4"])
+    assert result.written == 1 and _links(result.changed) == [4]
+    assert _links(db.load_all()) == [4, 3, 2, 1]
+
+    # 순서만 바뀐 기사는 내용을 비교하지 않고 seq만 옮김
+    result = db.save([_article(i) for i in (1, 4, 3, 2)], changed_links=[])
+    assert result.written == 1 and result.changed == []
+    assert _links(db.load_all()) == [1, 4, 3, 2]
+
+    # changed_links에 있는 기사는 내용을 비교해 바뀌었으면 씀
+    edited = _article(3, "고친 요약")
+    result = db.save([_article(1), _article(4), edited, _article(2)], changed_links=[edited["link"]])
+    assert result.changed == [edited]
+    assert db.load_all()[2]["summary_ko"] == "고친 요약"
+
+    # 목록에서 빠진 기사는 지움
+    result = db.save([_article(1), _article(4)], changed_links=[])
+    assert result.deleted == 2 and sorted(_links(result.deleted_articles)) == [2, 3]
+    assert _links(db.load_all()) == [1, 4]
+
+
+def test_changed_links_skips_comparing_other_stored_rows(db):
+    db.save([_article(2), _article(1)])
+    # changed_links 밖의 저장된 기사는 그대로 있다고 봄 (호출하는 쪽이 바뀐 기사를 알려 줘야 함)
+    result = db.save([_article(2, "다른 요약"), _article(1)], changed_links=[])
+    assert result.written == 0
+    assert db.load_all()[0]["summary_ko"] == "요약 2"
+    # 주지 않으면 모든 기사를 비교
+    assert db.save([_article(2, "다른 요약"), _article(1)]).written == 1
+
+
+def test_append_older_adds_to_the_end_in_order(db):
+    db.save([_article(i) for i in (9, 8)])
+    result = db.append_older([_article(7), _article(8), _article(6)])
+    assert _links(result.changed) == [7, 6]
+    assert _links(db.load_all()) == [9, 8, 7, 6]
+    db.append_older([_article(5)])
+    assert _links(db.load_all()) == [9, 8, 7, 6, 5]
+    # 덧붙인 뒤에 새 기사를 저장해도 뒤쪽 순서는 유지
+    db.save([_article(10)] + db.load_all(), changed_links=["https://example.com/10"])
+    assert _links(db.load_all()) == [10, 9, 8, 7, 6, 5]
+
+
+def test_remove_failed(db):
+    db.save([_article(3), _article(2, "[요약 실패: 429]"), _article(1, "")])
+    version = db.version()
+    removed = db.remove_failed()
+    assert sorted(_links(removed)) == [1, 2]
+    assert _links(db.load_all()) == [3]
+    assert db.version() == version + 1
+    assert db.remove_failed() == [] and db.version() == version + 1
+
+
+def test_migrates_legacy_json_once(tmp_path):
+    legacy = tmp_path / "summarized_articles.json"
+    articles = [_article(i) for i in (3, 2, 1)] + [{"title": "no link"}]
+    legacy.write_text(json.dumps({"articles": articles}, ensure_ascii=False), encoding="utf-8")
+
+    db = ArticleDB(tmp_path / "articles.sqlite3", legacy_json=legacy)
+    assert db.load_all() == articles[:3]
+    assert db.version() == 1
+
+    # 내보낸 JSON이 바뀌어도 (또는 이후 기사를 지워도) 다시 가져오지 않음
+    legacy.write_text(json.dumps({"articles": [_article(9)]}), encoding="utf-8")
+    db.save([_article(3)])
+    reopened = ArticleDB(tmp_path / "articles.sqlite3", legacy_json=legacy)
+    assert _links(reopened.load_all()) == [3]
+    assert reopened.migrate_from_json(legacy) == 0
+
+
+def test_export_json_round_trip(tmp_path, db):
+    articles = [_article(i) for i in (3, 2, 1)]
+    db.save(articles)
+    path = db.export_json(tmp_path / "out" / "summarized_articles.json")
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data["count"] == 3 and data["articles"] == articles
+
+    empty = ArticleDB(tmp_path / "empty.sqlite3")
+    data = json.loads(empty.export_json(tmp_path / "empty.json").read_text(encoding="utf-8"))
+    assert data["count"] == 0 and data["articles"] == []
+
+    # 내보낸 파일을 새 DB로 가져오면 같은 목록
+    migrated = ArticleDB(tmp_path / "copy.sqlite3", legacy_json=path)
+    assert migrated.load_all() == articles
+
+
+def test_export_json_reads_count_and_rows_from_one_snapshot(tmp_path, db, monkeypatch):
+    db.save([_article(i) for i in (3, 2, 1)])
+    real_count = db.count
+
+    def count_then_concurrent_save():
+        n = real_count()
+        # count를 읽은 직후 다른 연결(스레드)이 기사를 더 저장
+        writer = threading.Thread(target=db.save, args=([_article(i) for i in (6, 5, 4, 3, 2, 1)],))
+        writer.start()
+        writer.join()
+        return n
+
+    monkeypatch.setattr(db, "count", count_then_concurrent_save)
+    data = json.loads(db.export_json(tmp_path / "out.json").read_text(encoding="utf-8"))
+    assert data["count"] == len(data["articles"]) == 3
+    assert len(db.load_all()) == 6
@@ -0,0 +1,133 @@
+"""article_fetcher.fetch_page: 로컬 http.server로 받기·캐시 적중·charset 처리를 확인합니다."""
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import article_fetcher
+from article_fetcher import PageCache, fetch_page
+
+KOREAN = "인공지능 스타트업이 새 모델을 공개했다"
+
+# 경로 → (Content-Type, 본문 bytes)
+PAGES = {
+    "/utf8-header": ("text/html; charset=utf-8", f"<html><body><p>{KOREAN}</p></body></html>".encode("utf-8")),
+    "/meta-utf8": (
+        "text/html",
+        f'<html><head><meta charset="utf-8"></head><body><p>{KOREAN}</p></body></html>'.encode("utf-8"),
+    ),
+    "/meta-euckr": (
+        "text/html",
+        (
+            '<html><head><meta http-equiv="Content-Type" content="text/html; charset=euc-kr"></head>'
+            f"<body><p>{KOREAN}</p></body></html>"
+        ).encode("euc-kr"),
+    ),
+    "/no-charset": ("text/html", f"<html><body><p>{KOREAN}</p></body></html>".encode("utf-8")),
+    "/article": (
+        "text/html; charset=utf-8",
+        (
+            "<html><body><nav>메뉴</nav><article>"
+            + "".join(f"<p>{KOREAN}. 회사는 이번 모델이 이전 버전보다 빠르고 정확하다고 설명했다 ({i}).</p>" for i in range(6))
+            + "</article></body></html>"
+        ).encode("utf-8"),
+    ),
+    "/big": ("text/html", b"<html><body>" + b"a" * 200_000 + b"</body></html>"),
+    "/image": ("image/png", b"\x89PNG"),
+}
+
+
+@pytest.fixture
+def server():
+    hits = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            hits[self.path] = hits.get(self.path, 0) + 1
+            if self.path not in PAGES:
+                self.send_error(404)
+                return
+            content_type, body = PAGES[self.path]
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    base = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield base, hits
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    c = PageCache(tmp_path / "page_cache")
+    yield c
+    c.close()
+
+
+def test_fetch_then_cache_hit(server, cache):
+    base, hits = server
+    html, source = fetch_page(f"{base}/utf8-header", cache)
+    assert source == "fetched"
+    assert KOREAN in html
+
+    again, source = fetch_page(f"{base}/utf8-header", cache)
+    assert source == "cached"
+    assert again == html
+    assert hits["/utf8-header"] == 1
+
+
+@pytest.mark.parametrize("path", ["/meta-utf8", "/meta-euckr", "/no-charset"])
+def test_charset_fallback_without_header_charset(server, cache, path):
+    # 헤더에 charset이 없으면 requests는 ISO-8859-1로 읽으므로 한국어가 깨졌었음
+    base, _ = server
+    html, source = fetch_page(f"{base}{path}", cache)
+    assert source == "fetched"
+    assert KOREAN in html
+
+
+def test_oversized_and_non_html_pages_fail_without_caching(server, cache, monkeypatch):
+    base, _ = server
+    monkeypatch.setattr(article_fetcher, "ARTICLE_FETCH_MAX_BYTES", 100_000)
+    assert fetch_page(f"{base}/big", cache) == (None, "failed")
+    assert fetch_page(f"{base}/image", cache) == (None, "failed")
+    assert fetch_page(f"{base}/missing", cache) == (None, "failed")
+    assert cache.stats()["pages"] == 0
+
+
+def test_cache_write_failure_still_returns_the_page(server, cache, monkeypatch):
+    base, hits = server
+
+    def disk_full(url, html):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(cache, "put", disk_full)
+    html, source = fetch_page(f"{base}/utf8-header", cache)
+    assert source == "fetched" and KOREAN in html
+
+    monkeypatch.setattr(cache, "evict", lambda: (_ for _ in ()).throw(OSError(13, "Permission denied")))
+    articles = [{"title": "t", "link": f"{base}/article", "summary": "s"}]
+    stats = article_fetcher.fetch_full_articles(articles, cache=cache)
+    assert stats == {"cached": 0, "fetched": 1, "failed": 0}
+    assert KOREAN in articles[0]["content_text"]
+
+
+def test_failed_blob_write_leaves_no_temp_file(cache, monkeypatch):
+    def fail(self, data):
+        self.open("wb").write(data[:10])
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(article_fetcher.Path, "write_bytes", fail)
+    with pytest.raises(OSError):
+        cache.put("https://example.com/a", "<html></html>")
+    monkeypatch.undo()
+    assert not [p for p in cache.objects.rglob("*") if p.is_file()]
+    assert cache.stats()["pages"] == 0
@@ -0,0 +1,124 @@
+"""묶음 요약 (pack_batches / parse_batch_response / 빠진 기사 재시도) - fake_genai.FakeClient 사용."""
+from fake_genai import FakeClient, FakeResponse
+from prompt_builder import estimate_tokens
+from summarizer import (
+    build_batch_prompt,
+    load_existing_summarized,
+    merge_and_summarize,
+    pack_batches,
+    parse_batch_response,
+    save_summarized,
+)
+
+
+def _articles(n: int, words: int = 40) -> list[dict]:
+    return [
+        {
+            "title": f"Article {i} about model launches",
+            "link": f"https://example.com/{i}",
+            "summary": " ".join(f"word{i}_{j}" for j in range(words * (1 + i % 3))) + ".",
+        }
+        for i in range(n)
+    ]
+
+
+class RecordingClient(FakeClient):
+    """묶음 요청과 기사 하나짜리 요청을 나눠 세는 FakeClient. garbage=True면 묶음 요청에 JSON이 아닌 답을 줌."""
+
+    def __init__(self, garbage: bool = False, **kwargs):
+        super().__init__(**kwargs)
+        self.garbage = garbage
+        self.batch_prompts = []
+        self.single_prompts = []
+        self.batch_responses = []
+
+    def _generate(self, model, contents):
+        is_batch = '<article id="' in str(contents)
+        (self.batch_prompts if is_batch else self.single_prompts).append(str(contents))
+        if is_batch and self.garbage:
+            return FakeResponse("죄송합니다, 요약할 수 없습니다.")
+        response = super()._generate(model, contents)
+        if is_batch:
+            self.batch_responses.append(response.text)
+        return response
+
+
+def test_pack_batches_respects_item_limit_and_token_budget():
+    articles = _articles(30)
+    budget = 900
+    batches = pack_batches(articles, max_items=4, token_budget=budget)
+
+    assert [a for batch in batches for a in batch] == articles
+    for batch in batches:
+        assert 1 <= len(batch) <= 4
+        if len(batch) > 1:
+            assert estimate_tokens(build_batch_prompt(batch)) <= budget
+
+
+def test_pack_batches_puts_oversized_article_alone():
+    big = _articles(1, words=2000)
+    batches = pack_batches(_articles(2) + big + _articles(2), max_items=10, token_budget=500)
+    assert [big[0]] in batches
+
+
+def test_parse_batch_response_skips_malformed_items():
+    text = '```json\n[{"id": "1", "summary_ko": "요약 하나"}, {"id": 2}, "x", {"id": "3", "summary_ko": "  "}]\n```'
+    assert parse_batch_response(text) == {"1": "요약 하나"}
+    assert parse_batch_response("not json") == {}
+    assert parse_batch_response(None) == {}
+
+
+def test_dropped_articles_are_retried_individually():
+    articles = _articles(12)
+    client = RecordingClient(batch_drop_rate=0.4, seed=3)
+    merged, failed = merge_and_summarize(articles, [], client=client, delay_seconds=0, batch_size=4)
+
+    assert failed == []
+    assert [a["link"] for a in merged] == [a["link"] for a in articles]
+    assert all(a["summary_ko"] for a in merged)
+    # 묶음 응답에 있던 기사는 다시 요청하지 않고, 빠진 기사만 한 번씩 다시 요청
+    answered = sum(len(parse_batch_response(text)) for text in client.batch_responses)
+    assert 0 < answered < len(articles)
+    assert len(client.single_prompts) == len(articles) - answered
+    for article in articles:
+        assert sum(article["title"] in p for p in client.single_prompts) <= 1
+
+
+def test_unparseable_batch_response_retries_each_article_once():
+    articles = _articles(6)
+    client = RecordingClient(garbage=True)
+    merged, failed = merge_and_summarize(articles, [], client=client, delay_seconds=0, batch_size=3)
+
+    assert failed == []
+    assert len(merged) == len(articles)
+    assert len(client.single_prompts) == len(articles)
+    for article in articles:
+        assert sum(article["title"] in p for p in client.single_prompts) == 1
+
+
+def test_batch_output_matches_single_article_path():
+    articles = _articles(7)
+    existing = [{"title": "old", "link": "https://example.com/old", "summary": "old", "summary_ko": "예전 요약"}]
+
+    single, single_failed = merge_and_summarize(articles, existing, client=FakeClient(), delay_seconds=0, batch_size=1)
+    batched, batch_failed = merge_and_summarize(articles, existing, client=FakeClient(), delay_seconds=0, batch_size=3)
+
+    assert single_failed == batch_failed == []
+    assert [a["link"] for a in batched] == [a["link"] for a in single]
+    assert [sorted(a) for a in batched] == [sorted(a) for a in single]
+    # 요약문과 입력 토큰(묶음 요청은 프롬프트를 기사 수로 나눔)만 다름
+    differs = ("summary_ko", "input_tokens")
+    for s, b in zip(single, batched):
+        assert {k: v for k, v in s.items() if k not in differs} == {k: v for k, v in b.items() if k not in differs}
+        assert b["summary_ko"]
+    assert all(a["input_tokens"] > 0 for a in single[:-1] + batched[:-1])
+    assert batched[-1] == existing[0]
+
+
+def test_input_tokens_are_stored_with_new_articles():
+    articles = _articles(3)
+    merged, _ = merge_and_summarize(articles, [], client=FakeClient(), delay_seconds=0, batch_size=3)
+    save_summarized(merged)
+    stored = {a["link"]: a for a in load_existing_summarized()}
+    assert [stored[a["link"]]["input_tokens"] for a in merged] == [a["input_tokens"] for a in merged]
+    assert all(a["input_tokens"] > 0 for a in merged)
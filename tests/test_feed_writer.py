@@ -0,0 +1,113 @@
+"""요약 피드 - RSS / Atom / JSON Feed가 올바른 문서인지, /feed.xml·/atom.xml이 조건부 요청에 304를 주는지."""
+import json
+import xml.etree.ElementTree as ET
+
+import pytest
+
+import app
+from article_db import article_uid
+from feed_writer import FeedEntry, entries_from_listing, render_atom, render_json_feed, render_rss
+from summarizer import save_summarized
+
+ATOM = "{http://www.w3.org/2005/Atom}"
+SITE = "https://news.example.com"
+PUBLISHED_TS = 1791277200.0  # 2026-10-06 09:00:00 UTC
+
+
+def _entries() -> list[FeedEntry]:
+    return [
+        FeedEntry(
+            uid="a1",
+            title="<AI> & \x07robots",
+            link=f"{SITE}/articles/a1",
+            source_link="https://techcrunch.com/a?x=1&y=2",
+            summary="요약\x00 \"따옴표\" <b>",
+            published_ts=PUBLISHED_TS,
+        ),
+        FeedEntry(uid="a2", title="No date", link=f"{SITE}/articles/a2", source_link="", summary="", published_ts=0.0),
+    ]
+
+
+def test_rss_escapes_text_and_drops_invalid_characters():
+    root = ET.fromstring(render_rss(_entries(), SITE + "/", SITE + "/feed.xml", PUBLISHED_TS))
+    channel = root.find("channel")
+    assert channel.findtext("link") == SITE + "/"
+    assert channel.find(f"{ATOM}link").get("href") == SITE + "/feed.xml"
+    first, second = channel.findall("item")
+    assert first.findtext("title") == "<AI> & robots"
+    assert first.findtext("description") == "요약 \"따옴표\" <b>"
+    assert first.findtext("link") == f"{SITE}/articles/a1"
+    assert first.findtext("guid") == "a1"
+    assert first.findtext("pubDate") == "Tue, 06 Oct 2026 09:00:00 GMT"
+    assert second.find("pubDate") is None
+
+
+def test_atom_links_and_dates():
+    root = ET.fromstring(render_atom(_entries(), SITE + "/", SITE + "/atom.xml", PUBLISHED_TS + 60))
+    assert root.findtext(f"{ATOM}id") == SITE + "/atom.xml"
+    assert root.findtext(f"{ATOM}updated") == "2026-10-06T09:01:00Z"
+    first, second = root.findall(f"{ATOM}entry")
+    links = {link.get("rel"): link.get("href") for link in first.findall(f"{ATOM}link")}
+    assert links == {"alternate": f"{SITE}/articles/a1", "via": "https://techcrunch.com/a?x=1&y=2"}
+    assert first.findtext(f"{ATOM}title") == "<AI> & robots"
+    assert first.findtext(f"{ATOM}published") == "2026-10-06T09:00:00Z"
+    # 발행일이 없으면 피드 갱신 시각을 쓰고 published는 생략
+    assert second.findtext(f"{ATOM}updated") == "2026-10-06T09:01:00Z"
+    assert second.find(f"{ATOM}published") is None
+    assert [link.get("rel") for link in second.findall(f"{ATOM}link")] == ["alternate"]
+
+
+def test_json_feed_items():
+    feed = json.loads(render_json_feed(_entries(), SITE + "/", SITE + "/feed.json"))
+    assert feed["version"] == "https://jsonfeed.org/version/1.1"
+    assert feed["feed_url"] == SITE + "/feed.json"
+    first, second = feed["items"]
+    assert first["url"] == f"{SITE}/articles/a1"
+    assert first["external_url"] == "https://techcrunch.com/a?x=1&y=2"
+    assert first["title"] == "<AI> & \x07robots"
+    assert first["date_published"] == "2026-10-06T09:00:00Z"
+    assert "date_published" not in second
+
+
+def test_entries_from_listing_limits_and_links():
+    listing = [{"uid": f"u{i}", "title": f"T{i}", "link": f"https://techcrunch.com/{i}", "excerpt": f"e{i}"} for i in range(3)]
+    entries = entries_from_listing(listing, 2, article_url=lambda uid: f"{SITE}/articles/{uid}")
+    assert [e.link for e in entries] == [f"{SITE}/articles/u0", f"{SITE}/articles/u1"]
+    assert entries[0].source_link == "https://techcrunch.com/0"
+    assert entries[0].summary == "e0"
+    assert [e.link for e in entries_from_listing(listing, 1)] == ["https://techcrunch.com/0"]
+
+
+def _article(i: int) -> dict:
+    return {
+        "title": f"Article {i}",
+        "link": f"https://techcrunch.com/{i}",
+        "summary": f"summary {i}",
+        "summary_ko": f"요약 {i}",
+        "published": "Tue, 06 Oct 2026 09:00:00 GMT",
+    }
+
+
+@pytest.mark.parametrize("path, mimetype", [("/feed.xml", "application/rss+xml"), ("/atom.xml", "application/atom+xml")])
+def test_feed_routes_use_site_url_and_answer_304(web, monkeypatch, path, mimetype):
+    monkeypatch.setattr(app, "SITE_URL", SITE)
+    save_summarized([_article(2), _article(1)])
+    response = web.get(path)
+    assert response.status_code == 200
+    assert response.mimetype == mimetype
+    etag = response.headers["ETag"]
+    assert response.headers["Last-Modified"]
+    body = response.get_data(as_text=True)
+    assert f"{SITE}/articles/{article_uid(_article(2))}" in body
+    assert f"{SITE}{path}" in body
+
+    cached = web.get(path, headers={"If-None-Match": etag})
+    assert cached.status_code == 304
+    assert cached.get_data() == b""
+
+    # 새 기사가 들어오면 예전 ETag로는 304가 아님
+    save_summarized([_article(3), _article(2), _article(1)])
+    fresh = web.get(path, headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["ETag"] != etag
+    assert f"{SITE}/articles/{article_uid(_article(3))}" in fresh.get_data(as_text=True)
@@ -0,0 +1,207 @@
+"""작업 큐(합치기·임대·시도 횟수·기사 재시도)와 워커 잠금 - 직접 실행이 워커와 겹치지 않는지."""
+import os
+
+import pytest
+
+import backfill
+import job_queue
+import run_with_summary
+import scheduler
+import worker
+from job_queue import WorkerLock
+
+
+@pytest.fixture
+def queue_dir(tmp_path, monkeypatch):
+    """프로젝트 output/ 대신 임시 디렉터리의 잠금 파일·작업 큐를 쓰게 합니다."""
+    monkeypatch.setattr(job_queue, "output_path", lambda: tmp_path)
+    monkeypatch.setattr(job_queue, "_queue", None)
+    spawned = []
+    monkeypatch.setattr(worker, "spawn_worker", spawned.append)
+    return spawned
+
+
+def test_run_exclusive_fails_fast_while_lock_is_held(queue_dir):
+    held = WorkerLock()
+    assert held.acquire()
+    calls = []
+    try:
+        assert worker.run_exclusive(lambda: calls.append(1) or 0, "test") == 1
+    finally:
+        held.release()
+    assert calls == []
+
+    assert worker.run_exclusive(lambda: calls.append(1) or 0, "test") == 0
+    assert calls == [1]
+    # 끝난 뒤 잠금이 풀려 있어야 워커가 잡을 수 있음
+    lock = WorkerLock()
+    assert lock.acquire()
+    lock.release()
+
+
+def test_jobs_queued_during_manual_run_get_a_worker(queue_dir):
+    def manual_run():
+        # 수동 실행 중에 트리거가 들어오면 그때 뜬 워커는 잠금을 못 잡고 끝남
+        job_queue.get_job_queue().enqueue("update")
+        return 0
+
+    assert worker.run_exclusive(manual_run, "test") == 0
+    assert len(queue_dir) == 1
+    assert worker.run_exclusive(lambda: 0, "test") == 0
+    assert len(queue_dir) == 2  # 아직 처리되지 않았으므로 다시 띄움
+
+
+@pytest.mark.parametrize("entry, target, argv", [
+    (run_with_summary, "run", []),
+    (backfill, "_run", ["--max-pages", "1"]),
+])
+def test_cli_entry_points_do_not_run_alongside_the_worker(queue_dir, monkeypatch, entry, target, argv):
+    calls = []
+    monkeypatch.setattr(entry, target, lambda *a, **k: calls.append(1) or 0)
+    held = WorkerLock()
+    assert held.acquire()
+    try:
+        assert entry.main(argv) == 1
+    finally:
+        held.release()
+    assert calls == []
+    assert entry.main(argv) == 0
+    assert calls == [1]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="fork 필요")
+def test_forked_worker_does_not_hold_the_scheduler_lock(queue_dir, monkeypatch):
+    lock = WorkerLock(job_queue.output_path() / scheduler.SCHEDULER_LOCK_FILE)
+    assert lock.acquire()
+    monkeypatch.setattr(scheduler, "_lock", lock)
+    monkeypatch.setattr(scheduler, "_scheduler", object())
+    ready_r, ready_w = os.pipe()
+    done_r, done_w = os.pipe()
+    pid = os.fork()
+    if pid == 0:  # gunicorn 워커 역할: post_fork 훅 뒤 계속 살아 있음
+        code = 1
+        try:
+            scheduler.after_fork()
+            code = 0 if scheduler._scheduler is None else 1
+            os.write(ready_w, b"x")
+            os.read(done_r, 1)
+        finally:
+            os._exit(code)
+    try:
+        assert os.read(ready_r, 1) == b"x"
+        # 자식이 풀면 안 되므로 마스터의 잠금은 그대로
+        assert not WorkerLock(lock.path).acquire()
+        # 마스터가 죽은 것처럼 잠금 파일을 닫으면 워커가 살아 있어도 새 마스터가 잠금을 잡을 수 있음
+        lock.detach()
+        successor = WorkerLock(lock.path)
+        assert successor.acquire()
+        successor.release()
+    finally:
+        os.write(done_w, b"x")
+        _, status = os.waitpid(pid, 0)
+        for fd in (ready_r, ready_w, done_r, done_w):
+            os.close(fd)
+    assert os.waitstatus_to_exitcode(status) == 0
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(job_queue.time, "time", lambda: now[0])
+    return now
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    return job_queue.JobQueue(tmp_path / "jobs.sqlite3", lease_seconds=60, max_attempts=2)
+
+
+def test_enqueue_coalesces_by_dedupe_key(queue):
+    first, coalesced = queue.enqueue("update")
+    assert not coalesced
+    assert queue.enqueue("update") == (first, True)
+    forced, coalesced = queue.enqueue("update", dedupe_key="update:force", params={"force": True})
+    assert not coalesced and forced != first
+    assert queue.enqueue("update", dedupe_key="update:force", params={"force": True}) == (forced, True)
+
+    assert queue.get(first)["triggers"] == 2
+    assert queue.get(forced)["params"] == {"force": True}
+
+    # 실행 중인 작업에도 합치고, 끝난 뒤에는 새 작업
+    job = queue.claim("w1")
+    assert job["id"] == first
+    assert queue.enqueue("update") == (first, True)
+    queue.complete(first, "w1")
+    assert queue.enqueue("update")[1] is False
+
+
+def test_start_update_job_keeps_forced_jobs_separate(queue_dir):
+    normal, _ = worker.start_update_job()
+    forced, coalesced = worker.start_update_job(force=True)
+    assert forced != normal and not coalesced
+    assert worker.start_update_job(force=True) == (forced, True)
+    assert worker.start_update_job() == (normal, True)
+    assert job_queue.get_job_queue().get(forced)["params"] == {"force": True}
+    assert len(queue_dir) == 4  # 트리거마다 워커를 띄움 (잠금을 못 잡은 워커는 바로 끝남)
+
+
+def test_expired_lease_is_reclaimed(queue, clock):
+    job_id, _ = queue.enqueue("update")
+    assert queue.claim("dead")["id"] == job_id
+    assert queue.claim("w2") is None  # 임대 중
+
+    clock[0] += 61
+    job = queue.claim("w2")
+    assert job["id"] == job_id and job["lease_owner"] == "w2" and job["attempts"] == 2
+    # 임대를 잃은 워커의 연장·완료는 반영되지 않음
+    assert not queue.heartbeat(job_id, "dead")
+    queue.complete(job_id, "dead")
+    assert queue.get(job_id)["status"] == "running"
+    assert queue.heartbeat(job_id, "w2")
+
+
+def test_reclaim_running_takes_over_a_live_lease(queue):
+    job_id, _ = queue.enqueue("update")
+    queue.claim("dead")
+    assert queue.claim("w2") is None
+    assert queue.claim("w2", reclaim_running=True)["id"] == job_id
+
+
+def test_job_fails_after_max_attempts(queue, clock):
+    job_id, _ = queue.enqueue("update")
+    for _ in range(queue.max_attempts):
+        assert queue.claim("w")["id"] == job_id
+        clock[0] += 61
+    assert queue.claim("w") is None
+    job = queue.get(job_id)
+    assert job["status"] == "failed" and job["attempts"] == queue.max_attempts
+    assert "최대 시도 횟수" in job["error"]
+    # 실패로 끝난 작업에는 합치지 않음
+    assert queue.enqueue("update")[1] is False
+
+
+def test_article_failures_back_off_then_exhaust(queue, clock, monkeypatch):
+    monkeypatch.setattr(job_queue, "ARTICLE_RETRY_BACKOFF_SECONDS", 100)
+    monkeypatch.setattr(job_queue, "ARTICLE_RETRY_MAX_ATTEMPTS", 3)
+    failed = [{"title": "t", "link": "https://example.com/a", "error": "429"}]
+    links = ["https://example.com/a", "https://example.com/b"]
+
+    queue.record_article_failures(failed)
+    blocked = queue.blocked_links(links)
+    assert list(blocked) == ["https://example.com/a"]
+    assert blocked["https://example.com/a"]["next_attempt_at"] == clock[0] + 100
+    assert not blocked["https://example.com/a"]["exhausted"]
+
+    clock[0] += 101
+    assert queue.blocked_links(links) == {}
+    queue.record_article_failures(failed)
+    assert queue.blocked_links(links)["https://example.com/a"]["next_attempt_at"] == clock[0] + 200  # 2배
+
+    clock[0] += 201
+    queue.record_article_failures(failed)
+    clock[0] += 10_000
+    blocked = queue.blocked_links(links)
+    assert blocked["https://example.com/a"]["exhausted"] and blocked["https://example.com/a"]["attempts"] == 3
+
+    queue.clear_article_failures(["https://example.com/a"])
+    assert queue.blocked_links(links) == {}
@@ -0,0 +1,83 @@
+"""모델 라우터 회로 차단기 - 모든 회로가 열렸을 때 요청을 보내지 않는지."""
+import pytest
+
+import model_router
+import summarizer
+from fake_genai import FakeClient
+from model_router import CircuitOpenError, ModelRouter
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(model_router.time, "time", lambda: now[0])
+    return now
+
+
+def _trip(router, models):
+    for m in models:
+        for _ in range(router.failure_threshold):
+            router.record(m, ok=False, seconds=0.1)
+
+
+def test_all_open_returns_nothing_until_cooldown(clock):
+    router = ModelRouter(failure_threshold=2, cooldown_seconds=60)
+    models = ["a", "b"]
+    _trip(router, models)
+
+    assert router.order(models) == []
+    clock[0] += 30
+    assert router.order(models) == []
+
+    # 쿨다운이 지나면 모델마다 시험 요청 하나씩만
+    clock[0] += 31
+    assert router.order(models) == ["a", "b"]
+    assert router.order(models) == []
+
+    router.record("a", ok=True, seconds=0.1)
+    assert router.order(models) == ["a"]
+
+
+def test_summarize_fails_fast_when_every_circuit_is_open(monkeypatch, clock):
+    router = ModelRouter(failure_threshold=1, cooldown_seconds=60)
+    models = summarizer._model_chain("gemini-2.5-flash")
+    _trip(router, models)
+    monkeypatch.setattr(summarizer, "get_router", lambda: router)
+    client = FakeClient()
+
+    with pytest.raises(CircuitOpenError):
+        summarizer.summarize_article({"title": "t", "link": "l", "summary": "s"}, client=client, use_cache=False)
+    assert client.calls == 0
+
+
+def test_slow_model_is_tried_again_after_cooldown(clock):
+    router = ModelRouter(cooldown_seconds=60, slow_seconds=10)
+    models = ["primary", "fallback"]
+    router.record("primary", ok=True, seconds=60)
+    assert router.order(models) == ["fallback", "primary"]
+
+    # fallback만 계속 성공해도 쿨다운이 지나면 primary가 다시 앞으로
+    clock[0] += 61
+    for _ in range(50):
+        router.record("fallback", ok=True, seconds=1)
+    assert router.order(models) == ["primary", "fallback"]
+
+    # 다시 느리면 또 쿨다운 동안 뒤로, 빨라지면 바로 앞으로
+    router.record("primary", ok=True, seconds=60)
+    assert router.order(models) == ["fallback", "primary"]
+    for _ in range(30):
+        router.record("primary", ok=True, seconds=1)
+    assert router.order(models) == ["primary", "fallback"]
+
+
+def test_slow_state_survives_reload_but_still_expires(tmp_path, clock):
+    path = tmp_path / "model_health.json"
+    router = ModelRouter(path, cooldown_seconds=60, slow_seconds=10)
+    router.record("primary", ok=True, seconds=60)
+    router._dirty = True
+    router.save()
+
+    reloaded = ModelRouter(path, cooldown_seconds=60, slow_seconds=10)
+    assert reloaded.order(["primary", "fallback"]) == ["fallback", "primary"]
+    clock[0] += 61
+    assert reloaded.order(["primary", "fallback"]) == ["primary", "fallback"]
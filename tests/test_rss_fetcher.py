@@ -0,0 +1,107 @@
+"""rss_fetcher 조건부 요청: 로컬 http.server가 검증값과 함께 200, 이후 304를 돌려줄 때 저장된 기사를 다시 쓰는지 확인합니다."""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+import rss_fetcher
+from config import FEED_STATE_JSON, OUTPUT_DIR
+
+LAST_MODIFIED = "Mon, 05 Oct 2026 09:00:00 GMT"
+
+
+def _rss(name: str, items: list[str]) -> bytes:
+    entries = "".join(
+        f"<item><title>{name} {title}</title><link>https://example.com/{name}/{title}</link>"
+        f"<guid>{name}-{title}</guid><pubDate>Mon, 05 Oct 2026 0{i}:00:00 GMT</pubDate>"
+        f"<description>{name} {title} 요약</description></item>"
+        for i, title in enumerate(items)
+    )
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>{name}</title>'
+        f"<link>https://example.com/{name}</link>{entries}</channel></rss>"
+    ).encode("utf-8")
+
+
+@pytest.fixture
+def server():
+    # 경로 → 기사 제목 목록. 내용이 바뀌면 ETag도 바뀜
+    feeds = {"/a.xml": ["one", "two"], "/b.xml": ["three"]}
+    requests = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests.append((self.path, self.headers.get("If-None-Match"), self.headers.get("If-Modified-Since")))
+            items = feeds[self.path]
+            etag = f'"{self.path}-{len(items)}"'
+            if self.headers.get("If-None-Match") == etag:
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            body = _rss(self.path.strip("/").split(".")[0], items)
+            self.send_response(200)
+            self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", LAST_MODIFIED)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{httpd.server_address[1]}"
+    yield base, feeds, requests
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _feeds(base: str, *paths: str) -> list[dict]:
+    return [{"name": p.strip("/").split(".")[0], "url": f"{base}{p}"} for p in paths]
+
+
+def test_second_run_sends_validators_and_skips_on_304(server):
+    base, _, requests = server
+    feeds = _feeds(base, "/a.xml")
+    articles, _ = rss_fetcher.collect(feeds=feeds)
+    assert [a["title"] for a in articles] == ["a one", "a two"]
+
+    state = json.loads((Path(OUTPUT_DIR) / FEED_STATE_JSON).read_text(encoding="utf-8"))
+    assert state[f"{base}/a.xml"] == {"etag": '"/a.xml-2"', "modified": LAST_MODIFIED}
+
+    with pytest.raises(rss_fetcher.FeedNotModified) as exc:
+        rss_fetcher.collect(feeds=feeds)
+    assert [r.not_modified for r in exc.value.results] == [True]
+    assert requests[-1] == ("/a.xml", '"/a.xml-2"', LAST_MODIFIED)
+
+
+def test_not_modified_feed_reuses_stored_articles(server):
+    base, feeds_content, requests = server
+    feeds = _feeds(base, "/a.xml", "/b.xml")
+    first, _ = rss_fetcher.collect(feeds=feeds)
+    stored_a = [a for a in first if a["source"] == "a"]
+    assert len(stored_a) == 2
+
+    feeds_content["/b.xml"] = ["three", "four"]
+    second, _ = rss_fetcher.collect(feeds=feeds)
+    results = {r.name: r for r in rss_fetcher.last_fetches()}
+    assert results["a"].not_modified and results["a"].feed is None
+    assert results["b"].ok
+    # 304인 피드는 지난번 articles.json의 기사를 그대로 씀
+    assert [a for a in second if a["source"] == "a"] == stored_a
+    assert {a["title"] for a in second if a["source"] == "b"} == {"b three", "b four"}
+    assert [r for r in requests if r[0] == "/a.xml"][-1][1] == '"/a.xml-2"'
+
+
+def test_unconditional_collect_ignores_stored_validators(server):
+    base, _, requests = server
+    feeds = _feeds(base, "/a.xml")
+    rss_fetcher.collect(feeds=feeds)
+    articles, _ = rss_fetcher.collect(conditional=False, feeds=feeds)
+    assert len(articles) == 2
+    assert requests[-1] == ("/a.xml", None, None)
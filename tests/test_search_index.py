@@ -0,0 +1,89 @@
+"""검색 색인 - 한글 바이그램 토큰, BM25 순위, 증분 갱신, 검색 페이지 범위."""
+import pytest
+
+import app
+from article_db import article_uid
+from search_index import SearchIndex, tokenize
+from summarizer import save_summarized
+
+
+def _article(i: int, title: str, summary: str = "", summary_ko: str = "") -> dict:
+    return {"title": title, "link": f"https://example.com/{i}", "summary": summary, "summary_ko": summary_ko}
+
+
+@pytest.fixture
+def index(tmp_path):
+    return SearchIndex(tmp_path / "search.sqlite3")
+
+
+def test_tokenize_english_words_and_korean_bigrams():
+    assert tokenize("The OpenAI model is GPT-5 and a 3 B") == ["openai", "model", "gpt", "5", "3"]
+    assert tokenize("인공지능 칩") == ["인공", "공지", "지능", "칩"]
+    assert tokenize("AI 스타트업") == ["ai", "스타", "타트", "트업"]
+    assert tokenize("") == []
+
+
+def test_korean_query_matches_inside_longer_words(index):
+    index.update(changed=[_article(1, "Chip news", summary_ko="엔비디아가 인공지능 반도체를 공개했다")])
+    assert [uid for uid, _ in index.search("반도체")] == [article_uid(_article(1, ""))]
+    assert index.search("자동차") == []
+
+
+def test_bm25_ranks_title_rare_terms_and_short_documents_higher(index):
+    articles = [
+        _article(1, "Robotics startup raises money", "robotics robotics"),
+        _article(2, "Funding roundup", "a robotics company and many other companies raised money this week " * 3),
+        _article(3, "Weekly roundup", "robotics"),
+        _article(4, "Chip makers", "chips chips money"),
+    ]
+    index.update(changed=articles)
+    ranked = [uid for uid, _ in index.search("robotics")]
+    uid = {a["link"]: article_uid(a) for a in articles}
+    # 제목에 있는 문서 > 짧은 본문 > 긴 본문, 단어가 없는 문서는 빠짐
+    assert ranked == [uid["https://example.com/1"], uid["https://example.com/3"], uid["https://example.com/2"]]
+
+    # 드문 단어가 흔한 단어보다 점수에 더 기여
+    scores = dict(index.search("money chips"))
+    assert scores[uid["https://example.com/4"]] > scores[uid["https://example.com/1"]]
+    assert len(index.search("robotics", limit=2)) == 2
+
+
+def test_incremental_update_matches_rebuild(tmp_path, index):
+    articles = [_article(i, f"Story {i}", f"model release number {i}", f"{i}번째 모델 공개") for i in range(5)]
+    index.update(changed=articles)
+
+    changed = dict(articles[1], title="Story 1 rewritten", summary="quantum computing update")
+    index.update(changed=[changed], removed=[articles[3]])
+    assert index.count() == 4
+    assert index.search("quantum")[0][0] == article_uid(changed)
+    assert article_uid(changed) not in {uid for uid, _ in index.search("release")}
+    assert article_uid(articles[3]) not in {uid for uid, _ in index.search("모델 공개", limit=10)}
+
+    fresh = SearchIndex(tmp_path / "fresh.sqlite3")
+    fresh.rebuild([articles[0], changed, articles[2], articles[4]])
+    for query in ("release", "모델 공개", "quantum story"):
+        got, expected = index.search(query), fresh.search(query)
+        assert [uid for uid, _ in got] == [uid for uid, _ in expected]
+        assert [score for _, score in got] == pytest.approx([score for _, score in expected])
+
+
+def test_search_page_is_clamped(web, monkeypatch):
+    save_summarized([_article(i, f"Model launch {i}", "new model") for i in range(45)])
+    limits = []
+    real = app.get_search_index
+
+    def spy(root):
+        index = real(root)
+        original = index.search
+        monkeypatch.setattr(index, "search", lambda q, limit=20: limits.append(limit) or original(q, limit))
+        return index
+
+    monkeypatch.setattr(app, "get_search_index", spy)
+    response = web.get("/search?q=model&page=10000000")
+    assert response.status_code == 200
+    # 기사 45개 → 3페이지가 끝
+    assert limits == [3 * app.INDEX_PER_PAGE + 1]
+
+    monkeypatch.setattr(app, "SEARCH_MAX_PAGES", 2)
+    web.get("/search?q=model&page=3")
+    assert limits[-1] == 2 * app.INDEX_PER_PAGE + 1
@@ -0,0 +1,110 @@
+"""정적 사이트 내보내기 - 바뀐 페이지만 다시 렌더링하고, 사라진 기사 파일을 지우고, 압축본이 매번 같은지."""
+import gzip
+
+import pytest
+
+from article_db import article_uid
+from static_site import STATIC_MANIFEST, _brotli, export_site
+from summarizer import save_summarized
+
+SITE_URL = "https://news.example.com/blog"
+
+
+def _article(i: int, summary_ko: str = "") -> dict:
+    return {
+        "title": f"Article {i}",
+        "link": f"https://example.com/{i}",
+        "summary": f"summary {i}",
+        "summary_ko": summary_ko or f"요약 {i}",
+        "published": f"Mon, 0{i} Oct 2026 09:00:00 GMT",
+    }
+
+
+@pytest.fixture
+def export(tmp_path):
+    site_dir = tmp_path / "site"
+
+    def run(**kwargs):
+        return export_site(site_dir, output_dir=tmp_path / "output", per_page=2, site_url=SITE_URL, **kwargs)
+
+    run.dir = site_dir
+    return run
+
+
+def _inodes(site_dir) -> dict:
+    """파일마다 inode - 다시 쓰면 (임시 파일 교체라) 바뀜."""
+    return {
+        p.relative_to(site_dir).as_posix(): p.stat().st_ino
+        for p in site_dir.rglob("*") if p.is_file() and p.name != STATIC_MANIFEST
+    }
+
+
+def test_second_export_skips_everything(export):
+    save_summarized([_article(3), _article(2), _article(1)])
+    first = export()
+    assert first["articles"] == 3 and first["pages"] == 2
+    assert first["rendered"] > 0 and first["skipped"] == 0
+    index = (export.dir / "index.html").read_text(encoding="utf-8")
+    assert f"/blog/articles/{article_uid(_article(3))}/" in index
+    assert (export.dir / "page" / "2" / "index.html").exists()
+    before = _inodes(export.dir)
+
+    second = export()
+    assert second["rendered"] == 0
+    assert second["skipped"] == first["rendered"]
+    assert second["removed"] == 0
+    assert _inodes(export.dir) == before
+
+
+def test_changed_article_rerenders_only_its_pages(export):
+    articles = [_article(3), _article(2), _article(1)]
+    save_summarized(articles)
+    export()
+    before = _inodes(export.dir)
+
+    articles[2] = _article(1, summary_ko="고친 요약")
+    save_summarized(articles)
+    stats = export()
+    after = _inodes(export.dir)
+    rewritten = {rel for rel in after if after[rel] != before.get(rel)}
+    uid = article_uid(articles[2])
+    expected = {f"articles/{uid}/index.html", "page/2/index.html", "feed.xml", "atom.xml", "feed.json"}
+    suffixes = ("", ".gz", ".br") if _brotli() else ("", ".gz")
+    assert rewritten == {rel + suffix for rel in expected for suffix in suffixes}
+    assert stats["rendered"] == len(expected)
+    assert "고친 요약" in (export.dir / "articles" / uid / "index.html").read_text(encoding="utf-8")
+
+
+def test_removed_article_files_are_deleted(export):
+    save_summarized([_article(3), _article(2), _article(1)])
+    export()
+    gone = export.dir / "articles" / article_uid(_article(1))
+    # brotli가 없어도 예전 실행이 남긴 .br까지 지우는지
+    (gone / "index.html.br").write_bytes(b"br")
+
+    stats = export()
+    assert stats["removed"] == 0
+    save_summarized([_article(3), _article(2)])
+    stats = export()
+    assert stats["pages"] == 1
+    assert stats["removed"] == 2  # 기사 상세와 page/2
+    assert not gone.exists()
+    assert not (export.dir / "page").exists()
+    assert (export.dir / "articles" / article_uid(_article(2)) / "index.html.gz").exists()
+
+
+def test_gzip_is_byte_identical_across_forced_renders(export):
+    save_summarized([_article(2), _article(1)])
+    first = export()
+    body = (export.dir / "index.html").read_bytes()
+    compressed = (export.dir / "index.html.gz").read_bytes()
+    assert gzip.decompress(compressed) == body
+    before = _inodes(export.dir)
+
+    forced = export(force=True)
+    assert forced["skipped"] == 0
+    assert forced["rendered"] == first["rendered"]
+    assert _inodes(export.dir).keys() == before.keys()
+    assert (export.dir / "index.html.gz").stat().st_ino != before["index.html.gz"]
+    assert (export.dir / "index.html.gz").read_bytes() == compressed
+    assert (export.dir / "feed.xml.gz").read_bytes() == gzip.compress((export.dir / "feed.xml").read_bytes(), 9, mtime=0)
@@ -0,0 +1,88 @@
+"""요약 체크포인트 - 중간에 죽은 실행을 --resume으로 이어 갈 때 받은 요약을 다시 요청하지 않는지."""
+import json
+
+import pytest
+
+import job_queue
+import run_with_summary
+import summarizer
+from fake_genai import FakeClient
+from summary_checkpoint import SummaryCheckpoint, get_checkpoint
+
+
+def _articles(n: int) -> list[dict]:
+    return [
+        {
+            "title": f"Article {i}",
+            "link": f"https://example.com/{i}",
+            "summary": f"Startup {i} released a new model today.",
+            "published": "Mon, 05 Oct 2026 09:00:00 GMT",
+        }
+        for i in range(n)
+    ]
+
+
+class DyingClient(FakeClient):
+    """limit번 응답한 뒤 프로세스가 죽은 것처럼 KeyboardInterrupt를 냅니다."""
+
+    def __init__(self, limit: int, **kwargs):
+        super().__init__(**kwargs)
+        self.limit = limit
+
+    def _generate(self, model, contents):
+        if self.calls >= self.limit:
+            raise KeyboardInterrupt
+        return super()._generate(model, contents)
+
+
+def test_truncated_last_line_is_skipped_and_next_record_starts_a_new_line(tmp_path):
+    cp = SummaryCheckpoint(tmp_path / "cp.jsonl")
+    cp.start_run(_articles(3))
+    cp.record({"link": "https://example.com/0"}, "요약 0")
+    with open(cp.path, "a", encoding="utf-8") as f:
+        f.write('{"type": "summary", "link": "https://example.com/1", "summ')  # 쓰다가 죽음
+
+    assert cp.summaries() == {"https://example.com/0": "요약 0"}
+    assert len(cp.run_articles()) == 3
+
+    cp.record({"link": "https://example.com/2"}, "요약 2")
+    assert cp.summaries() == {"https://example.com/0": "요약 0", "https://example.com/2": "요약 2"}
+    lines = cp.path.read_text(encoding="utf-8").splitlines()
+    assert json.loads(lines[-1])["link"] == "https://example.com/2"
+
+
+def test_new_run_keeps_summaries_from_the_interrupted_one(tmp_path):
+    cp = SummaryCheckpoint(tmp_path / "cp.jsonl")
+    cp.start_run(_articles(2))
+    cp.record({"link": "https://example.com/0"}, "요약 0")
+    cp.start_run(_articles(4))
+    assert len(cp.run_articles()) == 4
+    assert cp.summaries() == {"https://example.com/0": "요약 0"}
+
+
+def test_resume_after_crash_reuses_checkpointed_summaries(tmp_path, monkeypatch):
+    articles = _articles(6)
+    cp = get_checkpoint()
+    cp.start_run(articles)
+    with pytest.raises(KeyboardInterrupt):
+        summarizer.merge_and_summarize(
+            articles, [], client=DyingClient(limit=2), delay_seconds=0, batch_size=1, checkpoint=cp,
+        )
+    saved = cp.summaries()
+    assert len(saved) == 2
+
+    client = FakeClient()
+    monkeypatch.setattr(summarizer, "_get_client", lambda: client)
+    monkeypatch.setattr(job_queue, "output_path", lambda: tmp_path / "output")
+    monkeypatch.setattr(job_queue, "_queue", None)
+    monkeypatch.setattr(run_with_summary, "GEMINI_REQUESTS_PER_MINUTE", 0)
+    monkeypatch.setattr(run_with_summary, "SUMMARY_BATCH_SIZE", 1)
+
+    assert run_with_summary.run(resume=True) == 0
+    assert client.calls == len(articles) - len(saved)
+
+    stored = {a["link"]: a for a in summarizer.load_existing_summarized()}
+    assert set(stored) == {a["link"] for a in articles}
+    for link, summary in saved.items():
+        assert stored[link]["summary_ko"] == summary
+    assert not cp.exists()  # 저장까지 끝나면 지움
@@ -0,0 +1,145 @@
+"""요약 실행기 - 토큰 버킷 속도 제한·AIMD, rate limit만 재시도, 입력 순서 유지 (thread / asyncio)."""
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import summary_executor
+from fake_genai import FakeClient
+from summary_executor import RateLimitedClient, SummaryExecutor, TokenBucket, is_rate_limit_error
+
+
+class RateLimited(Exception):
+    code = 429
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """summary_executor가 보는 time을 가짜 시계로 바꿉니다 (sleep하면 시간이 그만큼 흐름)."""
+    now = [100.0]
+
+    def sleep(seconds):
+        now[0] += seconds
+
+    monkeypatch.setattr(summary_executor, "time", SimpleNamespace(monotonic=lambda: now[0], sleep=sleep))
+    return now
+
+
+def test_bucket_paces_requests_per_minute(clock):
+    bucket = TokenBucket(requests_per_minute=30)  # 2초에 하나
+    start = clock[0]
+    waits = [bucket.acquire() for _ in range(5)]
+    assert waits[0] == 0
+    assert waits[1:] == pytest.approx([2.0] * 4)
+    assert clock[0] - start == pytest.approx(8.0)
+
+
+def test_throttle_halves_rate_pauses_and_recovers(clock):
+    bucket = TokenBucket(requests_per_minute=60)
+    bucket.acquire()
+    bucket.throttle(pause_seconds=10)
+    assert bucket.rate == pytest.approx(0.5)
+    # 멈춘 동안은 보내지 않고, 멈춤이 끝나면 낮춘 속도(2초에 하나)로
+    assert bucket.acquire() == pytest.approx(10)
+    assert bucket.acquire() == pytest.approx(2.0)
+
+    for _ in range(4):
+        bucket.success()
+    assert bucket.rate == pytest.approx(0.9)
+    for _ in range(10):
+        bucket.success()
+    assert bucket.rate == pytest.approx(1.0)  # 설정값을 넘지 않음
+
+
+def test_throttle_never_goes_below_min_rate(clock):
+    bucket = TokenBucket(requests_per_minute=60, min_rpm=15)
+    for _ in range(10):
+        bucket.throttle(pause_seconds=0)
+    assert bucket.rate == pytest.approx(15 / 60)
+
+
+def test_rate_limited_client_throttles_only_on_rate_limit_errors(clock):
+    bucket = TokenBucket(requests_per_minute=60)
+    fake = FakeClient()
+    client = RateLimitedClient(fake, bucket, pause_seconds=5)
+
+    client.models.generate_content(model="m", contents="prompt")
+    assert bucket.rate == pytest.approx(1.0)
+
+    fake.models.generate_content = lambda **kw: (_ for _ in ()).throw(ValueError("bad request"))
+    with pytest.raises(ValueError):
+        client.models.generate_content(model="m", contents="prompt")
+    assert bucket.rate == pytest.approx(1.0) and bucket.paused_until == 0.0
+
+    fake.models.generate_content = lambda **kw: (_ for _ in ()).throw(RateLimited("slow down"))
+    with pytest.raises(RateLimited):
+        client.models.generate_content(model="m", contents="prompt")
+    assert bucket.rate == pytest.approx(0.5)
+    assert bucket.paused_until == pytest.approx(clock[0] + 5)
+
+
+@pytest.mark.parametrize("exc, expected", [
+    (RateLimited("x"), True),
+    (RuntimeError("429 Too Many Requests"), True),
+    (RuntimeError("RESOURCE_EXHAUSTED: quota"), True),
+    (RuntimeError("500 internal error"), False),
+    (ValueError("bad prompt"), False),
+])
+def test_is_rate_limit_error(exc, expected):
+    assert is_rate_limit_error(exc) is expected
+
+
+def test_only_rate_limit_errors_are_retried():
+    calls = {"limited": 0, "broken": 0, "flaky": 0}
+    sleeps = []
+
+    def fn(item):
+        calls[item] += 1
+        if item == "limited":
+            raise RateLimited("429")
+        if item == "broken":
+            raise ValueError("bad")
+        if calls[item] < 3:
+            raise RuntimeError("429 rate limit")
+        return item.upper()
+
+    executor = SummaryExecutor(fn, max_retries=2, backoff_base=1.0, backoff_max=60.0, sleep=sleeps.append)
+    limited, broken, flaky = executor.run(["limited", "broken", "flaky"])
+
+    assert isinstance(limited.error, RateLimited) and limited.attempts == 3  # 처음 1번 + 재시도 2번
+    assert isinstance(broken.error, ValueError) and broken.attempts == 1
+    assert flaky.error is None and flaky.value == "FLAKY" and flaky.attempts == 3
+    assert calls == {"limited": 3, "broken": 1, "flaky": 3}
+    # 지수 백오프 (±20% 흔들림): 1, 2 / 1, 2
+    assert len(sleeps) == 4
+    for delay, base in zip(sleeps, [1, 2, 1, 2]):
+        assert 0.8 * base <= delay <= 1.2 * base
+
+
+@pytest.mark.parametrize("mode", ["thread", "asyncio"])
+def test_results_keep_input_order_within_concurrency_limit(mode):
+    lock = threading.Lock()
+    active = [0, 0]  # 현재, 최대
+
+    def fn(n):
+        with lock:
+            active[0] += 1
+            active[1] = max(active[1], active[0])
+        time.sleep(0.002 * (10 - n))  # 뒤 항목이 먼저 끝남
+        with lock:
+            active[0] -= 1
+        if n == 4:
+            raise ValueError("bad")
+        return n * n
+
+    results = SummaryExecutor(fn, max_concurrency=3, mode=mode).run(range(10))
+    assert [r.item for r in results] == list(range(10))
+    assert [r.value for r in results if r.error is None] == [n * n for n in range(10) if n != 4]
+    assert isinstance(results[4].error, ValueError)
+    assert 1 < active[1] <= 3
+
+
+def test_unknown_mode_is_rejected():
+    with pytest.raises(ValueError):
+        SummaryExecutor(lambda x: x, mode="process")
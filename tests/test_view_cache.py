@@ -0,0 +1,49 @@
+"""조건부 요청(ETag / Last-Modified) - 데이터가 그대로여도 배포가 바뀌면 304를 주지 않는지."""
+import os
+
+import app
+from summarizer import save_summarized
+from view_cache import build_fingerprint, make_etag
+
+
+def _article(i: int) -> dict:
+    return {
+        "title": f"Article {i}",
+        "link": f"https://example.com/{i}",
+        "summary": f"summary {i}",
+        "summary_ko": f"요약 {i}",
+        "published": "Mon, 05 Oct 2026 09:00:00 GMT",
+    }
+
+
+def test_build_fingerprint_follows_template_content(tmp_path):
+    (tmp_path / "templates").mkdir()
+    template = tmp_path / "templates" / "index.html"
+    template.write_text("<p>v1</p>", encoding="utf-8")
+    (tmp_path / "app.py").write_text("x = 1\n", encoding="utf-8")
+    first, first_mtime = build_fingerprint(tmp_path)
+    assert build_fingerprint(tmp_path)[0] == first
+
+    template.write_text("<p>v2</p>", encoding="utf-8")
+    os.utime(template, (first_mtime + 10, first_mtime + 10))
+    second, second_mtime = build_fingerprint(tmp_path)
+    assert second != first
+    assert second_mtime == first_mtime + 10
+    assert make_etag("v", ("index", 1), first) != make_etag("v", ("index", 1), second)
+
+
+def test_new_build_invalidates_client_etags(web, monkeypatch):
+    save_summarized([_article(1)])
+    response = web.get("/")
+    assert response.status_code == 200
+    etag = response.headers["ETag"]
+    assert web.get("/", headers={"If-None-Match": etag}).status_code == 304
+
+    # 같은 데이터, 다른 배포본
+    monkeypatch.setattr(app, "BUILD_ID", "next-build")
+    monkeypatch.setattr(app, "BUILD_MTIME", response.last_modified.timestamp() + 3600)
+    fresh = web.get("/", headers={"If-None-Match": etag})
+    assert fresh.status_code == 200
+    assert fresh.headers["ETag"] != etag
+    since = response.headers["Last-Modified"]
+    assert web.get("/", headers={"If-Modified-Since": since}).status_code == 200
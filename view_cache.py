@@ -0,0 +1,120 @@
+"""
+웹 뷰용 캐시.
+- 렌더링한 HTML을 (경로, 인자, 저장소 버전) 키로 보관하는 LRU (전체 바이트 수 제한)
+- 저장소 버전과 빌드 지문(템플릿·정적 파일·코드 내용)으로 만든 강한 ETag, If-None-Match / If-Modified-Since 판정
+저장소 버전이 바뀌면 키가 달라지므로 따로 무효화할 필요가 없고, 오래된 항목은 LRU로 밀려납니다.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from pathlib import Path
+
+BUILD_PATTERNS = ("templates/**/*", "static/**/*", "*.py")
+
+
+def build_fingerprint(root: str | Path, patterns=BUILD_PATTERNS) -> tuple[str, float]:
+    """
+    배포본의 지문. 템플릿·정적 파일·코드의 내용 해시와 그중 가장 최근 수정 시각을 반환합니다.
+    ETag와 Last-Modified에 섞어, 데이터가 그대로여도 배포 뒤에는 예전 HTML에 304를 주지 않게 합니다.
+    프로세스 시작 때 한 번만 계산합니다.
+    """
+    root = Path(root)
+    files = sorted({p for pattern in patterns for p in root.glob(pattern) if p.is_file()})
+    h = hashlib.sha1()
+    mtime = 0.0
+    for path in files:
+        h.update(path.relative_to(root).as_posix().encode("utf-8") + b"\0")
+        h.update(path.read_bytes())
+        h.update(b"\0")
+        mtime = max(mtime, path.stat().st_mtime)
+    return h.hexdigest()[:16], mtime
+
+
+def make_etag(version: str, key: tuple, build: str = "") -> str:
+    """저장소 버전, 페이지 키, 빌드 지문으로 강한 ETag 값(따옴표 없이)을 만듭니다."""
+    raw = f"{build}|{version}|{key!r}".encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()
+
+
+def is_not_modified(request, etag: str, last_modified: float | None) -> bool:
+    """조건부 요청이 지금 응답과 같은 내용을 가리키면 True (304로 응답하면 됨)."""
+    if request.if_none_match:
+        # If-None-Match가 있으면 If-Modified-Since는 무시 (RFC 9110)
+        return request.if_none_match.contains(etag)
+    if request.if_modified_since and last_modified:
+        lm = datetime.fromtimestamp(int(last_modified), tz=timezone.utc)
+        return lm <= request.if_modified_since
+    return False
+
+
+class RenderCache:
+    """바이트 크기 상한이 있는 LRU. 값은 bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._items: OrderedDict = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.not_modified = 0
+        self.bytes_saved = 0
+
+    def get(self, key):
+        with self._lock:
+            value = self._items.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key, value: bytes) -> None:
+        size = len(value)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._items[key] = value
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self._bytes -= len(evicted)
+                self.evictions += 1
+
+    def size_of(self, key) -> int:
+        """캐시된 항목의 크기 (없으면 0). 적중/미적중 횟수에는 반영하지 않습니다."""
+        with self._lock:
+            value = self._items.get(key)
+            return len(value) if value is not None else 0
+
+    def record_not_modified(self, size: int = 0) -> None:
+        """304로 응답해 본문 전송을 아꼈을 때 호출합니다."""
+        with self._lock:
+            self.not_modified += 1
+            self.bytes_saved += size
+
+    def record_hit_bytes(self, size: int) -> None:
+        """캐시된 HTML로 응답해 렌더링을 건너뛰었을 때 호출합니다."""
+        with self._lock:
+            self.bytes_saved += size
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "entries": len(self._items),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / total, 4) if total else 0.0,
+                "evictions": self.evictions,
+                "not_modified": self.not_modified,
+                "bytes_saved": self.bytes_saved,
+            }
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+업데이트 작업 워커. job_queue의 작업을 하나씩 꺼내 실행합니다.
+update_in_progress.lock 파일 잠금을 잡은 워커 하나만 실행되며, 다른 워커가 이미 돌고 있으면 바로 끝납니다.
+
+사용법:
+  python worker.py            # 대기 중인 작업을 모두 처리하고 종료 (웹 트리거가 이 방식으로 실행)
+  python worker.py --forever  # 계속 돌면서 새 작업을 기다림 (systemd 서비스 등)
+"""
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+from pathlib import Path
+
+from config import OUTPUT_DIR
+from job_queue import WorkerLock, get_job_queue, worker_id
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+
+
+def _run_update(job: dict) -> dict:
+    from scheduled_update import run_update
+    # 이전 시도가 중간에 죽었으면 (임대 만료로 다시 가져온 작업) 그 실행의 체크포인트에서 이어서
+    code = run_update(force=bool(job["params"].get("force")), resume=job["attempts"] > 1)
+    return {"exit_code": code}
+
+
+HANDLERS = {
+    "update": _run_update,
+}
+
+
+def execute(queue, job: dict, owner: str) -> bool:
+    """작업 하나를 실행하고 결과를 기록합니다. 실행하는 동안 임대를 주기적으로 연장합니다."""
+    stop = threading.Event()
+
+    def keep_lease():
+        while not stop.wait(queue.lease_seconds / 3):
+            if not queue.heartbeat(job["id"], owner):
+                print(f"[worker] 작업 {job['id']} 임대를 잃었습니다", flush=True)
+                return
+
+    heartbeat = threading.Thread(target=keep_lease, name=f"lease-{job['id']}", daemon=True)
+    heartbeat.start()
+    print(f"[worker] 작업 {job['id']} ({job['kind']}) 시작 - 요청 {job['triggers']}회, 시도 {job['attempts']}회째", flush=True)
+    try:
+        handler = HANDLERS.get(job["kind"])
+        if handler is None:
+            raise ValueError(f"알 수 없는 작업 종류: {job['kind']}")
+        result = handler(job)
+    except BaseException as e:
+        stop.set()
+        if isinstance(e, KeyboardInterrupt):
+            # 임대를 남겨 두면 다음 워커가 다시 가져감
+            raise
+        traceback.print_exc()
+        queue.fail(job["id"], owner, f"{type(e).__name__}: {e}")
+        return False
+    stop.set()
+    if result.get("exit_code", 0) != 0:
+        queue.fail(job["id"], owner, f"exit code {result['exit_code']}", result=result)
+        print(f"[worker] 작업 {job['id']} 실패 (exit code {result['exit_code']})", flush=True)
+        return False
+    queue.complete(job["id"], owner, result=result)
+    print(f"[worker] 작업 {job['id']} 완료", flush=True)
+    return True
+
+
+def start_update_job(force: bool = False) -> tuple[int, bool]:
+    """
+    업데이트 작업을 큐에 넣고 워커 프로세스를 띄웁니다 (웹 트리거·내장 스케줄러에서 호출).
+    이미 대기·실행 중인 업데이트가 있으면 그 작업에 합쳐지고, 워커는 하나만 실행됩니다.
+    force: 오늘 이미 업데이트했어도 다시 실행. 일반 작업에 합쳐지면 건너뛸 수 있으므로 강제 작업끼리만 합침
+    반환: (작업 id, 기존 작업에 합쳤는지)
+    """
+    if force:
+        job_id, coalesced = get_job_queue().enqueue("update", dedupe_key="update:force", params={"force": True})
+    else:
+        job_id, coalesced = get_job_queue().enqueue("update")
+    spawn_worker(f"트리거 호출 (작업 {job_id}" + (", 합침" if coalesced else "") + ")")
+    return job_id, coalesced
+
+
+def spawn_worker(note: str) -> None:
+    """워커 프로세스를 띄웁니다. 출력은 output/update.log에 note 머리줄과 함께 덧붙습니다."""
+    (SCRIPT_DIR / OUTPUT_DIR).mkdir(parents=True, exist_ok=True)
+    log_handle = None
+    try:
+        log_handle = open(SCRIPT_DIR / OUTPUT_DIR / "update.log", "a", encoding="utf-8")
+        log_handle.write(f"\n--- {note}: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')} ---\n")
+        log_handle.flush()
+    except Exception:
+        pass
+    # 워커가 이미 돌고 있으면 새 워커는 잠금을 얻지 못하고 바로 끝남
+    subprocess.Popen(
+        [sys.executable, str(SCRIPT_DIR / "worker.py")],
+        cwd=str(SCRIPT_DIR),
+        stdout=log_handle or subprocess.DEVNULL,
+        stderr=subprocess.STDOUT if log_handle else subprocess.DEVNULL,
+        start_new_session=True,
+    )
+    if log_handle is not None:
+        log_handle.close()
+
+
+def run_exclusive(fn, name: str) -> int:
+    """
+    워커와 같은 잠금을 잡고 fn()을 실행합니다 (run_with_summary.py, backfill.py를 직접 실행할 때).
+    워커나 다른 수동 실행이 잠금을 잡고 있으면 기다리지 않고 1을 반환합니다.
+    실행하는 동안 큐에 들어온 작업은 (그때 뜬 워커가 잠금을 못 잡고 끝났으므로) 끝난 뒤 워커를 띄워 처리합니다.
+    """
+    lock = WorkerLock()
+    if not lock.acquire():
+        print(f"[{name}] 업데이트 워커나 다른 수동 실행이 진행 중입니다. 끝난 뒤 다시 실행하세요.", file=sys.stderr)
+        return 1
+    try:
+        return fn()
+    finally:
+        lock.release()
+        if get_job_queue().has_queued():
+            spawn_worker(f"{name} 종료 후 대기 작업 처리")
+
+
+def run_worker(forever: bool = False, poll_seconds: float = 5.0) -> int:
+    """작업을 처리합니다. 처리한 작업 수를 반환합니다."""
+    if SCRIPT_DIR != Path.cwd():
+        os.chdir(SCRIPT_DIR)
+    queue = get_job_queue()
+    owner = worker_id()
+    lock = WorkerLock()
+    processed = 0
+    while True:
+        if not lock.acquire():
+            print("[worker] 다른 워커가 실행 중입니다. 그 워커가 작업을 처리합니다.", flush=True)
+            return processed
+        try:
+            # 잠금을 잡았으므로 살아 있는 다른 워커는 없음 → 실행 중으로 남은 작업도 다시 가져옴
+            while (job := queue.claim(owner, reclaim_running=True)) is not None:
+                execute(queue, job, owner)
+                processed += 1
+        finally:
+            lock.release()
+        # 잠금을 푸는 사이에 들어온 작업은 (그때 뜬 워커가 잠금을 못 잡고 끝났을 수 있으므로) 여기서 처리
+        if queue.has_queued():
+            continue
+        if not forever:
+            return processed
+        time.sleep(poll_seconds)
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--forever", action="store_true", help="작업이 없어도 끝나지 않고 기다림")
+    parser.add_argument("--poll", type=float, default=5.0, help="--forever일 때 새 작업 확인 간격(초)")
+    args = parser.parse_args(argv)
+    run_worker(forever=args.forever, poll_seconds=args.poll)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())